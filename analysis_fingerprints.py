@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Input Fingerprints for Incremental Re-analysis
+
+Each analysis records a fingerprint of every input it used (ticket text,
+ticket metadata, Figma files, PDF designs, media files and the knowledge
+base) and, per section, the fingerprints that section depended on. When a
+ticket is analyzed again only sections whose inputs changed are regenerated.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Any, Callable, Iterable
+
+# Inputs each analysis section depends on. Only the inputs of the requested
+# sections are computed, so e.g. test cases alone never trigger media OCR.
+# LLM sections see the shared prompt context; media analysis is only needed
+# by the sections that ask about uploaded screenshots and videos.
+INPUTS = ['content', 'metadata', 'figma', 'pdf', 'media', 'knowledge']
+SECTION_DEPENDENCIES: Dict[str, List[str]] = {
+    'suggested_questions': INPUTS,
+    'clarifications_needed': ['content', 'metadata', 'figma', 'pdf'],
+    'technical_considerations': ['content', 'figma', 'pdf'],
+    'design_questions': INPUTS,
+    'business_questions': ['content', 'metadata', 'figma', 'pdf', 'knowledge'],
+    'risk_areas': ['content', 'metadata', 'figma', 'pdf'],
+    'test_cases': ['content', 'metadata', 'figma', 'pdf', 'knowledge'],
+}
+
+
+def required_inputs(sections: Iterable[str]) -> List[str]:
+    """Get the inputs a set of sections depends on, in INPUTS order."""
+    needed = {name for section in sections for name in SECTION_DEPENDENCIES.get(section, INPUTS)}
+    return [name for name in INPUTS if name in needed]
+
+
+def _digest(value: Any) -> str:
+    serialized = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:16]
+
+
+def file_digest(path: str) -> str:
+    """Hash a file's contents, or mark it missing."""
+    if not path or not os.path.exists(path):
+        return 'missing'
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()[:16]
+
+
+def compute_fingerprints(ticket, knowledge_version: Callable[[], Any],
+                         figma_version: Optional[Callable[[str], Optional[str]]] = None,
+                         inputs: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Fingerprint the inputs of an analysis.
+
+    Args:
+        ticket: The JiraTicket being analyzed
+        knowledge_version: Returns the version of the knowledge bases the prompts
+            draw on. Tickets stored since the last analysis aren't part of it, so
+            storing one ticket doesn't make every other ticket's analysis stale.
+        figma_version: Returns the current version of a Figma link, or None
+            when it can't be determined
+        inputs: Inputs to fingerprint; defaults to all of them. Skipped inputs
+            are never looked at (no Figma version lookups, no file hashing).
+    """
+    figma_links = sorted(set(ticket.figma_links or []))
+    digests = {
+        'content': lambda: _digest(f"{ticket.title}\n{ticket.description}"),
+        'metadata': lambda: _digest({
+            'priority': ticket.priority,
+            'labels': sorted(ticket.labels or []),
+            'components': sorted(ticket.components or []),
+        }),
+        'figma': lambda: _digest([
+            (link, figma_version(link) if figma_version else None) for link in figma_links
+        ]),
+        'pdf': lambda: _digest(sorted(file_digest(path) for path in ticket.pdf_design_paths or [])),
+        'media': lambda: _digest(sorted(file_digest(path) for path in ticket.media_files or [])),
+        'knowledge': lambda: _digest(knowledge_version()),
+    }
+    return {name: digests[name]() for name in (inputs if inputs is not None else INPUTS)}
+
+
+def section_fingerprints(fingerprints: Dict[str, str], sections: List[str]) -> Dict[str, Dict[str, str]]:
+    """Record, for each section, the fingerprints of the inputs it depended on."""
+    return {
+        section: {name: fingerprints[name] for name in SECTION_DEPENDENCIES.get(section, fingerprints)}
+        for section in sections
+    }
+
+
+def reusable_sections(previous: Optional[Dict[str, Any]], fingerprints: Dict[str, str]) -> Dict[str, List[str]]:
+    """Get the sections of a previous analysis whose inputs are unchanged.
+
+    Args:
+        previous: Stored analysis dict of an earlier run (may be None)
+        fingerprints: Fingerprints of the current inputs
+    """
+    if not previous or not isinstance(previous.get('section_fingerprints'), dict):
+        return {}
+
+    # Heuristic answers left behind by a missed deadline are always retried
+    degraded = set(previous.get('degraded_sections') or [])
+    reusable = {}
+    for section, recorded in previous['section_fingerprints'].items():
+        if section not in SECTION_DEPENDENCIES or not isinstance(previous.get(section), list):
+            continue
+        if section in degraded:
+            continue
+        if _unchanged(section, recorded, fingerprints):
+            reusable[section] = previous[section]
+    return reusable
+
+
+def held_tier_skips(previous: Optional[Dict[str, Any]], fingerprints: Dict[str, str]) -> Dict[str, str]:
+    """Get the sections a previous analysis's model tier skipped whose inputs are unchanged.
+
+    Args:
+        previous: Stored analysis dict of an earlier run (may be None)
+        fingerprints: Fingerprints of the current inputs
+
+    Returns:
+        The name of the tier that skipped each section
+    """
+    if not previous or not isinstance(previous.get('tier_skipped_sections'), dict):
+        return {}
+    return {
+        section: skip.get('tier')
+        for section, skip in previous['tier_skipped_sections'].items()
+        if section in SECTION_DEPENDENCIES and isinstance(skip, dict)
+        and _unchanged(section, skip.get('fingerprints'), fingerprints)
+    }
+
+
+def _unchanged(section: str, recorded: Any, fingerprints: Dict[str, str]) -> bool:
+    """Check a section's recorded input fingerprints against the current ones."""
+    # Sections recorded against a different dependency list are stale too
+    if not isinstance(recorded, dict) or set(recorded) != set(SECTION_DEPENDENCIES[section]):
+        return False
+    return all(fingerprints.get(name) == value for name, value in recorded.items())
@@ -11,6 +11,8 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 from jira_figma_analyzer import JiraFigmaAnalyzer
+from jira_export_importer import JiraExportImporter, FORMATS
+from batch_engine import BatchEngine, default_workers
 
 class AutomatedAnalyzer:
     def __init__(self):
@@ -187,53 +189,93 @@ class AutomatedAnalyzer:
         
         return f"✅ Report saved to: {output_path}"
     
-    def batch_analyze(self, input_dir: str = "examples") -> list:
-        """Analyze all JSON files in a directory."""
+    def batch_analyze(self, input_dir: str = "examples", workers: int = None,
+                      checkpoint_path: str = None, resume: bool = True, sections=None):
+        """Analyze all JSON files in a directory on a pool of worker processes.
+        
+        Yields (filename, analysis_data) as each ticket finishes. Failed tickets
+        come with ``analysis_data['error']`` set instead of an analysis. Finished
+        tickets are recorded in a checkpoint, and tickets completed by an earlier
+        run are skipped when ``resume`` is set.
+        """
         input_path = Path(input_dir)
         if not input_path.exists():
             print(f"❌ Directory {input_dir} does not exist")
-            return []
+            return
         
-        results = []
-        json_files = list(input_path.glob("*.json"))
+        json_files = sorted(input_path.glob("*.json"))
         
         if not json_files:
             print(f"❌ No JSON files found in {input_dir}")
-            return []
+            return
         
-        print(f"🔍 Found {len(json_files)} JSON files to analyze...")
+        workers = default_workers() if workers is None else workers
+        checkpoint_path = checkpoint_path or str(self.output_dir / "checkpoints" / f"{input_path.resolve().name}.jsonl")
+        print(f"🔍 Found {len(json_files)} JSON files to analyze with {workers or 'no'} worker processes...")
         
-        for json_file in json_files:
-            print(f"📋 Analyzing {json_file.name}...")
-            result = self.analyze_from_json(str(json_file))
-            if result:
-                results.append((json_file.name, result))
-                print(f"✅ Completed analysis for {json_file.name}")
+        engine = BatchEngine(
+            workers=workers, checkpoint_path=checkpoint_path, resume=resume,
+            sections=self.analyzer.resolve_sections(sections) if sections else None,
+            analyzer=self.analyzer
+        )
+        for item in engine.run(json_files, total=len(json_files)):
+            if item.status == 'skipped':
+                continue
+            if item.ok:
+                print(f"✅ Completed analysis for {item.source} in {item.seconds:.1f}s")
+                yield item.source, {
+                    'ticket': item.ticket,
+                    'analysis': item.analysis,
+                    'timestamp': item.completed_at
+                }
             else:
-                print(f"❌ Failed to analyze {json_file.name}")
+                print(f"❌ Failed to analyze {item.source}: {item.error}")
+                yield item.source, {
+                    'ticket': item.ticket,
+                    'analysis': None,
+                    'error': item.error,
+                    'timestamp': item.completed_at
+                }
+    
+    def import_export(self, export_path: str, export_format: str = None, batch_size: int = 50,
+                      analyze: bool = True, sections=None, workers: int = 1,
+                      skip_existing: bool = False, limit: int = None) -> dict:
+        """Stream a Jira bulk export (JSON, NDJSON, CSV or XML) into analysis and ticket storage."""
+        if not Path(export_path).exists():
+            print(f"❌ Export file {export_path} does not exist")
+            return None
         
-        return results
+        importer = JiraExportImporter(
+            self.analyzer, batch_size=batch_size, analyze=analyze, sections=sections,
+            workers=workers, skip_existing=skip_existing
+        )
+        print(f"🔍 Importing {export_path} in batches of {importer.batch_size}...")
+        try:
+            return importer.import_export(export_path, fmt=export_format, limit=limit)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error importing {export_path}: {e}")
+            return None
     
-    def generate_batch_report(self, batch_results: list) -> str:
-        """Generate a summary report for batch analysis."""
-        if not batch_results:
-            return "❌ No batch results to report"
+    def generate_batch_report(self, batch_results) -> str:
+        """Generate a summary report for batch analysis.
         
-        report = f"""
-# 📊 Batch Analysis Summary Report
-
-## 📋 Analysis Overview
-- **Total Files Analyzed**: {len(batch_results)}
-- **Analysis Date**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-## 📈 Summary Statistics
-"""
+        Accepts a list or the stream from batch_analyze; each result is
+        summarized as it arrives, so analyses are not kept in memory.
+        """
+        sections = []
+        failures = []
+        analyzed = 0
         
         total_questions = 0
         total_test_cases = 0
         total_risk_areas = 0
         
         for filename, analysis_data in batch_results:
+            if analysis_data.get('error'):
+                failures.append(f"- **{filename}**: {analysis_data['error']}")
+                continue
+            
+            analyzed += 1
             result = analysis_data['analysis']
             questions_count = len(result.suggested_questions) + len(result.design_questions) + len(result.business_questions)
             test_cases_count = len(result.test_cases)
@@ -243,22 +285,40 @@ class AutomatedAnalyzer:
             total_test_cases += test_cases_count
             total_risk_areas += risk_areas_count
             
-            report += f"""
+            sections.append(f"""
 ### 📄 {filename}
 - **Ticket**: {getattr(analysis_data['ticket'], 'key', 'AUTO-GENERATED')} - {getattr(analysis_data['ticket'], 'title', 'No title')}
 - **Questions Generated**: {questions_count}
 - **Test Cases Generated**: {test_cases_count}
 - **Risk Areas**: {risk_areas_count}
 - **Figma Links**: {len(getattr(analysis_data['ticket'], 'figma_links', []))}
+""")
+        
+        if not analyzed and not failures:
+            return "❌ No batch results to report"
+        
+        report = f"""
+# 📊 Batch Analysis Summary Report
+
+## 📋 Analysis Overview
+- **Total Files Analyzed**: {analyzed}
+- **Failed Files**: {len(failures)}
+- **Analysis Date**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+## 📈 Summary Statistics
 """
+        report += ''.join(sections)
+        
+        if failures:
+            report += "\n## ❌ Failed Files\n" + "\n".join(failures) + "\n"
         
         report += f"""
 ## 📊 Total Statistics
 - **Total Questions Generated**: {total_questions}
 - **Total Test Cases Generated**: {total_test_cases}
 - **Total Risk Areas Identified**: {total_risk_areas}
-- **Average Questions per Ticket**: {total_questions // len(batch_results) if batch_results else 0}
-- **Average Test Cases per Ticket**: {total_test_cases // len(batch_results) if batch_results else 0}
+- **Average Questions per Ticket**: {total_questions // analyzed if analyzed else 0}
+- **Average Test Cases per Ticket**: {total_test_cases // analyzed if analyzed else 0}
 
 ---
 *Generated by Habitto Jira Figma Analyzer - Batch Processing Mode*
@@ -268,13 +328,23 @@ class AutomatedAnalyzer:
 
 def main():
     parser = argparse.ArgumentParser(description="Habitto Jira Figma Analyzer - Automated Analysis")
-    parser.add_argument("--mode", choices=["single", "batch", "interactive"], default="single",
-                       help="Analysis mode: single file, batch directory, or interactive")
-    parser.add_argument("--input", "-i", help="Input JSON file or directory")
+    parser.add_argument("--mode", choices=["single", "batch", "interactive", "import"], default="single",
+                       help="Analysis mode: single file, batch directory, interactive, or Jira export import")
+    parser.add_argument("--input", "-i", help="Input JSON file, directory or Jira export")
     parser.add_argument("--output", "-o", help="Output filename (optional)")
     parser.add_argument("--title", help="Ticket title (for interactive mode)")
     parser.add_argument("--description", help="Ticket description (for interactive mode)")
     parser.add_argument("--figma-links", nargs="*", help="Figma links (for interactive mode)")
+    parser.add_argument("--format", choices=FORMATS, help="Export format (for import mode, detected if omitted)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Tickets per batch (for import mode)")
+    parser.add_argument("--workers", type=int,
+                       help="Worker processes (for batch mode) or tickets analyzed concurrently (for import mode)")
+    parser.add_argument("--sections", help="Comma-separated sections to generate (for batch and import modes)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (for batch mode, defaults to analysis_outputs/checkpoints/)")
+    parser.add_argument("--no-resume", action="store_true", help="Reanalyze tickets a previous run completed (for batch mode)")
+    parser.add_argument("--store-only", action="store_true", help="Store tickets without analyzing them (for import mode)")
+    parser.add_argument("--skip-existing", action="store_true", help="Skip tickets already in storage (for import mode)")
+    parser.add_argument("--limit", type=int, help="Import at most this many tickets (for import mode)")
     
     args = parser.parse_args()
     
@@ -302,25 +372,56 @@ def main():
         input_dir = args.input or "examples"
         print(f"🔍 Starting batch analysis of directory: {input_dir}")
         
-        batch_results = analyzer.batch_analyze(input_dir)
+        def save_individual_reports(results):
+            for filename, analysis_data in results:
+                if not analysis_data.get('error'):
+                    output_filename = f"{Path(filename).stem}_analysis.md"
+                    analyzer.save_report(analysis_data, output_filename)
+                yield filename, analysis_data
         
-        if batch_results:
-            print(f"✅ Batch analysis completed! Processed {len(batch_results)} files.")
-            
-            # Save individual reports
-            for filename, analysis_data in batch_results:
-                output_filename = f"{Path(filename).stem}_analysis.md"
-                analyzer.save_report(analysis_data, output_filename)
-            
-            # Generate batch summary
-            batch_report = analyzer.generate_batch_report(batch_results)
+        try:
+            batch_results = analyzer.batch_analyze(
+                input_dir, workers=args.workers, checkpoint_path=args.checkpoint,
+                resume=not args.no_resume, sections=args.sections
+            )
+            # Individual reports are saved and summarized as each ticket finishes
+            batch_report = analyzer.generate_batch_report(save_individual_reports(batch_results))
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        if not batch_report.startswith("❌"):
+            print("✅ Batch analysis completed!")
             batch_output_path = analyzer.output_dir / f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
             with open(batch_output_path, 'w', encoding='utf-8') as f:
                 f.write(batch_report)
             
             print(f"📊 Batch summary saved to: {batch_output_path}")
         else:
-            print("❌ Batch analysis failed or no files found")
+            print("❌ Batch analysis failed, no files found or every ticket was already completed")
+    
+    elif args.mode == "import":
+        if not args.input:
+            print("❌ Please provide a Jira export file with --input")
+            return
+        
+        try:
+            stats = analyzer.import_export(
+                args.input, export_format=args.format, batch_size=args.batch_size,
+                analyze=not args.store_only, sections=args.sections, workers=args.workers or 1,
+                skip_existing=args.skip_existing, limit=args.limit
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        if stats:
+            print(f"✅ Import completed in {stats['seconds']}s: {stats['imported']} imported, "
+                  f"{stats['skipped']} skipped, {stats['failed']} failed ({stats['format']} export)")
+            for error in stats['errors'][:10]:
+                print(f"   ⚠️ {error['key'] or '<no key>'}: {error['error']}")
+        else:
+            print("❌ Import failed")
     
     elif args.mode == "interactive":
         print("🎯 Interactive Mode - Habitto Jira Figma Analyzer")
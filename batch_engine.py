@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis Engine for Jira-Figma Analyzer
+
+Analyzes many ticket files on a pool of worker processes, each holding one
+warmed JiraFigmaAnalyzer. Every finished ticket is appended to a checkpoint
+file, so an interrupted batch picks up where it stopped when rerun. Results
+are streamed back as they complete, with periodic progress and throughput
+reports and per-ticket error capture.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Set
+
+# Analyzer reused by every ticket a worker process analyzes
+_worker_analyzer = None
+
+
+def _init_worker(config_path: str):
+    """Build and warm this worker process's analyzer once, before its first ticket."""
+    global _worker_analyzer
+    from jira_figma_analyzer import JiraFigmaAnalyzer
+    _worker_analyzer = JiraFigmaAnalyzer(config_path)
+    # Every analysis needs these; building them here keeps it out of the first ticket's latency
+    _worker_analyzer.openai_client
+    _worker_analyzer.ticket_storage
+
+
+def analyze_ticket_job(source: str, ticket_data: Dict[str, Any], sections: Optional[List[str]] = None,
+                       analyzer=None) -> 'BatchItem':
+    """Parse and analyze one ticket, capturing any error in the returned item.
+
+    Without an analyzer the worker process's own instance is used, so this
+    can be submitted to a process pool.
+    """
+    analyzer = analyzer or _worker_analyzer
+    started = time.monotonic()
+    ticket_id = ticket_key(source, ticket_data)
+    try:
+        ticket = analyzer.parse_jira_ticket(ticket_data)
+        result = analyzer.analyze_ticket_content(ticket, sections=sections)
+        if result is None:
+            raise RuntimeError("analysis returned no result")
+        return BatchItem(source, ticket_id, 'ok', ticket=ticket, analysis=result,
+                         seconds=time.monotonic() - started)
+    except Exception as e:
+        return BatchItem(source, ticket_id, 'failed', error=f"{type(e).__name__}: {e}",
+                         seconds=time.monotonic() - started)
+
+
+def ticket_key(source: str, ticket_data: Optional[Dict[str, Any]]) -> str:
+    """Checkpoint ID of a ticket: its Jira key, or the file it came from."""
+    key = (ticket_data or {}).get('key') if isinstance(ticket_data, dict) else None
+    return str(key).strip() if key else source
+
+
+@dataclass
+class BatchItem:
+    """Outcome of one ticket in a batch."""
+    source: str
+    ticket_id: str
+    status: str  # 'ok', 'failed' or 'skipped'
+    ticket: Any = None
+    analysis: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    completed_at: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        return {
+            'ticket_id': self.ticket_id,
+            'source': self.source,
+            'status': self.status,
+            'error': self.error,
+            'seconds': round(self.seconds, 3),
+            'completed_at': self.completed_at
+        }
+
+
+class BatchCheckpoint:
+    """Append-only JSON-lines record of the tickets a batch has finished."""
+
+    def __init__(self, path: str, resume: bool = True):
+        """Open a checkpoint.
+
+        Args:
+            path: Checkpoint file
+            resume: Keep the tickets completed by earlier runs; False starts over
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume and self.path.exists():
+            self.path.unlink()
+        self.completed: Set[str] = self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self) -> Set[str]:
+        completed = set()
+        if not self.path.exists():
+            return completed
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial last line from a crash mid-write
+                if record.get('status') == 'ok':
+                    completed.add(record['ticket_id'])
+                else:
+                    completed.discard(record.get('ticket_id'))
+        return completed
+
+    def is_done(self, ticket_id: str) -> bool:
+        return ticket_id in self.completed
+
+    def record(self, item: BatchItem):
+        """Append a finished ticket; failed tickets are retried on the next run."""
+        self._file.write(json.dumps(item.to_checkpoint()) + '\n')
+        self._file.flush()
+        if item.ok:
+            self.completed.add(item.ticket_id)
+
+    def close(self):
+        self._file.close()
+
+
+class BatchProgress:
+    """Counts finished tickets and prints progress and throughput at an interval."""
+
+    def __init__(self, total: Optional[int] = None, interval: float = 5.0):
+        self.total = total
+        self.interval = interval
+        self.counts = {'ok': 0, 'failed': 0, 'skipped': 0}
+        self.analysis_seconds = 0.0
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    @property
+    def finished(self) -> int:
+        return sum(self.counts.values())
+
+    def update(self, item: BatchItem):
+        self.counts[item.status] += 1
+        self.analysis_seconds += item.seconds
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            print(f"📊 {self.describe()}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        analyzed = self.counts['ok'] + self.counts['failed']
+        throughput = analyzed / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.finished if self.total is not None else None
+        return {
+            **self.counts,
+            'finished': self.finished,
+            'total': self.total,
+            'elapsed_seconds': round(elapsed, 3),
+            'tickets_per_second': round(throughput, 3),
+            'avg_ticket_seconds': round(self.analysis_seconds / analyzed, 3) if analyzed else 0.0,
+            'eta_seconds': round(remaining / throughput, 1) if remaining and throughput else None
+        }
+
+    def describe(self) -> str:
+        stats = self.snapshot()
+        done = f"{stats['finished']}/{stats['total']}" if stats['total'] is not None else str(stats['finished'])
+        line = (f"{done} tickets ({stats['ok']} ok, {stats['failed']} failed, {stats['skipped']} skipped) "
+                f"- {stats['tickets_per_second']:.2f} tickets/s")
+        if stats['eta_seconds'] is not None:
+            line += f", ETA {stats['eta_seconds']:.0f}s"
+        return line
+
+
+class BatchEngine:
+    """Analyzes ticket files on a process pool with checkpointing and resume."""
+
+    def __init__(self, workers: int = 4, checkpoint_path: Optional[str] = None, resume: bool = True,
+                 config_path: str = "config.json", sections: Optional[List[str]] = None,
+                 analyzer=None, progress_interval: float = 5.0):
+        """Initialize the engine.
+
+        Args:
+            workers: Worker processes, each with its own analyzer. 0 analyzes
+                in this process with ``analyzer``.
+            checkpoint_path: File recording finished tickets; no checkpointing if omitted
+            resume: Skip tickets the checkpoint already has as completed
+            config_path: Config the worker analyzers are built from
+            sections: Sections to generate (see JiraFigmaAnalyzer.resolve_sections)
+            analyzer: Analyzer for in-process runs, and the fallback when
+                worker processes are unavailable
+            progress_interval: Seconds between progress reports
+        """
+        self.workers = max(0, workers)
+        self.checkpoint_path = checkpoint_path
+        self.resume = resume
+        self.config_path = config_path
+        self.sections = sections
+        self.analyzer = analyzer
+        self.progress_interval = progress_interval
+        self.progress: Optional[BatchProgress] = None
+
+    def run(self, paths: Iterable[str], total: Optional[int] = None) -> Iterator[BatchItem]:
+        """Analyze JSON ticket files, yielding each result as soon as it is ready.
+
+        Tickets already completed according to the checkpoint are yielded as
+        'skipped'. At most two tickets per worker are in flight, so ``paths``
+        may be a lazy iterable.
+        """
+        checkpoint = BatchCheckpoint(self.checkpoint_path, self.resume) if self.checkpoint_path else None
+        self.progress = BatchProgress(total, self.progress_interval)
+        if checkpoint and checkpoint.completed:
+            print(f"♻️ Resuming: {len(checkpoint.completed)} tickets already completed in {self.checkpoint_path}")
+
+        try:
+            for item in self._iter_results(paths, checkpoint):
+                item.completed_at = item.completed_at or datetime.now().isoformat()
+                if checkpoint and item.status != 'skipped':
+                    checkpoint.record(item)
+                self.progress.update(item)
+                yield item
+        finally:
+            if checkpoint:
+                checkpoint.close()
+            print(f"🏁 Batch finished: {self.progress.describe()}")
+
+    def _iter_jobs(self, paths: Iterable[str], checkpoint: Optional[BatchCheckpoint]) -> Iterator[Any]:
+        """Yield (source, ticket_data) jobs, or finished items for unreadable and completed files."""
+        for path in paths:
+            source = Path(path).name
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    ticket_data = json.load(f)
+            except (OSError, ValueError) as e:
+                yield BatchItem(source, source, 'failed', error=f"Could not read ticket file: {e}")
+                continue
+            ticket_id = ticket_key(source, ticket_data)
+            if checkpoint and checkpoint.is_done(ticket_id):
+                yield BatchItem(source, ticket_id, 'skipped')
+            else:
+                yield source, ticket_data
+
+    def _iter_results(self, paths: Iterable[str], checkpoint: Optional[BatchCheckpoint]) -> Iterator[BatchItem]:
+        jobs = self._iter_jobs(paths, checkpoint)
+        pool = self._start_pool() if self.workers else None
+        if pool is None:
+            for job in jobs:
+                yield job if isinstance(job, BatchItem) else self._run_inline(*job)
+            return
+
+        max_in_flight = self.workers * 2
+        in_flight: Dict[Any, tuple] = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                    elif isinstance(job, BatchItem):
+                        yield job
+                    else:
+                        in_flight[pool.submit(analyze_ticket_job, *job, self.sections)] = job
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    source, ticket_data = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        yield BatchItem(source, ticket_key(source, ticket_data), 'failed',
+                                        error="worker process died while analyzing this ticket")
+                    except Exception as e:
+                        yield BatchItem(source, ticket_key(source, ticket_data), 'failed',
+                                        error=f"{type(e).__name__}: {e}")
+
+                if broken:
+                    # Everything still queued on the dead pool failed with it
+                    for future, (source, ticket_data) in list(in_flight.items()):
+                        yield BatchItem(source, ticket_key(source, ticket_data), 'failed',
+                                        error="worker process died while analyzing this ticket")
+                    in_flight.clear()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    print("⚠️ A batch worker process died; starting a new pool")
+                    pool = self._start_pool()
+                    if pool is None:
+                        for job in jobs:
+                            yield job if isinstance(job, BatchItem) else self._run_inline(*job)
+                        return
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _start_pool(self) -> Optional[ProcessPoolExecutor]:
+        try:
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.config_path,)
+            )
+        except (OSError, NotImplementedError, ImportError) as e:
+            print(f"⚠️ Process pool unavailable ({e}), analyzing tickets in-process")
+            return None
+
+    def _run_inline(self, source: str, ticket_data: Dict[str, Any]) -> BatchItem:
+        if self.analyzer is None:
+            from jira_figma_analyzer import JiraFigmaAnalyzer
+            self.analyzer = JiraFigmaAnalyzer(self.config_path)
+        return analyze_ticket_job(source, ticket_data, self.sections, analyzer=self.analyzer)
+
+
+def default_workers() -> int:
+    """Worker processes to use when none are configured."""
+    return max(1, min(4, os.cpu_count() or 1))
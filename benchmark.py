@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark for Jira-Figma Analyzer
+
+Runs the full analysis pipeline over the example tickets (plus optional
+synthetic large tickets) with OpenAI, the Figma REST API and Bitbucket
+replaced by local stand-ins, so runs are repeatable and need no network or
+credentials. The stand-ins add configurable latency and serve either
+generated or recorded payloads.
+
+Reports p50/p95 latency, throughput, peak RSS, per-stage latencies (from the
+analysis traces) and call counts per stubbed service, and saves everything
+as JSON so runs can be compared across commits:
+
+    python benchmark.py --synthetic 4 --repeat 3
+    python benchmark.py --compare benchmark_results/<earlier run>.json
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any
+
+import figma_integration
+from bitbucket_integration import BitbucketIntegration
+from figma_integration import FigmaIntegration
+from jira_figma_analyzer import JiraFigmaAnalyzer, STRUCTURED_SECTION_LIMITS
+from llm_cache import LLMResponseCache, CachedOpenAIClient
+from openai_rate_limiter import RateLimitedOpenAIClient, get_rate_limiter
+from prompt_budget import count_tokens
+from ticket_storage_system import TicketStorageSystem
+
+RESULTS_DIR = "benchmark_results"
+
+# Headline metrics printed by --compare, with whether lower is better
+COMPARED_METRICS = [
+    ('latency_ms.p50', True),
+    ('latency_ms.p95', True),
+    ('latency_ms.mean', True),
+    ('throughput_per_second', False),
+    ('peak_rss_mb', True),
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_stats(values_ms: List[float]) -> Dict[str, float]:
+    if not values_ms:
+        return {'count': 0}
+    return {
+        'count': len(values_ms),
+        'p50': round(percentile(values_ms, 50), 3),
+        'p95': round(percentile(values_ms, 95), 3),
+        'mean': round(sum(values_ms) / len(values_ms), 3),
+        'min': round(min(values_ms), 3),
+        'max': round(max(values_ms), 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+class CallRecorder:
+    """Thread-safe call counts, latency and payload sizes per stubbed endpoint."""
+
+    def __init__(self, keep_payloads: int = 0):
+        self._lock = threading.Lock()
+        self.keep_payloads = keep_payloads
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.payloads: Dict[str, List[Any]] = {}
+
+    def record(self, endpoint: str, seconds: float, request_bytes: int = 0, response_bytes: int = 0,
+               payload: Any = None):
+        with self._lock:
+            stats = self.calls.setdefault(endpoint, {'count': 0, 'seconds': 0.0,
+                                                     'request_bytes': 0, 'response_bytes': 0})
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['request_bytes'] += request_bytes
+            stats['response_bytes'] += response_bytes
+            samples = self.payloads.setdefault(endpoint, [])
+            if payload is not None and len(samples) < self.keep_payloads:
+                samples.append(payload)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                endpoint: {**stats, 'seconds': round(stats['seconds'], 3)}
+                for endpoint, stats in sorted(self.calls.items())
+            }
+
+
+class Latency:
+    """Simulated service latency: a base delay plus uniform jitter."""
+
+    def __init__(self, seconds: float, jitter: float, seed: int):
+        self.seconds = seconds
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        with self._lock:
+            delay = self.seconds + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+# ---------------------------------------------------------------------------
+# OpenAI stand-in
+# ---------------------------------------------------------------------------
+
+class StubChatCompletions:
+    """Answers chat completions locally with a list or JSON payload."""
+
+    def __init__(self, recorder: CallRecorder, latency: Latency, payloads: Dict[str, Any]):
+        self.recorder = recorder
+        self.latency = latency
+        self.text_payload = payloads.get('chat_text')
+        self.json_payload = payloads.get('chat_json')
+
+    def create(self, **kwargs):
+        delay = self.latency.wait()
+        prompt = "\n".join(str(message.get('content', '')) for message in kwargs.get('messages', []))
+        json_mode = (kwargs.get('response_format') or {}).get('type') == 'json_object'
+        content = self._json_content() if json_mode else self._text_content(kwargs.get('max_tokens') or 500)
+
+        model = kwargs.get('model', '')
+        self.recorder.record(
+            f"openai.chat.{'json' if json_mode else 'text'}", delay, len(prompt), len(content),
+            payload={'model': model, 'max_tokens': kwargs.get('max_tokens'), 'prompt_chars': len(prompt)}
+        )
+        usage = SimpleNamespace(prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens(content))
+        message = SimpleNamespace(role='assistant', content=content)
+        return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message, finish_reason='stop')],
+                               usage=usage)
+
+    def _text_content(self, max_tokens: int) -> str:
+        if self.text_payload:
+            return self.text_payload
+        # Roughly as many lines as the call's budget allows, like a real list answer
+        count = max(3, min(25, max_tokens // 40))
+        return "\n".join(
+            f"{i}. How should the system handle benchmark scenario {i} for this requirement?"
+            for i in range(1, count + 1)
+        )
+
+    def _json_content(self) -> str:
+        if self.json_payload:
+            return json.dumps(self.json_payload)
+        return json.dumps({
+            section: [f"Benchmark {section.replace('_', ' ')} item {i}?" for i in range(1, limit + 1)]
+            for section, limit in STRUCTURED_SECTION_LIMITS.items()
+        })
+
+
+def stub_openai_client(recorder: CallRecorder, latency: Latency, payloads: Dict[str, Any]):
+    return SimpleNamespace(chat=SimpleNamespace(completions=StubChatCompletions(recorder, latency, payloads)))
+
+
+# ---------------------------------------------------------------------------
+# Figma and Bitbucket stand-ins
+# ---------------------------------------------------------------------------
+
+class StubResponse:
+    """The subset of requests.Response the integrations use."""
+
+    def __init__(self, payload: Any, status_code: int = 200):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+        self.content = self.text.encode()
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def synthetic_figma_file(file_key: str, pages: int, frames: int, elements: int) -> Dict[str, Any]:
+    """A Figma file document with screens, inputs, buttons and text nodes."""
+    screen_names = ['Login Screen', 'Checkout Page', 'Payment Form', 'Profile Settings',
+                    'Dashboard Screen', 'Confirmation Modal', 'Search Results', 'Onboarding Flow']
+    element_kinds = [('Primary Button', 'INSTANCE'), ('Email Input', 'INSTANCE'),
+                     ('Amount Field', 'INSTANCE'), ('Label', 'TEXT')]
+    node = 0
+
+    def next_id() -> str:
+        nonlocal node
+        node += 1
+        return f"{node}:{node * 7 % 1000}"
+
+    children = []
+    for p in range(pages):
+        page_frames = []
+        for f in range(frames):
+            frame_elements = []
+            for e in range(elements):
+                name, kind = element_kinds[e % len(element_kinds)]
+                element = {'id': next_id(), 'name': f"{name} {e}", 'type': kind,
+                           'absoluteBoundingBox': {'x': 0, 'y': e * 48, 'width': 320, 'height': 44}}
+                if kind == 'TEXT':
+                    element['characters'] = f"Benchmark copy {p}-{f}-{e} お支払い情報を入力してください"
+                frame_elements.append(element)
+            page_frames.append({
+                'id': next_id(),
+                'name': f"{screen_names[(p * frames + f) % len(screen_names)]} {p}-{f}",
+                'type': 'FRAME',
+                'absoluteBoundingBox': {'x': f * 400, 'y': 0, 'width': 375, 'height': 812},
+                'children': frame_elements,
+            })
+        children.append({'id': next_id(), 'name': f"Page {p + 1}", 'type': 'CANVAS', 'children': page_frames})
+
+    return {
+        'name': f"Benchmark design {file_key}",
+        'version': f"bench-{file_key}-1",
+        'lastModified': '2024-01-01T00:00:00Z',
+        'document': {'id': '0:0', 'name': 'Document', 'type': 'DOCUMENT', 'children': children},
+        'components': {},
+        'styles': {},
+    }
+
+
+class StubFigmaRequests:
+    """Drop-in for the ``requests`` module as used by figma_integration."""
+
+    def __init__(self, recorder: CallRecorder, latency: Latency, payloads: Dict[str, Any],
+                 pages: int, frames: int, elements: int):
+        self.recorder = recorder
+        self.latency = latency
+        self.recorded_files = payloads.get('figma_files', {})
+        self.shape = (pages, frames, elements)
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers=None, params=None, timeout=None, **kwargs) -> StubResponse:
+        delay = self.latency.wait()
+        params = params or {}
+        match = re.search(r'/(files|images)/([^/?]+)', url)
+        if not match:
+            self.recorder.record('figma.image_download', delay)
+            return StubResponse({}, 200)
+
+        endpoint, file_key = match.groups()
+        if endpoint == 'images':
+            ids = [node_id for node_id in str(params.get('ids', '')).split(',') if node_id]
+            payload = {'err': None, 'images': {node_id: f"https://figma.invalid/{file_key}/{node_id}.png"
+                                               for node_id in ids}}
+            name = 'figma.images'
+        else:
+            document = self._file(file_key)
+            if params.get('depth') == 1:
+                payload = {key: document.get(key) for key in ('name', 'version', 'lastModified')}
+                name = 'figma.file_version'
+            else:
+                payload = document
+                name = 'figma.files'
+        response = StubResponse(payload)
+        self.recorder.record(name, delay, len(url), len(response.content))
+        return response
+
+    def _file(self, file_key: str) -> Dict[str, Any]:
+        with self._lock:
+            if file_key not in self._files:
+                self._files[file_key] = (self.recorded_files.get(file_key)
+                                         or self.recorded_files.get('*')
+                                         or synthetic_figma_file(file_key, *self.shape))
+            return self._files[file_key]
+
+
+class StubBitbucketSession:
+    """Drop-in for the requests.Session used by BitbucketIntegration."""
+
+    def __init__(self, recorder: CallRecorder, latency: Latency, payloads: Dict[str, Any], commits: int = 20):
+        self.recorder = recorder
+        self.latency = latency
+        self.recorded = payloads.get('bitbucket', {})
+        self.commits = commits
+        self.auth = None
+
+    def get(self, url: str, params=None, **kwargs) -> StubResponse:
+        delay = self.latency.wait()
+        path = url.split('/2.0/repositories/', 1)[-1]
+        parts = path.split('/')
+        endpoint = parts[2] if len(parts) > 2 else 'repository'
+        payload = self.recorded.get(endpoint) or self._generate(endpoint, params or {})
+        response = StubResponse(payload)
+        self.recorder.record(f"bitbucket.{endpoint}", delay, len(url), len(response.content))
+        return response
+
+    def _generate(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        areas = ['payment', 'auth', 'profile', 'booking', 'search']
+        if endpoint == 'commits':
+            count = min(int(params.get('pagelen', self.commits)), self.commits)
+            return {'values': [{
+                'hash': f"{i:040x}",
+                'message': f"Update {areas[i % len(areas)]} flow",
+                'author': {'raw': 'Benchmark <bench@example.com>'},
+                'date': f"2024-01-{i % 28 + 1:02d}T10:00:00+00:00",
+            } for i in range(count)]}
+        if endpoint == 'diffstat':
+            return {'values': [{'new': {'path': f"src/{area}/{area}Screen.tsx"}} for area in areas[:3]]}
+        if endpoint == 'pullrequests':
+            return {'values': [{
+                'id': i, 'title': f"Improve {areas[i % len(areas)]}", 'description': '', 'state': 'OPEN',
+                'author': {'display_name': 'Benchmark'},
+                'source': {'branch': {'name': f"feature/{i}"}}, 'destination': {'branch': {'name': 'main'}},
+            } for i in range(5)]}
+        if endpoint == 'src':
+            return {'values': [{'path': name, 'type': kind, 'size': size} for name, kind, size in [
+                ('src', 'commit_directory', 0), ('package.json', 'commit_file', 2048),
+                ('tsconfig.json', 'commit_file', 512), ('src/App.tsx', 'commit_file', 4096),
+            ]]}
+        return {'name': 'habitto', 'full_name': 'sj-ml/habitto', 'description': 'Benchmark repository',
+                'language': 'typescript', 'size': 1024, 'mainbranch': {'name': 'main'}}
+
+
+# ---------------------------------------------------------------------------
+# Tickets
+# ---------------------------------------------------------------------------
+
+def load_example_tickets(pattern: str) -> List[Dict[str, Any]]:
+    """Load every example ticket that parses, skipping broken files."""
+    tickets = []
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skipping {path}: {e}")
+            continue
+        if isinstance(data, dict):
+            tickets.append(data)
+    return tickets
+
+
+def synthetic_ticket(index: int, paragraphs: int, figma_links: int) -> Dict[str, Any]:
+    """A large ticket with long requirements and several Figma designs."""
+    topics = ['payment processing', 'user authentication', 'subscription renewal', 'booking calendar',
+              'notification delivery', 'search filtering', 'profile management', 'data export']
+    lines = []
+    for p in range(paragraphs):
+        topic = topics[(index + p) % len(topics)]
+        lines.append(f"Requirement {p + 1}: The {topic} integration must support real-time updates, "
+                     f"API validation, security checks and a responsive mobile layout across the "
+                     f"workflow, including error handling when the third-party service is unavailable.")
+        lines.append(f"- Acceptance: users complete the {topic} flow in under 3 steps")
+    links = [f"https://www.figma.com/design/BENCH{index:03d}F{j}/Synthetic-Design-{j}" for j in range(figma_links)]
+    lines.append("Designs: " + " ".join(links))
+    return {
+        'key': f"BENCH-{index + 1:03d}",
+        'summary': f"Synthetic large ticket {index + 1}: {topics[index % len(topics)]} overhaul",
+        'description': "\n".join(lines),
+        'priority': 'High',
+        'labels': ['benchmark', 'synthetic'],
+        'components': ['Backend', 'Mobile'],
+        'figma_links': links,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class Benchmark:
+    """Runs the analyzer against the stubbed services and collects metrics."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.recorder = CallRecorder(keep_payloads=args.keep_payloads)
+        self.workdir = tempfile.mkdtemp(prefix='jfa_benchmark_')
+        payloads = self._load_payloads(args.payloads)
+
+        self.analyzer = JiraFigmaAnalyzer(args.config)
+        self.analyzer.tracing_enabled = True
+        self.analyzer.trace_export_path = None
+        self.analyzer.openai_client = CachedOpenAIClient(
+            RateLimitedOpenAIClient(
+                stub_openai_client(self.recorder, Latency(args.llm_latency, args.jitter, args.seed), payloads),
+                get_rate_limiter(self.analyzer.config.get('openai_rate_limits'))
+            ),
+            LLMResponseCache(os.path.join(self.workdir, 'llm_cache'), bypass=True)
+        )
+        self.analyzer.figma_integration = FigmaIntegration(figma_token='benchmark')
+        self.analyzer.ticket_storage = TicketStorageSystem(os.path.join(self.workdir, 'ticket_storage'))
+
+        self.figma_requests = StubFigmaRequests(
+            self.recorder, Latency(args.figma_latency, args.jitter, args.seed + 1), payloads,
+            args.figma_pages, args.figma_frames, args.figma_elements
+        )
+        self.bitbucket = BitbucketIntegration()
+        self.bitbucket.authenticated = True
+        self.bitbucket.session = StubBitbucketSession(
+            self.recorder, Latency(args.bitbucket_latency, args.jitter, args.seed + 2), payloads
+        )
+
+    @staticmethod
+    def _load_payloads(path: Optional[str]) -> Dict[str, Any]:
+        """Recorded responses to serve instead of generated ones.
+
+        Keys: 'chat_text' (str), 'chat_json' (dict), 'figma_files' (file key or
+        '*' -> file JSON) and 'bitbucket' (endpoint -> JSON).
+        """
+        if not path:
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def tickets(self):
+        raw = load_example_tickets(self.args.examples)
+        raw += [synthetic_ticket(i, self.args.synthetic_paragraphs, self.args.synthetic_figma_links)
+                for i in range(self.args.synthetic)]
+        return [self.analyzer.parse_jira_ticket(data) for data in raw]
+
+    def run(self) -> Dict[str, Any]:
+        original_requests = figma_integration.requests
+        figma_integration.requests = self.figma_requests
+        try:
+            with self._quiet():
+                tickets = self.tickets()
+            print(f"🏁 Benchmarking {len(tickets)} ticket(s) x {self.args.repeat} round(s), "
+                  f"concurrency {self.args.concurrency}, mode {self.args.mode}")
+
+            runs, stage_samples = [], {}
+            started = time.perf_counter()
+            # stdout is process-wide, so it is silenced once around every worker thread
+            with self._quiet():
+                for round_number in range(self.args.repeat):
+                    with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+                        for run in pool.map(self._run_one, tickets):
+                            run['round'] = round_number
+                            runs.append(run)
+                            for stage, ms in run.pop('stages').items():
+                                stage_samples.setdefault(stage, []).append(ms)
+                    bitbucket_started = time.perf_counter()
+                    self.bitbucket.analyze_repository_context()
+                    stage_samples.setdefault('bitbucket.repository_context', []).append(
+                        (time.perf_counter() - bitbucket_started) * 1000)
+            wall = time.perf_counter() - started
+        finally:
+            figma_integration.requests = original_requests
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+        return self._results(runs, stage_samples, wall)
+
+    def _run_one(self, ticket) -> Dict[str, Any]:
+        """Analyze and store one ticket, returning its latency and per-stage totals."""
+        error = None
+        stages: Dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            kwargs = {'mode': self.args.mode, 'parallel': self.args.parallel_sections, 'sections': self.args.sections}
+            if self.args.incremental:
+                result = self.analyzer.reanalyze_ticket(ticket, **kwargs)
+            else:
+                result = self.analyzer.analyze_ticket_content(ticket, **kwargs)
+                stage_started = time.perf_counter()
+                report = self.analyzer.generate_report(result)
+                stages['report_generation'] = (time.perf_counter() - stage_started) * 1000
+                stage_started = time.perf_counter()
+                self.analyzer.ticket_storage.store_ticket({
+                    "id": ticket.ticket_id,
+                    "ticket_key": ticket.ticket_id,
+                    "title": ticket.title,
+                    "description": ticket.description,
+                    "analysis": self.analyzer.get_storage_analysis(result),
+                    "report": report
+                })
+                stages['storage'] = (time.perf_counter() - stage_started) * 1000
+            for stage, timing in (result.timings or {}).items():
+                stages[stage] = stages.get(stage, 0.0) + timing['total_ms']
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return {
+            'ticket_id': ticket.ticket_id,
+            'latency_ms': (time.perf_counter() - started) * 1000,
+            'error': error,
+            'stages': stages,
+        }
+
+    @contextlib.contextmanager
+    def _quiet(self):
+        """Silence the analyzer's progress output unless --verbose."""
+        if self.args.verbose:
+            yield
+            return
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+
+    def _results(self, runs: List[Dict[str, Any]], stage_samples: Dict[str, List[float]],
+                 wall: float) -> Dict[str, Any]:
+        latencies = [run['latency_ms'] for run in runs if not run['error']]
+        per_ticket: Dict[str, List[float]] = {}
+        for run in runs:
+            if not run['error']:
+                per_ticket.setdefault(run['ticket_id'], []).append(run['latency_ms'])
+
+        results = {
+            'meta': {
+                'commit': git_commit(),
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'options': {key: value for key, value in vars(self.args).items() if key != 'compare'},
+            },
+            'runs': len(runs),
+            'errors': [{'ticket_id': run['ticket_id'], 'round': run['round'], 'error': run['error']}
+                       for run in runs if run['error']],
+            'wall_seconds': round(wall, 3),
+            'throughput_per_second': round(len(latencies) / wall, 3) if wall else 0.0,
+            'latency_ms': latency_stats(latencies),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': {stage: latency_stats(samples) for stage, samples in sorted(stage_samples.items())},
+            'tickets': {ticket_id: latency_stats(samples) for ticket_id, samples in per_ticket.items()},
+            'calls': self.recorder.report(),
+            'model_tiers': self.analyzer.tier_metrics.snapshot(),
+            'openai_rate_limits': get_rate_limiter().snapshot(),
+        }
+        if self.args.keep_payloads:
+            results['payload_samples'] = self.recorder.payloads
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _lookup(results: Dict[str, Any], dotted: str) -> Optional[float]:
+    value: Any = results
+    for part in dotted.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def print_summary(results: Dict[str, Any]):
+    latency = results['latency_ms']
+    print(f"\n📊 Benchmark @ {results['meta']['commit']}: {results['runs']} run(s) in {results['wall_seconds']}s, "
+          f"{len(results['errors'])} error(s)")
+    print(f"   Latency p50 {latency.get('p50', 0):.1f}ms, p95 {latency.get('p95', 0):.1f}ms, "
+          f"mean {latency.get('mean', 0):.1f}ms")
+    print(f"   Throughput {results['throughput_per_second']}/s, peak RSS {results['peak_rss_mb']} MB")
+    print("   Stages (p50 / p95 ms per analysis):")
+    for stage, stats in results['stages'].items():
+        print(f"     {stage:<36} {stats['p50']:>10.1f} {stats['p95']:>10.1f}")
+    print("   Calls:")
+    for endpoint, stats in results['calls'].items():
+        print(f"     {endpoint:<36} {stats['count']:>6}")
+    for error in results['errors'][:5]:
+        print(f"   ❌ {error['ticket_id']} (round {error['round']}): {error['error']}")
+
+
+def print_comparison(baseline: Dict[str, Any], results: Dict[str, Any]):
+    print(f"\n🔍 Compared with {baseline.get('meta', {}).get('commit', '?')} "
+          f"({baseline.get('meta', {}).get('timestamp', '?')}):")
+    rows = list(COMPARED_METRICS)
+    rows += [(f"stages.{stage}.p50", True) for stage in results['stages'] if stage in baseline.get('stages', {})]
+    for metric, lower_is_better in rows:
+        before, after = _lookup(baseline, metric), _lookup(results, metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        improved = (change < 0) == lower_is_better
+        marker = '✅' if abs(change) < 5 or improved else '⚠️'
+        print(f"   {marker} {metric:<44} {before:>10.1f} → {after:>10.1f} ({change:+.1f}%)")
+
+    for endpoint in sorted(set(results['calls']) | set(baseline.get('calls', {}))):
+        before = baseline.get('calls', {}).get(endpoint, {}).get('count', 0)
+        after = results['calls'].get(endpoint, {}).get('count', 0)
+        if before != after:
+            print(f"   ℹ️ {endpoint} calls: {before} → {after}")
+
+
+def save_results(results: Dict[str, Any], output: Optional[str]) -> str:
+    if not output:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"benchmark_{results['meta']['commit']}_{stamp}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    return output
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark for the Jira-Figma analyzer")
+    parser.add_argument('--config', default='config.json', help='Analyzer config file')
+    parser.add_argument('--examples', default=os.path.join('examples', '*.json'), help='Glob of ticket JSON files')
+    parser.add_argument('--synthetic', type=int, default=2, help='Number of synthetic large tickets to add')
+    parser.add_argument('--synthetic-paragraphs', type=int, default=40, help='Requirement paragraphs per synthetic ticket')
+    parser.add_argument('--synthetic-figma-links', type=int, default=3, help='Figma links per synthetic ticket')
+    parser.add_argument('--repeat', type=int, default=3, help='Rounds over the ticket set')
+    parser.add_argument('--concurrency', type=int, default=1, help='Tickets analyzed at once')
+    parser.add_argument('--mode', choices=['sections', 'structured'], default='sections', help='Analysis mode')
+    parser.add_argument('--parallel-sections', action=argparse.BooleanOptionalAction, default=None,
+                        help='Force the parallel or sequential section runner (default: config)')
+    parser.add_argument('--sections', help='Comma-separated sections to generate (default: all)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Use reanalyze_ticket so later rounds reuse unchanged sections')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Seconds per stubbed chat completion')
+    parser.add_argument('--figma-latency', type=float, default=0.03, help='Seconds per stubbed Figma request')
+    parser.add_argument('--bitbucket-latency', type=float, default=0.02, help='Seconds per stubbed Bitbucket request')
+    parser.add_argument('--jitter', type=float, default=0.01, help='Extra random latency of up to this many seconds')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the latency jitter')
+    parser.add_argument('--figma-pages', type=int, default=2, help='Pages per synthetic Figma file')
+    parser.add_argument('--figma-frames', type=int, default=6, help='Frames per synthetic Figma page')
+    parser.add_argument('--figma-elements', type=int, default=12, help='Elements per synthetic Figma frame')
+    parser.add_argument('--payloads', help='JSON file of recorded responses to serve instead of generated ones')
+    parser.add_argument('--keep-payloads', type=int, default=0, help='Request samples to keep per endpoint')
+    parser.add_argument('--output', help=f'Where to save the results (default: {RESULTS_DIR}/)')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument('--verbose', action='store_true', help="Show the analyzer's own output")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = Benchmark(args).run()
+    path = save_results(results, args.output)
+    print_summary(results)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            print_comparison(json.load(f), results)
+    print(f"\n💾 Results saved to {path}")
+    return 1 if results['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -49,9 +49,9 @@ def clear_all_tickets():
         conn.commit()
         conn.close()
         
-        # Clear search index
-        storage.search_index = {}
-        storage._save_search_index()
+        # The delete triggers already emptied the search index; rebuilding also
+        # drops anything left over from an interrupted run
+        storage.rebuild_search_index()
         
         print("✅ All tickets, questions, and test cases deleted successfully!")
         print("✅ Search index cleared!")
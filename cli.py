@@ -10,7 +10,7 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from jira_figma_analyzer import JiraFigmaAnalyzer
+from jira_figma_analyzer import JiraFigmaAnalyzer, ANALYSIS_SECTIONS
 
 def main():
     parser = argparse.ArgumentParser(
@@ -29,6 +29,9 @@ Examples:
 
   # Output to file
   python cli.py --file ticket.json --output report.md
+
+  # Only generate test cases (skips design and media analysis they don't need)
+  python cli.py --file ticket.json --sections test_cases
         """
     )
     
@@ -63,6 +66,14 @@ Examples:
         help='Output format (default: markdown)'
     )
     
+    parser.add_argument(
+        '--sections', '-s',
+        type=str,
+        help='Comma-separated sections to generate (default: all): ' + ', '.join(
+            section for section, _ in ANALYSIS_SECTIONS
+        )
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -71,6 +82,11 @@ Examples:
     
     args = parser.parse_args()
     
+    try:
+        sections = JiraFigmaAnalyzer.resolve_sections(args.sections)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # Initialize analyzer
     analyzer = JiraFigmaAnalyzer()
     
@@ -94,7 +110,7 @@ Examples:
     # Analyze ticket
     try:
         ticket = analyzer.parse_jira_ticket(ticket_data)
-        result = analyzer.analyze_ticket_content(ticket)
+        result = analyzer.analyze_ticket_content(ticket, sections=sections)
         
         # Generate output
         output = generate_output(result, analyzer, args.format)
@@ -189,6 +205,10 @@ def interactive_input():
     
     return ticket_data
 
+# Sections included in JSON output when no sections were requested
+JSON_SECTIONS = ['suggested_questions', 'clarifications_needed', 'technical_considerations',
+                 'design_questions', 'business_questions', 'risk_areas']
+
 def generate_output(result, analyzer, format_type):
     """Generate output in the specified format."""
     if format_type == 'markdown':
@@ -201,12 +221,8 @@ def generate_output(result, analyzer, format_type):
                 'priority': result.ticket.priority,
                 'figma_links': result.ticket.figma_links
             },
-            'suggested_questions': result.suggested_questions,
-            'clarifications_needed': result.clarifications_needed,
-            'technical_considerations': result.technical_considerations,
-            'design_questions': result.design_questions,
-            'business_questions': result.business_questions,
-            'risk_areas': result.risk_areas
+            # Section-selective runs output exactly the sections asked for
+            **{section: getattr(result, section) for section in (result.requested_sections or JSON_SECTIONS)}
         }, indent=2)
     else:  # text
         return generate_text_output(result)
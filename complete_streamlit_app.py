@@ -15,8 +15,10 @@ Features:
 import streamlit as st
 import json
 import time
-from datetime import datetime
-from jira_figma_analyzer import JiraFigmaAnalyzer, JiraTicket
+from datetime import datetime, timedelta
+from jira_figma_analyzer import (
+    JiraFigmaAnalyzer, JiraTicket, AnalysisFinished, DesignAnalyzed, SectionCompleted
+)
 from ticket_storage_system import TicketStorageSystem
 from implemented_screens_manager import render_implemented_screens_ui
 import pandas as pd
@@ -41,6 +43,11 @@ load_dotenv()
 def init_storage():
     return TicketStorageSystem()
 
+# Share one analyzer across reruns; its integrations load on first use
+@st.cache_resource
+def init_analyzer():
+    return JiraFigmaAnalyzer()
+
 def display_gpt4_vision_results(result):
     """Display GPT-4 Vision analysis results."""
     if not hasattr(result, 'visual_analysis_results') or not result.visual_analysis_results:
@@ -313,7 +320,7 @@ def main():
 def analyze_tickets_section(storage):
     """Enhanced ticket analysis section with storage."""
     # Initialize analyzer
-    analyzer = JiraFigmaAnalyzer()
+    analyzer = init_analyzer()
     
     # GPT-4 Vision info banner
     st.info("🚀 **NEW: GPT-4 Vision Integration!** Upload design screenshots in the **📝 Manual Entry** tab for AI-powered visual analysis. Or try the demo in **🔍 Screen Explorer**!")
@@ -330,6 +337,16 @@ def analyze_tickets_section(storage):
     auto_store = st.sidebar.checkbox("Auto-store analysis results", value=True)
     store_format = st.sidebar.selectbox("Storage format", ["Full Details", "Summary Only"])
     
+    # Section selection
+    st.sidebar.header("Analysis Sections")
+    st.session_state['requested_sections'] = st.sidebar.multiselect(
+        "Sections to generate",
+        list(SECTION_TITLES),
+        default=list(SECTION_TITLES),
+        format_func=lambda section: SECTION_TITLES[section],
+        help="Only the inputs the chosen sections need are analyzed, e.g. test cases alone skip media analysis"
+    )
+    
     if input_method == "Manual Entry":
         manual_entry_form(analyzer, storage, auto_store, store_format)
     elif input_method == "JSON Import":
@@ -475,6 +492,36 @@ def manual_entry_form(analyzer, storage, auto_store, store_format):
         # Analyze ticket
         analyze_ticket_content(analyzer, ticket_data, storage, auto_store, store_format)
 
+SECTION_TITLES = {
+    'suggested_questions': "❓ Suggested Questions",
+    'clarifications_needed': "🔍 Clarifications Needed",
+    'technical_considerations': "⚙️ Technical Considerations",
+    'design_questions': "🎨 Design Questions",
+    'business_questions': "💼 Business Questions",
+    'risk_areas': "⚠️ Risk Areas",
+    'test_cases': "🧪 Test Cases",
+}
+
+def stream_ticket_analysis(analyzer, ticket, sections=None):
+    """Run the analysis, rendering each design source and section as soon as it is ready."""
+    result = None
+    with st.status("🔍 Analyzing ticket...", expanded=True) as status:
+        for event in analyzer.iter_analysis(ticket, sections=sections):
+            if isinstance(event, DesignAnalyzed):
+                icon = "✅" if event.ok else "⚠️"
+                detail = f" ({event.error})" if event.error else ""
+                st.write(f"{icon} {event.kind.upper()} design analyzed: {event.source}{detail}")
+            elif isinstance(event, SectionCompleted):
+                label = SECTION_TITLES.get(event.section, event.section)
+                note = " · reused" if event.reused else " · fallback" if event.fallback else ""
+                with st.expander(f"{label} ({len(event.items)}){note}"):
+                    for item in event.items:
+                        st.markdown(f"- {item}")
+            elif isinstance(event, AnalysisFinished):
+                result = event.result
+        status.update(label="✅ Analysis complete", state="complete", expanded=False)
+    return result
+
 def analyze_ticket_content(analyzer, ticket_data, storage, auto_store, store_format):
     """Analyze ticket content and display results."""
     try:
@@ -483,22 +530,35 @@ def analyze_ticket_content(analyzer, ticket_data, storage, auto_store, store_for
             st.error(f"❌ Invalid ticket data type: {type(ticket_data)}. Expected dictionary.")
             return
             
-        with st.spinner("🔍 Analyzing ticket..."):
-            # Parse ticket with error handling
-            try:
-                ticket = analyzer.parse_jira_ticket(ticket_data)
-            except Exception as e:
-                st.error(f"❌ Error parsing ticket: {e}")
-                return
-            
-            # Analyze with context (including media files and visual analysis)
+        # Parse ticket with error handling
+        try:
+            ticket = analyzer.parse_jira_ticket(ticket_data)
+            if ticket_data.get('media_files'):
+                ticket.media_files = ticket_data['media_files']
+        except Exception as e:
+            st.error(f"❌ Error parsing ticket: {e}")
+            return
+        
+        # Only the sections picked in the sidebar; None generates all of them
+        sections = st.session_state.get('requested_sections')
+        if sections is not None and not sections:
+            st.warning("Please select at least one analysis section.")
+            return
+        if sections is not None and len(sections) == len(SECTION_TITLES):
+            sections = None
+        
+        # Run the standard analysis, showing each section as it completes
+        try:
+            result = stream_ticket_analysis(analyzer, ticket, sections)
+        except Exception as e:
+            st.error(f"❌ Error during analysis: {e}")
+            import traceback
+            st.error(f"Full error: {traceback.format_exc()}")
+            return
+        
+        with st.spinner("🔍 Finishing analysis..."):
+            # Add visual analysis on top of the standard analysis
             try:
-                # First, do the standard analysis
-                if ticket_data.get('media_files'):
-                    result = analyzer.analyze_ticket_with_media(ticket_data, ticket_data['media_files'])
-                else:
-                    result = analyzer.analyze_ticket_content(ticket)
-                
                 # Add GPT-4 Vision analysis if images were uploaded
                 if ticket_data.get('visual_analysis_images') and hasattr(analyzer, 'analyze_ticket_with_visual_content'):
                     st.info("🤖 Running GPT-4 Vision analysis...")
@@ -536,17 +596,7 @@ def analyze_ticket_content(analyzer, ticket_data, storage, auto_store, store_for
                     "ticket_key": ticket.ticket_id,
                     "title": ticket.title,
                     "description": ticket.description,
-                    "analysis": {
-                        "suggested_questions": result.suggested_questions,
-                        "design_questions": result.design_questions,
-                        "business_questions": result.business_questions,
-                        "technical_considerations": result.technical_considerations,
-                        "risk_areas": result.risk_areas,
-                        "test_cases": result.test_cases,
-                        "figma_designs": getattr(result, "figma_designs", []),
-                        "pdf_designs": getattr(result, "pdf_designs", []),
-                        "media_files": getattr(result, "media_files", [])
-                    },
+                    "analysis": analyzer.get_storage_analysis(result),
                     "report": report
                 })
             except Exception as e:
@@ -1010,6 +1060,9 @@ def feedback_analytics_section():
     except Exception as e:
         st.error(f"❌ Error loading feedback analytics: {e}")
 
+# Stored tickets shown per page in Search & Browse
+BROWSE_PAGE_SIZE = 20
+
 def search_and_browse_section(storage):
     """Search and browse stored tickets."""
     st.header("🔍 Search & Browse Tickets")
@@ -1022,20 +1075,22 @@ def search_and_browse_section(storage):
         search_type = st.selectbox("Type", ["All", "Questions", "Risks", "Content"])
     
     if search_query:
+        st.caption('Use "quotes" for phrases, word* for prefixes and questions:, risks:, title: to search one field')
+        search_fields = {
+            "All": None,
+            "Questions": ["questions"],
+            "Risks": ["risks"],
+            "Content": ["key", "title", "description"]
+        }[search_type]
         with st.spinner("Searching..."):
-            if search_type == "All":
-                results = storage.search_tickets(search_query)
-            elif search_type == "Questions":
-                results = storage.search_questions(search_query)
-            elif search_type == "Risks":
-                results = storage.search_risks(search_query)
-            else:
-                results = storage.search_ticket_content(search_query)
+            results = storage.search_tickets(search_query, fields=search_fields)
         
         if results:
             st.success(f"Found {len(results)} results")
             for idx, result in enumerate(results[:10]):  # Show first 10 results
                 with st.expander(f"🎫 {result.get('ticket_key', 'Unknown')} - {result.get('title', 'No title')[:50]}..."):
+                    if result.get('snippet'):
+                        st.markdown(f"**Match:** {result['snippet']}")
                     st.markdown(f"**Description:** {result.get('description', 'No description')[:200]}...")
                     st.markdown(f"**Stored:** {result.get('created_at', 'Unknown date')}")
                     
@@ -1071,14 +1126,12 @@ def search_and_browse_section(storage):
         else:
             st.info("No results found. Try different keywords.")
     
-    # Recent tickets
+    # Stored tickets, paged newest first
     st.markdown("---")
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2 = st.columns([3, 1])
     with col1:
         st.subheader("📅 Stored Tickets")
     with col2:
-        show_all = st.checkbox("Show All Tickets", value=False)
-    with col3:
         if st.button("🗑️ Delete All", type="secondary", help="Delete all stored tickets"):
             if st.session_state.get('confirm_delete_all', False):
                 if storage.delete_all_tickets():
@@ -1091,17 +1144,37 @@ def search_and_browse_section(storage):
                 st.session_state['confirm_delete_all'] = True
                 st.warning("⚠️ Click again to confirm deletion of ALL tickets")
     
-    # Get tickets based on user preference
-    if show_all:
-        all_tickets = storage.get_all_tickets()
-        tickets_to_show = all_tickets[:50]  # Limit to 50 for performance
-        if len(all_tickets) > 50:
-            st.info(f"Showing first 50 of {len(all_tickets)} tickets")
-    else:
-        tickets_to_show = storage.get_recent_tickets(limit=10)
+    filter_col1, filter_col2, filter_col3 = st.columns([2, 1, 2])
+    with filter_col1:
+        browse_query = st.text_input("Filter", key="browse_query", placeholder="Only tickets mentioning...")
+    with filter_col2:
+        figma_filter = st.selectbox("Figma", ["All", "With Figma", "Without Figma"], key="browse_figma")
+    with filter_col3:
+        date_range = st.date_input("Created between", value=(), key="browse_dates")
+    
+    created_after = date_range[0] if len(date_range) > 0 else None
+    # The end date is inclusive
+    created_before = date_range[1] + timedelta(days=1) if len(date_range) > 1 else None
+    has_figma = {"All": None, "With Figma": True, "Without Figma": False}[figma_filter]
+    
+    # Continuation tokens of the pages visited so far; changing a filter starts again from the newest
+    browse_filters = (browse_query, figma_filter, tuple(date_range))
+    if st.session_state.get('browse_filters') != browse_filters:
+        st.session_state['browse_filters'] = browse_filters
+        st.session_state['browse_cursors'] = [None]
+    browse_cursors = st.session_state['browse_cursors']
+    
+    page = storage.browse_tickets(
+        page_size=BROWSE_PAGE_SIZE, cursor=browse_cursors[-1], has_figma=has_figma,
+        created_after=created_after, created_before=created_before, query=browse_query
+    )
+    tickets_to_show = page['tickets']
     
     if not tickets_to_show:
-        st.info("No tickets found. Analyze some tickets first!")
+        if any([browse_query, has_figma is not None, created_after]):
+            st.info("No tickets match these filters.")
+        else:
+            st.info("No tickets found. Analyze some tickets first!")
     else:
         for idx, ticket in enumerate(tickets_to_show):
             with st.expander(f"🎫 {ticket.get('ticket_key', 'Unknown')} - {ticket.get('title', 'No title')[:50]}..."):
@@ -1139,6 +1212,18 @@ def search_and_browse_section(storage):
                                 st.error("❌ Failed to delete ticket")
                         else:
                             st.error("Invalid ticket ID")
+        
+        nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+        with nav_col1:
+            if len(browse_cursors) > 1 and st.button("⬅️ Newer", key="browse_newer"):
+                browse_cursors.pop()
+                st.rerun()
+        with nav_col2:
+            st.caption(f"Page {len(browse_cursors)} · {storage.get_ticket_count()} tickets stored")
+        with nav_col3:
+            if page['next_cursor'] and st.button("Older ➡️", key="browse_older"):
+                browse_cursors.append(page['next_cursor'])
+                st.rerun()
 
 def analytics_section(storage):
     """Analytics and statistics dashboard."""
@@ -1401,9 +1486,8 @@ def screen_explorer_section():
                     f.write(demo_image.getbuffer())
                 
                 try:
-                    # Initialize analyzer
-                    from jira_figma_analyzer import JiraFigmaAnalyzer
-                    analyzer = JiraFigmaAnalyzer()
+                    # Reuse the cached analyzer instead of building one per click
+                    analyzer = init_analyzer()
                     
                     if analyzer.vision_analyzer:
                         # Run visual analysis
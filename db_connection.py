@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Manager for Jira-Figma Analyzer
+
+Hands out one long-lived connection per thread instead of connecting and
+closing on every call. Connections run in WAL mode with synchronous=NORMAL,
+a larger page cache and memory-mapped reads, so the Streamlit app and the
+webhook worker can read while the other writes. Write transactions take the
+write lock up front and retry while another process holds it.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Pages kept in memory per connection, in KiB (negative values are KiB for SQLite)
+DEFAULT_CACHE_KB = 16 * 1024
+# Bytes of the database file read through mmap rather than read() calls
+DEFAULT_MMAP_BYTES = 256 * 1024 * 1024
+
+# Managers already created by this process, by database path
+_managers: Dict[str, 'ConnectionManager'] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: str) -> 'ConnectionManager':
+    """Get this process's connection manager for a database, creating it on first use."""
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = ConnectionManager(db_path)
+        return _managers[key]
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class ConnectionManager:
+    """Thread-local SQLite connections with WAL journaling and busy retry."""
+
+    def __init__(self, db_path: str, busy_timeout: float = 5.0, busy_retries: int = 5,
+                 cache_kb: int = DEFAULT_CACHE_KB, mmap_bytes: int = DEFAULT_MMAP_BYTES):
+        """Initialize the manager. Connections are opened lazily, one per thread.
+
+        Args:
+            db_path: SQLite database file
+            busy_timeout: Seconds SQLite waits on a lock before reporting it busy
+            busy_retries: Extra attempts, with backoff, at taking the write lock
+                after a busy timeout
+            cache_kb: Page cache size per connection in KiB
+            mmap_bytes: Memory-mapped I/O size; 0 disables it
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.busy_retries = busy_retries
+        self.cache_kb = cache_kb
+        self.mmap_bytes = mmap_bytes
+        self.journal_mode = None
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use.
+
+        The connection is in autocommit mode: each statement outside
+        transaction() commits on its own and never holds a read snapshot open.
+        """
+        conn = getattr(self._local, 'conn', None)
+        # A forked child must not share its parent's connection
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._open()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+        try:
+            mode = conn.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+        except sqlite3.OperationalError as e:
+            # Switching to WAL needs a moment without other writers; the next connection retries
+            mode = None
+            print(f"⚠️ Could not enable WAL for {self.db_path}: {e}")
+        if mode and mode.lower() != 'wal' and self.journal_mode != mode:
+            print(f"⚠️ {self.db_path} is using journal_mode={mode}; readers and writers will block each other")
+        self.journal_mode = mode or self.journal_mode
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA cache_size = {-int(self.cache_kb)}')
+        conn.execute(f'PRAGMA mmap_size = {int(self.mmap_bytes)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        return conn
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Cursor]:
+        """Cursor on this thread's connection for queries.
+
+        In WAL mode readers never wait on a writer, nor a writer on them.
+        """
+        cursor = self.connection().cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Cursor inside a write transaction, committed on success and rolled back on error.
+
+        The write lock is taken at BEGIN, so once the block runs it can't fail
+        on a busy database halfway through.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            # Nested use joins the outer transaction
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        self._begin(conn)
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            cursor.close()
+
+    def _begin(self, conn: sqlite3.Connection):
+        for attempt in range(self.busy_retries + 1):
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == self.busy_retries:
+                    raise
+                delay = min(2.0, 0.05 * 2 ** attempt) * (0.5 + random.random())
+                print(f"⏳ {self.db_path} is busy, retrying write in {delay:.2f}s")
+                time.sleep(delay)
+
+    def close(self):
+        """Close this thread's connection. Other threads' connections close when their thread ends."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            if self._local.pid == os.getpid():
+                conn.close()
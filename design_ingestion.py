@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Design Ingestion for Jira-Figma Analyzer
+
+Analyzes every design source attached to a ticket (Figma links, PDF designs
+and media files) concurrently. Figma fetches are network-bound and run on a
+thread pool; PDF parsing and OCR are CPU-bound and run on a process pool that
+is kept for the life of the DesignIngestion, so each worker builds its
+analyzers once. Results are merged back in input order and failures are
+reported per source.
+"""
+
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import (
+    ThreadPoolExecutor, ProcessPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
+
+# Analyzer instances reused by every task a worker process runs
+_worker_analyzers: Dict[str, Any] = {}
+
+
+def _get_worker_analyzer(kind: str):
+    """Get this process's PDF or media analyzer, creating it on first use."""
+    if kind not in _worker_analyzers:
+        if kind == 'pdf':
+            from pdf_design_analyzer import PDFDesignAnalyzer
+            _worker_analyzers[kind] = PDFDesignAnalyzer()
+        else:
+            from media_analyzer import MediaAnalyzer
+            _worker_analyzers[kind] = MediaAnalyzer()
+    return _worker_analyzers[kind]
+
+
+def analyze_figma_source(figma_url: str, figma_integration) -> Optional[Dict[str, Any]]:
+    """Fetch and analyze one Figma design, returning its analysis context."""
+    print(f"   📥 Processing: {figma_url}")
+    design = figma_integration.analyze_figma_design(figma_url)
+    if not design:
+        print(f"   ❌ Failed to analyze design from: {figma_url}")
+        return None
+
+    design_context = figma_integration.get_design_context_for_analysis(design)
+    print(f"   ✅ Design analyzed: {design_context['design_name']}")
+    print(f"      📱 Screens: {len(design_context['screens'])}")
+    print(f"      🧩 Components: {design_context['components_count']}")
+    print(f"      ⚡ Complexity: {design_context['design_complexity']:.1f}/10")
+    return design_context
+
+
+def analyze_pdf_source(pdf_path: str, pdf_design_analyzer=None) -> Optional[Dict[str, Any]]:
+    """Analyze one PDF design, returning its analysis context.
+
+    Without an analyzer the worker process's own instance is used, so this
+    can be submitted to a process pool.
+    """
+    analyzer = pdf_design_analyzer or _get_worker_analyzer('pdf')
+    print(f"   📄 Processing: {pdf_path}")
+    pdf_analysis = analyzer.analyze_pdf_design(pdf_path)
+    if not pdf_analysis:
+        print(f"   ❌ Failed to analyze PDF: {pdf_path}")
+        return None
+
+    pdf_context = analyzer.get_design_context_for_analysis(pdf_analysis)
+    # Rename keys to match expected format
+    pdf_context['pdf_name'] = pdf_context['design_name']
+    pdf_context['pdf_complexity'] = pdf_context['design_complexity']
+    pdf_context['pages'] = [f"Page {i+1}" for i in range(pdf_context['pages_count'])]
+
+    print(f"   ✅ PDF analyzed: {pdf_context['pdf_name']}")
+    print(f"      📄 Pages: {pdf_context['pages_count']}")
+    print(f"      🧩 Components: {len(pdf_context['ui_components'])}")
+    print(f"      📱 Screens: {len(pdf_context['screens'])}")
+    print(f"      🎨 Type: {pdf_context['design_type']}")
+    print(f"      ⚡ Complexity: {pdf_context['pdf_complexity']:.1f}/10")
+    return pdf_context
+
+
+def analyze_media_source(media_file: str, media_analyzer=None) -> Optional[Dict[str, Any]]:
+    """Analyze one image or video, returning its analysis context.
+
+    Without an analyzer the worker process's own instance is used, so this
+    can be submitted to a process pool.
+    """
+    analyzer = media_analyzer or _get_worker_analyzer('media')
+    print(f"📸 Processing media file: {media_file}")
+    analysis = analyzer.analyze_media_file(media_file)
+    if not analysis:
+        print(f"⚠️ Could not analyze media file: {media_file}")
+        return None
+
+    # Convert to dict for JSON serialization
+    media_context = analyzer.get_analysis_context(analysis)
+    media_context.update({
+        'filename': analysis.filename,
+        'media_id': analysis.media_id,
+        'analysis_date': analysis.analysis_date
+    })
+    print(f"✅ Media analysis complete: {analysis.content_type} ({analysis.media_type})")
+    return media_context
+
+
+@dataclass
+class SourceResult:
+    """Outcome of analyzing a single design source."""
+    kind: str  # 'figma', 'pdf' or 'media'
+    source: str
+    context: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.context is not None
+
+    def to_report(self) -> Dict[str, Any]:
+        """Summary of this source without the analysis payload."""
+        report = asdict(self)
+        report.pop('context')
+        report['status'] = 'ok' if self.ok else 'failed'
+        return report
+
+
+class DesignIngestion:
+    """Runs the design analysis for all of a ticket's sources concurrently."""
+
+    def __init__(self, figma_integration_factory: Callable[[], Any], thread_workers: int = 4,
+                 process_workers: int = 2, timeout: float = 180):
+        """Initialize the ingestion stage. The process pool is started on first use.
+
+        Args:
+            figma_integration_factory: Returns the FigmaIntegration to fetch with;
+                only called when the ticket has Figma links
+            thread_workers: Threads for network-bound Figma fetches
+            process_workers: Processes for PDF parsing and OCR. 0 runs them
+                on the thread pool instead.
+            timeout: Default seconds one ingestion may take before unfinished
+                sources are reported as timed out
+        """
+        self.figma_integration_factory = figma_integration_factory
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.timeout = timeout
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._processes_lock = threading.Lock()
+        self._processes_unavailable = False
+
+    def ingest(self, figma_links: Optional[List[str]] = None, pdf_paths: Optional[List[str]] = None,
+               media_files: Optional[List[str]] = None, timeout: Optional[float] = None) -> Dict[str, List[SourceResult]]:
+        """Analyze every source and return results per kind, in input order."""
+        return self.merge(self.iter_ingest(figma_links, pdf_paths, media_files, timeout))
+
+    def iter_ingest(self, figma_links: Optional[List[str]] = None, pdf_paths: Optional[List[str]] = None,
+                    media_files: Optional[List[str]] = None,
+                    timeout: Optional[float] = None) -> Iterator[Tuple[int, SourceResult]]:
+        """Analyze every source, yielding (position, result) pairs as soon as each is ready.
+
+        Position is the source's index among all inputs (Figma links, then PDFs,
+        then media files); pass the pairs to merge() for the ordered results.
+        Figma links are skipped when no Figma integration is available.
+
+        Args:
+            timeout: Seconds for this ingestion; defaults to the instance's timeout
+        """
+        return self._iter_indexed(figma_links, pdf_paths, media_files,
+                                  self.timeout if timeout is None else timeout)
+
+    def shutdown(self):
+        """Stop the process pool's workers. A later ingestion starts a new pool."""
+        with self._processes_lock:
+            processes, self._processes = self._processes, None
+        if processes:
+            processes.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def merge(indexed_results) -> Dict[str, List[SourceResult]]:
+        """Group (position, result) pairs per kind, in input order."""
+        results = {'figma': [], 'pdf': [], 'media': []}
+        for _, result in sorted(indexed_results, key=lambda item: item[0]):
+            results[result.kind].append(result)
+        return results
+
+    def _iter_indexed(self, figma_links, pdf_paths, media_files, timeout) -> Iterator[Tuple[int, SourceResult]]:
+        """Yield (input position, result) pairs in completion order."""
+        tasks = []
+        figma_integration = self.figma_integration_factory() if figma_links else None
+        if figma_integration:
+            tasks += [('figma', url, analyze_figma_source, (url, figma_integration)) for url in figma_links]
+        cpu_tasks = [('pdf', path, analyze_pdf_source, (path,)) for path in pdf_paths or []]
+        cpu_tasks += [('media', path, analyze_media_source, (path,)) for path in media_files or []]
+        if not tasks and not cpu_tasks:
+            return
+
+        started = time.monotonic()
+        failed = []
+        threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="design-ingestion")
+        processes = self._process_pool() if cpu_tasks else None
+        submitted = {}
+        try:
+            cpu_pool = processes or threads
+            for index, (kind, source, fn, args) in enumerate(tasks + cpu_tasks):
+                pool = threads if kind == 'figma' else cpu_pool
+                try:
+                    future = pool.submit(self._timed, fn, *args)
+                except BrokenProcessPool:
+                    # Another ingestion's worker died and broke the shared pool
+                    self._discard_process_pool(processes)
+                    cpu_pool = threads
+                    future = threads.submit(self._timed, fn, *args)
+                submitted[future] = (index, kind, source, fn, args)
+
+            pending = set(submitted)
+            try:
+                for future in as_completed(submitted, timeout=timeout):
+                    pending.discard(future)
+                    index, kind, source, fn, args = submitted[future]
+                    try:
+                        context, seconds = future.result()
+                        result = SourceResult(kind, source, context, None if context else "analysis returned no result", seconds)
+                    except BrokenProcessPool:
+                        # Worker died (or processes are unavailable here); retry in-process
+                        print(f"   ⚠️ Process pool unavailable, analyzing {source} in-process")
+                        self._discard_process_pool(processes)
+                        result = self._run_inline(kind, source, fn, args)
+                    except Exception as e:
+                        result = SourceResult(kind, source, error=str(e))
+                    if not result.ok:
+                        failed.append(result)
+                    yield index, result
+            except FutureTimeoutError:
+                for future in pending:
+                    future.cancel()
+                    index, kind, source, _, _ = submitted[future]
+                    result = SourceResult(kind, source, error=f"timed out after {timeout}s")
+                    failed.append(result)
+                    yield index, result
+        finally:
+            threads.shutdown(wait=False, cancel_futures=True)
+            # The process pool outlives this ticket; only drop its queued work
+            for future in submitted:
+                future.cancel()
+
+        total = len(tasks) + len(cpu_tasks)
+        print(f"⚡ Ingested {total - len(failed)}/{total} design sources in {time.monotonic() - started:.2f}s")
+        for result in failed:
+            print(f"   ❌ {result.kind} source failed: {result.source} ({result.error})")
+
+    def _process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Get the shared process pool, starting it on first use; None to use threads."""
+        if not self.process_workers or self._processes_unavailable:
+            return None
+        with self._processes_lock:
+            if self._processes is None:
+                try:
+                    # Spawned workers don't inherit the caller's threads and locks the way forked ones would
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self.process_workers, mp_context=multiprocessing.get_context('spawn')
+                    )
+                except (OSError, NotImplementedError, ImportError) as e:
+                    print(f"⚠️ Process pool unavailable ({e}), analyzing PDFs and media on threads")
+                    self._processes_unavailable = True
+                    return None
+                atexit.unregister(self.shutdown)
+                atexit.register(self.shutdown)
+            return self._processes
+
+    def _discard_process_pool(self, processes: ProcessPoolExecutor):
+        """Forget a broken pool so the next ingestion starts a fresh one."""
+        with self._processes_lock:
+            if self._processes is processes:
+                self._processes = None
+        processes.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _timed(fn: Callable, *args):
+        started = time.monotonic()
+        return fn(*args), time.monotonic() - started
+
+    def _run_inline(self, kind: str, source: str, fn: Callable, args: tuple) -> SourceResult:
+        try:
+            context, seconds = self._timed(fn, *args)
+            return SourceResult(kind, source, context, None if context else "analysis returned no result", seconds)
+        except Exception as e:
+            return SourceResult(kind, source, error=str(e))
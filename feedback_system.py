@@ -457,6 +457,13 @@ class FeedbackSystem:
         print(f"📊 Feedback data exported to {output_file}")
         return str(output_file)
     
+    def get_version(self) -> List[Optional[int]]:
+        """Get the newest feedback and improvement row ids; they change whenever either is recorded."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT (SELECT MAX(rowid) FROM feedback), (SELECT MAX(rowid) FROM improvements)')
+            return list(cursor.fetchone())
+    
     def get_feedback_stats(self) -> Dict[str, Any]:
         """Get basic feedback statistics."""
         with sqlite3.connect(self.db_path) as conn:
@@ -194,6 +194,25 @@ class FigmaIntegration:
             print(f"Error fetching Figma file: {e}")
             return None
     
+    def get_file_version(self, file_key: str) -> Optional[str]:
+        """Get the current version ID of a Figma file without fetching its node tree."""
+        if not self.figma_token:
+            return None
+
+        try:
+            url = f"{self.base_url}/files/{file_key}"
+            response = requests.get(url, headers=self.headers, params={"depth": 1}, timeout=15)
+
+            if response.status_code == 200:
+                data = response.json()
+                return data.get('version') or data.get('lastModified')
+            print(f"⚠️ Could not fetch Figma file version: {response.status_code}")
+            return None
+
+        except Exception as e:
+            print(f"Error fetching Figma file version: {e}")
+            return None
+
     def get_figma_images(self, file_key: str, node_ids: List[str] = None) -> Optional[Dict]:
         """Get image exports of Figma nodes."""
         if not self.figma_token:
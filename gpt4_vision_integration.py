@@ -15,6 +15,9 @@ from dataclasses import dataclass
 from datetime import datetime
 from PIL import Image
 import io
+from llm_cache import LLMResponseCache
+from openai_rate_limiter import OpenAIRateLimiter, get_rate_limiter, estimate_tokens
+from tracing import span
 
 @dataclass
 class VisualAnalysisResult:
@@ -60,8 +63,11 @@ class VisualAnalysisResult:
 class GPT4VisionAnalyzer:
     """Main class for GPT-4 Vision-powered visual analysis."""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, cache: LLMResponseCache = None,
+                 rate_limiter: OpenAIRateLimiter = None):
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
+        self.cache = cache or LLMResponseCache()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
         self.base_url = "https://api.openai.com/v1/chat/completions"
         self.headers = {
             "Content-Type": "application/json",
@@ -365,6 +371,17 @@ Provide a comprehensive comparison with specific recommendations.
         
         return base_prompt.strip()
     
+    def _post(self, payload: Dict[str, Any]) -> requests.Response:
+        """Send a chat completion request through the shared OpenAI rate limiter."""
+        def usage(response):
+            return response.json().get('usage', {}).get('total_tokens') if response.status_code == 200 else None
+        
+        return self.rate_limiter.call(
+            lambda: requests.post(self.base_url, headers=self.headers, json=payload, timeout=120),
+            estimated_tokens=estimate_tokens(payload['messages'], payload['max_tokens']),
+            usage=usage
+        )
+    
     def _call_gpt4_vision_api(self, image_base64: str, prompt: str) -> Optional[Dict[str, Any]]:
         """Call GPT-4 Vision API with image and prompt."""
         if not self.openai_api_key:
@@ -395,17 +412,29 @@ Provide a comprehensive comparison with specific recommendations.
             "temperature": 0.3
         }
         
+        cache_key = LLMResponseCache.make_key(**payload)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("⚡ GPT-4 Vision response served from cache")
+            cached['processing_time'] = 0.0
+            return cached
+        
         try:
             print("🤖 Calling GPT-4 Vision API...")
             start_time = datetime.now()
             
-            response = requests.post(self.base_url, headers=self.headers, json=payload)
+            with span('llm_call', model=payload['model'], max_tokens=payload['max_tokens'], vision=True) as stage:
+                response = self._post(payload)
+                usage = response.json().get('usage', {}) if response.status_code == 200 else {}
+                stage.set(status=response.status_code, prompt_tokens=usage.get('prompt_tokens'),
+                          completion_tokens=usage.get('completion_tokens'))
             
             processing_time = (datetime.now() - start_time).total_seconds()
             print(f"⏱️ GPT-4 Vision processing completed in {processing_time:.2f}s")
             
             if response.status_code == 200:
                 result = response.json()
+                self.cache.set(cache_key, result, model=payload['model'])
                 result['processing_time'] = processing_time
                 return result
             else:
@@ -440,9 +469,18 @@ Provide a comprehensive comparison with specific recommendations.
             "temperature": 0.3
         }
         
+        cache_key = LLMResponseCache.make_key(**payload)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.post(self.base_url, headers=self.headers, json=payload)
-            return response.json() if response.status_code == 200 else None
+            response = self._post(payload)
+            if response.status_code != 200:
+                return None
+            result = response.json()
+            self.cache.set(cache_key, result, model=payload['model'])
+            return result
         except Exception as e:
             print(f"❌ Error in multi-image analysis: {e}")
             return None
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Streaming Jira Export Importer for Jira-Figma Analyzer
+
+Reads Jira bulk exports (JSON array or REST search response, NDJSON, CSV
+and the XML/RSS export) one issue at a time, normalizes each issue into the
+dict shape ``JiraFigmaAnalyzer.parse_jira_ticket`` expects, and feeds the
+tickets into analysis and storage in fixed-size batches. Only the current
+batch is held in memory, so multi-GB exports can be backfilled into the
+knowledge base.
+"""
+
+import csv
+import html
+import json
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator, TextIO
+
+FORMATS = ('json', 'ndjson', 'csv', 'xml')
+
+EXTENSION_FORMATS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+    '.xml': 'xml',
+    '.rss': 'xml',
+}
+
+CHUNK_SIZE = 1 << 20  # characters read per refill of the JSON stream buffer
+
+# Jira CSV header -> parse_jira_ticket key, for single-valued columns
+CSV_COLUMNS = {
+    'Issue key': 'key',
+    'Summary': 'summary',
+    'Description': 'description',
+    'Priority': 'priority',
+    'Status': 'status',
+    'Assignee': 'assignee',
+    'Reporter': 'reporter',
+    'Issue Type': 'issue_type',
+    'Created': 'created',
+    'Updated': 'updated',
+}
+
+# Columns Jira repeats once per value (Labels, Labels, ...)
+CSV_LIST_COLUMNS = {
+    'Labels': 'labels',
+    'Component/s': 'components',
+    'Comment': 'comments',
+}
+
+# Jira CSV comments are exported as "<created>;<author id>;<body>"
+_CSV_COMMENT = re.compile(r'^(\d[^;]*);([^;]*);(.*)$', re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_BLOCK_TAG = re.compile(r'<\s*(br|/p|/div|/li|/h\d|/tr)\b[^>]*>', re.IGNORECASE)
+_RSS_TITLE_KEY = re.compile(r'^\[[^\]]+\]\s*')
+_JSON_ISSUES = re.compile(r'"issues"\s*:\s*\[')
+# What may still follow a decoded number when the buffer was cut mid-number ("45" of 456, "-1.5" of -1.5e3)
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+
+
+def detect_format(path: str) -> str:
+    """Guess an export's format from its extension, falling back to its first bytes."""
+    suffix = Path(path).suffix.lower()
+    if suffix in EXTENSION_FORMATS:
+        fmt = EXTENSION_FORMATS[suffix]
+        if fmt != 'json':
+            return fmt
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        head = f.read(4096).lstrip()
+    if head.startswith('<'):
+        return 'xml'
+    if head.startswith('['):
+        return 'json'
+    if head.startswith('{'):
+        # A JSON document spanning many lines vs. one object per line
+        first_line = head.split('\n', 1)[0].strip()
+        try:
+            json.loads(first_line)
+            return 'ndjson'
+        except ValueError:
+            return 'json'
+    return 'csv'
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """Strip the HTML Jira renders descriptions and comments with in RSS exports."""
+    if not value:
+        return ''
+    text = _BLOCK_TAG.sub('\n', value)
+    text = html.unescape(_TAG.sub('', text))
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def adf_to_text(node: Any) -> str:
+    """Flatten an Atlassian Document Format body (REST API v3) to plain text."""
+    if isinstance(node, str):
+        return node
+    if isinstance(node, list):
+        return ''.join(adf_to_text(child) for child in node)
+    if not isinstance(node, dict):
+        return ''
+    if node.get('type') == 'text':
+        return node.get('text', '')
+    if node.get('type') == 'hardBreak':
+        return '\n'
+    text = adf_to_text(node.get('content', []))
+    if node.get('type') in ('paragraph', 'heading', 'listItem', 'codeBlock', 'blockquote'):
+        text += '\n'
+    return text
+
+
+def normalize_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a Jira REST issue (``{"key": ..., "fields": {...}}``) into parse_jira_ticket's flat shape.
+
+    Already-flat dicts (manual exports, the repo's example tickets) pass
+    through with only their description and comments coerced to text.
+    """
+    ticket = {k: v for k, v in issue.items() if k != 'fields'}
+    fields = issue.get('fields')
+    if isinstance(fields, dict):
+        for name, value in fields.items():
+            ticket.setdefault(name, value)
+        if 'issuetype' in fields:
+            ticket.setdefault('issue_type', fields['issuetype'])
+
+    if not isinstance(ticket.get('description'), str):
+        ticket['description'] = adf_to_text(ticket.get('description')).strip()
+
+    comments = ticket.get('comments')
+    if comments is None:
+        comment_field = ticket.get('comment')
+        if isinstance(comment_field, dict):
+            comments = comment_field.get('comments', [])
+        elif isinstance(comment_field, list):
+            comments = comment_field
+    ticket['comments'] = [
+        {**c, 'body': c.get('body') if isinstance(c.get('body'), str) else adf_to_text(c.get('body')).strip()}
+        if isinstance(c, dict) else {'body': str(c)}
+        for c in (comments or [])
+    ]
+
+    if isinstance(ticket.get('issue_type'), dict):
+        ticket['issue_type'] = ticket['issue_type'].get('name', '')
+    if not isinstance(ticket.get('labels'), list):
+        ticket['labels'] = [ticket['labels']] if ticket.get('labels') else []
+    if not isinstance(ticket.get('components'), list):
+        ticket['components'] = [ticket['components']] if ticket.get('components') else []
+    return ticket
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a JSON array one at a time without reading the whole document.
+
+    Accepts a bare top-level array or an object holding it under ``"issues"``
+    (the shape of a Jira search response).
+    """
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    if buffer.startswith('['):
+        pos = 1
+    elif buffer.startswith('{'):
+        match = _JSON_ISSUES.search(buffer)
+        while not match:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise ValueError('JSON export has no top-level array or "issues" array')
+            buffer += chunk
+            match = _JSON_ISSUES.search(buffer)
+        pos = match.end()
+    else:
+        raise ValueError('JSON export has no top-level array or "issues" array')
+
+    while True:
+        # Skip separators, refilling the buffer as it runs dry
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer):
+                break
+            buffer, pos = stream.read(chunk_size), 0
+            if not buffer:
+                raise ValueError('JSON export ended inside the issues array')
+        if buffer[pos] == ']':
+            return
+
+        read_size = chunk_size
+        at_eof = False
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A number cut at the end of the buffer may go on in the next chunk
+                if at_eof or not _NUMBER_TAIL.match(buffer, end):
+                    pos = end
+                    break
+            except json.JSONDecodeError:
+                if at_eof:
+                    raise
+            # The element straddles the end of the buffer; read more, growing
+            # the reads so a single huge issue isn't re-decoded per chunk
+            chunk = stream.read(read_size)
+            at_eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            read_size *= 2
+        yield item
+
+        if pos >= chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def iter_ndjson(stream: TextIO) -> Iterator[Any]:
+    """Yield one JSON value per non-blank line."""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON on line {line_number}: {e}") from e
+
+
+def _csv_comment(value: str) -> Dict[str, str]:
+    match = _CSV_COMMENT.match(value)
+    if match:
+        return {'created': match.group(1), 'author': match.group(2), 'body': match.group(3)}
+    return {'body': value}
+
+
+def iter_csv(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield tickets from a Jira CSV export, merging its repeated Labels/Component/s/Comment columns."""
+    # Descriptions routinely exceed csv's 128KB default field limit
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if not header:
+        return
+    header = [name.strip() for name in header]
+
+    for row in reader:
+        if not any(row):
+            continue
+        ticket: Dict[str, Any] = {'labels': [], 'components': [], 'comments': []}
+        for name, value in zip(header, row):
+            if name in CSV_COLUMNS:
+                ticket[CSV_COLUMNS[name]] = value
+            elif name in CSV_LIST_COLUMNS and value.strip():
+                key = CSV_LIST_COLUMNS[name]
+                ticket[key].append(_csv_comment(value) if key == 'comments' else value.strip())
+        yield ticket
+
+
+def _xml_item_to_ticket(item: ET.Element) -> Dict[str, Any]:
+    """Map one ``<item>`` of Jira's XML/RSS export to parse_jira_ticket's flat shape."""
+    def text(tag: str) -> str:
+        return (item.findtext(tag) or '').strip()
+
+    summary = text('summary') or _RSS_TITLE_KEY.sub('', text('title'))
+    return {
+        'key': text('key'),
+        'summary': summary,
+        'description': html_to_text(item.findtext('description')),
+        'priority': text('priority'),
+        'status': text('status'),
+        'assignee': text('assignee'),
+        'reporter': text('reporter'),
+        'issue_type': text('type'),
+        'created': text('created'),
+        'updated': text('updated'),
+        'labels': [label.text.strip() for label in item.iterfind('labels/label') if label.text and label.text.strip()],
+        'components': [c.text.strip() for c in item.iterfind('component') if c.text and c.text.strip()],
+        'comments': [
+            {'author': c.get('author', ''), 'created': c.get('created', ''), 'body': html_to_text(c.text)}
+            for c in item.iterfind('comments/comment')
+        ]
+    }
+
+
+def iter_xml(stream) -> Iterator[Dict[str, Any]]:
+    """Yield tickets from Jira's XML/RSS export, discarding each ``<item>`` once converted."""
+    parents: List[ET.Element] = []
+    depth = 0  # nesting inside the current item
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'item':
+                depth += 1
+            if depth == 0:
+                parents.append(elem)
+            continue
+
+        if elem.tag == 'item':
+            depth -= 1
+            if depth == 0:
+                ticket = _xml_item_to_ticket(elem)
+                # Drop the converted item so the tree never holds more than one
+                parents[-1].remove(elem)
+                yield ticket
+        elif depth == 0 and parents:
+            parents.pop()
+
+
+def iter_export(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream the issues of a Jira export as dicts ready for parse_jira_ticket.
+
+    Args:
+        path: Export file
+        fmt: One of FORMATS; detected from the file when omitted
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Expected one of: {', '.join(FORMATS)}")
+
+    if fmt == 'xml':
+        with open(path, 'rb') as f:
+            yield from iter_xml(f)
+        return
+
+    with open(path, 'r', encoding='utf-8-sig', newline='' if fmt == 'csv' else None) as f:
+        if fmt == 'csv':
+            yield from iter_csv(f)
+            return
+        issues = iter_json_array(f) if fmt == 'json' else iter_ndjson(f)
+        for issue in issues:
+            if isinstance(issue, dict):
+                yield normalize_issue(issue)
+
+
+def iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most batch_size items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class JiraExportImporter:
+    """Backfill tickets from a Jira export into analysis and ticket storage."""
+
+    def __init__(self, analyzer, batch_size: int = 50, analyze: bool = True,
+                 sections: Optional[Iterable[str]] = None, workers: int = 1,
+                 skip_existing: bool = False, max_errors: int = 100):
+        """Initialize the importer.
+
+        Args:
+            analyzer: JiraFigmaAnalyzer used to parse, analyze and store tickets
+            batch_size: Tickets read from the export and processed together
+            analyze: Run analysis before storing; False stores the bare tickets
+            sections: Sections to generate (see JiraFigmaAnalyzer.resolve_sections)
+            workers: Tickets of a batch analyzed concurrently
+            skip_existing: Leave tickets that are already stored untouched
+            max_errors: Per-ticket errors kept in the returned stats
+        """
+        self.analyzer = analyzer
+        self.batch_size = max(1, batch_size)
+        self.analyze = analyze
+        self.sections = analyzer.resolve_sections(sections) if sections else None
+        self.workers = max(1, workers)
+        self.skip_existing = skip_existing
+        self.max_errors = max_errors
+
+    def import_export(self, path: str, fmt: Optional[str] = None,
+                      limit: Optional[int] = None) -> Dict[str, Any]:
+        """Import every issue of an export and return counts of what happened.
+
+        Args:
+            path: Export file
+            fmt: Export format; detected when omitted
+            limit: Stop after this many issues
+        """
+        fmt = fmt or detect_format(path)
+        stats: Dict[str, Any] = {
+            'path': str(path), 'format': fmt, 'read': 0, 'imported': 0,
+            'skipped': 0, 'failed': 0, 'batches': 0, 'errors': []
+        }
+        started = time.time()
+
+        issues = iter_export(path, fmt)
+        if limit is not None:
+            issues = islice(issues, limit)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch in iter_batches(issues, self.batch_size):
+                stats['batches'] += 1
+                stats['read'] += len(batch)
+                for key, outcome, error in executor.map(self._import_one, batch):
+                    stats[outcome] += 1
+                    if error and len(stats['errors']) < self.max_errors:
+                        stats['errors'].append({'key': key, 'error': error})
+                print(f"📦 Batch {stats['batches']}: {stats['read']} read, {stats['imported']} imported, "
+                      f"{stats['skipped']} skipped, {stats['failed']} failed")
+
+        stats['seconds'] = round(time.time() - started, 3)
+        return stats
+
+    def _import_one(self, ticket_data: Dict[str, Any]):
+        """Parse, analyze and store one issue; returns (key, outcome, error)."""
+        key = str(ticket_data.get('key') or '').strip()
+        if not key:
+            return '', 'failed', 'issue has no key'
+        try:
+            storage = self.analyzer.ticket_storage
+            if self.skip_existing and storage and storage.get_ticket(key):
+                return key, 'skipped', None
+
+            ticket = self.analyzer.parse_jira_ticket(ticket_data)
+            if self.analyze:
+                self.analyzer.reanalyze_ticket(ticket, sections=self.sections)
+            elif storage:
+                # Refreshing the ticket text shouldn't discard an analysis stored earlier
+                stored = None if self.skip_existing else storage.get_ticket(key)
+                storage.store_ticket({
+                    "id": ticket.ticket_id,
+                    "ticket_key": ticket.ticket_id,
+                    "title": ticket.title,
+                    "description": ticket.description,
+                    "analysis": (stored or {}).get('analysis') or {}
+                })
+            else:
+                return key, 'failed', 'ticket storage is not available'
+            return key, 'imported', None
+        except Exception as e:
+            return key, 'failed', f"{type(e).__name__}: {e}"
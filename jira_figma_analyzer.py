@@ -8,9 +8,13 @@ questions and clarifications that can be asked from the client.
 
 import re
 import json
+import time
+import threading
 import requests
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple, Any, Iterable, Iterator, ClassVar, TYPE_CHECKING
+from dataclasses import dataclass, replace
+from functools import cached_property
 from urllib.parse import urlparse, parse_qs
 import os
 from dotenv import load_dotenv
@@ -18,61 +22,60 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Import Figma integration
-try:
-    from figma_integration import FigmaIntegration
-    FIGMA_AVAILABLE = True
-except ImportError:
-    FIGMA_AVAILABLE = False
-    print("⚠️ Figma integration not available. Install required dependencies for full Figma analysis.")
-
-# Import feedback learning system
-try:
-    from feedback_learning_system import FeedbackLearningSystem
-    from feedback_system import FeedbackSystem
-    FEEDBACK_LEARNING_AVAILABLE = True
-except ImportError:
-    FEEDBACK_LEARNING_AVAILABLE = False
-
-# Import PDF design analysis
-try:
-    from pdf_design_analyzer import PDFDesignAnalyzer
-    PDF_DESIGN_AVAILABLE = True
-except ImportError:
-    PDF_DESIGN_AVAILABLE = False
-    print("⚠️ PDF design analysis not available. Install PyMuPDF and PyPDF2 for PDF design analysis.")
-
-# Import media analyzer for videos and images
-
-# Import smart routing system
-try:
-    from smart_routing_system import SmartRoutingSystem
-    SMART_ROUTING_AVAILABLE = True
-except ImportError:
-    SMART_ROUTING_AVAILABLE = False
-    print("⚠️ Smart routing not available. Install required dependencies for smart assignment.")
-try:
-    from media_analyzer import MediaAnalyzer
-    MEDIA_ANALYSIS_AVAILABLE = True
-except ImportError:
-    MEDIA_ANALYSIS_AVAILABLE = False
-    print("⚠️ Media analysis not available. Install Pillow and opencv-python for media analysis.")
-
-# Import GPT-4 Vision integration
-try:
-    from gpt4_vision_integration import GPT4VisionAnalyzer, VisualAnalysisResult
-    GPT4_VISION_AVAILABLE = True
-except ImportError:
-    GPT4_VISION_AVAILABLE = False
-    print("⚠️ GPT-4 Vision not available. OpenAI API key required for visual analysis.")
-
-# Import feedback system
-try:
-    from feedback_system import FeedbackSystem
-    FEEDBACK_AVAILABLE = True
-except ImportError:
-    FEEDBACK_AVAILABLE = False
-    print("⚠️ Feedback system not available.")
+# Integrations (Figma, PDF, media/OCR, feedback, smart routing, GPT-4 Vision)
+# are imported lazily by JiraFigmaAnalyzer the first time they are used, so a
+# text-only analysis never pays for cv2, fitz or pytesseract imports.
+if TYPE_CHECKING:
+    from gpt4_vision_integration import VisualAnalysisResult
+
+from llm_cache import LLMResponseCache, CachedOpenAIClient, request_deadline
+from openai_rate_limiter import RateLimitedOpenAIClient, get_rate_limiter
+from model_tiering import TierPolicy, TierMetrics, TierSelection
+from knowledge_snapshot import get_snapshot
+from prompt_budget import PromptBudget, ContextBlock
+from keyword_engine import TICKET_KEYWORDS
+from tracing import Trace, span, record_span, propagate, start_trace, end_trace, current_trace
+from analysis_fingerprints import (
+    compute_fingerprints, reusable_sections, held_tier_skips, section_fingerprints, required_inputs
+)
+from design_ingestion import (
+    DesignIngestion, SourceResult, analyze_figma_source, analyze_pdf_source, analyze_media_source
+)
+
+# Section generators run by analyze_ticket_content, keyed by AnalysisResult field
+ANALYSIS_SECTIONS = [
+    ('suggested_questions', '_generate_questions'),
+    ('clarifications_needed', '_generate_clarifications'),
+    ('technical_considerations', '_generate_technical_considerations'),
+    ('design_questions', '_generate_design_questions'),
+    ('business_questions', '_generate_business_questions'),
+    ('risk_areas', '_generate_risk_areas'),
+    ('test_cases', '_generate_test_cases'),
+]
+
+# Sections whose generators call the LLM; the others are heuristic
+LLM_SECTIONS = {'suggested_questions', 'design_questions', 'business_questions', 'test_cases'}
+
+# Sections requested from the model in structured (single-call) mode, with the
+# same per-section limits the individual generators apply
+STRUCTURED_SECTION_LIMITS = {
+    'suggested_questions': 12,
+    'clarifications_needed': 10,
+    'design_questions': 8,
+    'business_questions': 15,
+    'risk_areas': 8,
+    'test_cases': 25,
+}
+
+# What the structured prompt asks for under each key
+STRUCTURED_SECTION_PROMPTS = {
+    'suggested_questions': "8-12 clarifying questions for the client",
+    'clarifications_needed': "up to 10 areas that need clarification",
+    'design_questions': "6-8 design questions about implementing THIS specific feature",
+    'business_questions': "12-15 business questions (value, compliance, metrics, operations)",
+    'risk_areas': "up to 8 delivery or technical risks",
+    'test_cases': "20-25 test cases (functional, security & compliance, performance, UX)",
+}
 
 @dataclass
 class JiraTicket:
@@ -101,108 +104,309 @@ class AnalysisResult:
     business_questions: List[str]
     risk_areas: List[str]
     test_cases: List[str]
+    design_sources: Optional[List[Dict[str, Any]]] = None  # Per-source ingestion status
+    fingerprints: Optional[Dict[str, str]] = None  # Input fingerprints of this run
+    section_fingerprints: Optional[Dict[str, Dict[str, str]]] = None  # Inputs each section depended on
+    reused_sections: Optional[List[str]] = None  # Sections carried over from a previous run
+    degraded_sections: Optional[List[str]] = None  # Sections that fell back to heuristic answers
+    tier_skipped_sections: Optional[Dict[str, Dict[str, Any]]] = None  # Sections the model tier skipped, and their inputs
+    model_tier: Optional[Dict[str, Any]] = None  # Tier chosen for the ticket and the LLM usage it accrued
+    timings: Optional[Dict[str, Dict[str, Any]]] = None  # Latency per pipeline stage
+    trace_id: Optional[str] = None  # Trace the stage spans were recorded under
+    requested_sections: Optional[List[str]] = None  # Sections asked for; None means all of them
+
+@dataclass
+class AnalysisEvent:
+    """Progress event yielded by JiraFigmaAnalyzer.iter_analysis."""
+    type: ClassVar[str] = 'event'
+
+
+@dataclass
+class DesignAnalyzed(AnalysisEvent):
+    """A Figma link, PDF design or media file finished analyzing."""
+    kind: str
+    source: str
+    ok: bool
+    error: Optional[str] = None
+    seconds: float = 0.0
+    type: ClassVar[str] = 'design_analyzed'
+
+
+@dataclass
+class SectionStarted(AnalysisEvent):
+    """Generation of an analysis section began."""
+    section: str
+    type: ClassVar[str] = 'section_started'
+
+
+@dataclass
+class SectionCompleted(AnalysisEvent):
+    """An analysis section is ready."""
+    section: str
+    items: List[str]
+    reused: bool = False  # Carried over unchanged from a previous analysis
+    fallback: bool = False  # Heuristic answer used because generation failed or timed out
+    seconds: float = 0.0
+    type: ClassVar[str] = 'section_completed'
+
+
+@dataclass
+class AnalysisFinished(AnalysisEvent):
+    """Every section is done; carries the complete result."""
+    result: AnalysisResult
+    type: ClassVar[str] = 'finished'
+
+
+def _collect_sections(events: Iterator[AnalysisEvent]) -> Dict[str, List[str]]:
+    """Drain section events into a section -> items mapping."""
+    return {event.section: event.items for event in events if isinstance(event, SectionCompleted)}
+
+
+class TicketContext:
+    """Context shared by every section generator for one analysis.
+    
+    Built once per analyze_ticket_content call. Rendered context blocks and
+    keyword extractions are computed on first use and reused by all sections,
+    and ``shared_prefix`` is byte-identical across the section prompts so the
+    provider can cache it.
+    """
+    
+    def __init__(self, analyzer: 'JiraFigmaAnalyzer', ticket: JiraTicket, analysis: Dict):
+        self.analyzer = analyzer
+        self.ticket = ticket
+        self.analysis = analysis
+        self.budget_reports: Dict[str, Dict[str, Any]] = {}
+    
+    @cached_property
+    def keywords(self) -> List[str]:
+        return self.analyzer._extract_relevant_keywords(self.ticket)
+    
+    @cached_property
+    def confluence(self) -> Dict[str, Any]:
+        return getattr(self.analyzer, '_confluence_context', None) or {}
+    
+    @cached_property
+    def detected_topics(self) -> List[str]:
+        return self.confluence.get('detected_topics', [])
+    
+    @cached_property
+    def topics_label(self) -> str:
+        """Comma-separated detected topics, or '' for general tickets."""
+        topics = self.detected_topics
+        return ', '.join(topics) if topics and topics != ['general'] else ''
+    
+    @cached_property
+    def confluence_block(self) -> str:
+        relevant_docs = self.confluence.get('relevant_documents', [])
+        if not relevant_docs:
+            return ""
+        
+        tech_stack, features, business_rules, components = [], [], [], []
+        for doc in relevant_docs:
+            tech_stack.extend(doc.get('tech_stack', []))
+            features.extend(doc.get('features', []))
+            components.extend(doc.get('components', [])[:5])
+        for doc in relevant_docs[:2]:
+            business_rules.extend(doc.get('business_rules', [])[:3])
+        
+        lines = [
+            "Knowledge Base Context (Confluence):",
+            f"- Topic Focus: {self.topics_label or 'General feature development'}",
+            f"- Relevant Documents: {len(relevant_docs)}",
+            f"- Tech Stack: {', '.join(dict.fromkeys(tech_stack[:10]))}",
+            f"- Key Features: {', '.join(dict.fromkeys(features[:5]))}",
+            f"- Related System Components: {', '.join(list(dict.fromkeys(components))[:8])}",
+            "- Domain: Financial Advisory Platform (Habitto)",
+        ]
+        if business_rules:
+            lines.append("- Relevant Business Rules:")
+            lines.extend(
+                f"  {i}. {rule[:100]}{'...' if len(rule) > 100 else ''}"
+                for i, rule in enumerate(business_rules[:5], 1)
+            )
+        return '\n'.join(lines)
+    
+    @cached_property
+    def ticket_knowledge_block(self) -> str:
+        knowledge = self.analysis.get('ticket_knowledge') or {}
+        if not knowledge.get('relevant_tickets'):
+            return ""
+        return '\n'.join([
+            "Knowledge from Similar Past Tickets:",
+            f"- {len(knowledge['relevant_tickets'])} similar tickets found in knowledge base",
+            f"- Common question patterns: {', '.join(knowledge.get('question_patterns', [])[:3])}",
+            f"- Common risk areas: {', '.join(knowledge.get('risk_patterns', [])[:2])}",
+            f"- Insights: {', '.join(knowledge.get('insights', [])[:2])}",
+        ])
+    
+    @cached_property
+    def figma_knowledge_block(self) -> str:
+        figma_knowledge = self.analysis.get('figma_knowledge') or {}
+        if not figma_knowledge.get('design_patterns'):
+            return ""
+        return '\n'.join([
+            "Figma Design Knowledge from Past Tickets:",
+            f"- {len(figma_knowledge['design_patterns'])} Figma design patterns analyzed",
+            f"- Total Figma tickets in knowledge base: {figma_knowledge.get('total_figma_tickets', 0)}",
+            f"- Design insights: {', '.join(figma_knowledge.get('figma_insights', [])[:3])}",
+            f"- Common components: {', '.join(figma_knowledge.get('component_patterns', [])[:5])}",
+            f"- Predicted complexity: {self.analysis.get('predicted_design_complexity', 'Unknown')} questions",
+            f"- Complexity level: {self.analysis.get('design_complexity_level', 'Unknown')}",
+        ])
+    
+    @cached_property
+    def media_block(self) -> str:
+        return self.analyzer._get_media_context_for_questions(self.analysis)
+    
+    @cached_property
+    def figma_interaction_block(self) -> str:
+        return self.analyzer._get_figma_interaction_context(self.analysis)
+    
+    @cached_property
+    def visual_block(self) -> str:
+        return self.analyzer._get_visual_context_for_questions(self.analysis)
+    
+    @cached_property
+    def feedback_block(self) -> str:
+        """Feedback-driven improvements for the ticket's detected topics."""
+        if not self.analyzer.feedback_learning:
+            return ""
+        return self.analyzer._get_feedback_learning_context(self.detected_topics)
+    
+    @cached_property
+    def design_feedback_block(self) -> str:
+        if not self.analyzer.feedback_learning:
+            return ""
+        return self.analyzer._get_feedback_learning_context(['design'])
+    
+    @cached_property
+    def shared_prefix(self) -> str:
+        """System prompt shared verbatim by every section request, fitted to its token budget."""
+        ticket = self.ticket
+        analysis = self.analysis
+        blocks = [
+            ContextBlock('intro', "You are assisting the Habitto team (a financial advisory platform) in analyzing a Jira ticket. "
+                         "The ticket and its shared context follow; the specific task for this request is given in the next message.",
+                         priority=0, required=True),
+            ContextBlock('ticket', '\n'.join([
+                "TICKET:",
+                f"- Title: {ticket.title}",
+                f"- Description: {ticket.description}",
+                f"- Priority: {ticket.priority}",
+                f"- Labels: {', '.join(ticket.labels or [])}",
+                f"- Components: {', '.join(ticket.components or [])}",
+                f"- Detected Topics: {self.topics_label or 'general feature development'}",
+            ]), priority=0, required=True),
+            ContextBlock('analysis', '\n'.join([
+                "ANALYSIS CONTEXT:",
+                f"- Figma Links: {len(ticket.figma_links or [])}",
+                f"- PDF Designs: {len(analysis.get('pdf_designs', []))}",
+                f"- Media Files: {len(analysis.get('media_files', []))} uploaded images/videos",
+                f"- Has Mobile: {analysis.get('has_mobile', False)}",
+                f"- Has Integration: {analysis.get('has_integration', False)}",
+                f"- Has Performance: {analysis.get('has_performance', False)}",
+                f"- Has Accessibility: {analysis.get('has_accessibility', False)}",
+                f"- Has Security: {analysis.get('has_security', False)}",
+                f"- Complexity Indicators: {analysis.get('complexity_indicators', [])}",
+            ]), priority=0, required=True),
+            ContextBlock('confluence', self.confluence_block, priority=2),
+            ContextBlock('ticket_knowledge', self.ticket_knowledge_block, priority=3),
+            ContextBlock('figma_knowledge', self.figma_knowledge_block, priority=3),
+            ContextBlock('media', f"MEDIA ANALYSIS:\n{self.media_block}", priority=2),
+            ContextBlock('figma_interactions', f"FIGMA SCREEN INTERACTIONS:\n{self.figma_interaction_block}", priority=1),
+            ContextBlock('visual', self.visual_block, priority=2),
+        ]
+        self.budget_reports['shared_prefix'] = self.analyzer.prompt_budget.fit('shared_prefix', blocks)
+        return '\n\n'.join(block.text for block in blocks if block.text)
+    
+    def prime(self):
+        """Render every shared block up front.
+        
+        Called before section generators are dispatched to worker threads so
+        they read the memoized values instead of racing to compute them.
+        """
+        self.shared_prefix
+        self.feedback_block
+        self.design_feedback_block
+        self.keywords
+    
+    def fit_task_context(self, section: str, blocks: List[ContextBlock]) -> Dict[str, str]:
+        """Fit a section's own context blocks to that section's token budget.
+        
+        Returns the (possibly compacted) text of each block by name.
+        """
+        self.budget_reports[section] = self.analyzer.prompt_budget.fit(section, blocks)
+        return {block.name: block.text for block in blocks}
+    
+    def build_messages(self, task: str) -> List[Dict[str, str]]:
+        """Messages for one section: the shared prefix followed by its task."""
+        return [
+            {"role": "system", "content": self.shared_prefix},
+            {"role": "user", "content": task.strip()}
+        ]
+
+class _LazySubsystem:
+    """Descriptor that builds an analyzer integration on first access."""
+    
+    def __init__(self, builder: str):
+        self.builder = builder
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._get_subsystem(self.name, self.builder)
+    
+    def __set__(self, obj, value):
+        obj._subsystems[self.name] = value
 
 class JiraFigmaAnalyzer:
     """Main analyzer class for Jira tickets with Figma links."""
     
+    # Integrations are built on first use; see _get_subsystem
+    llm_cache = _LazySubsystem('_build_llm_cache')
+    openai_client = _LazySubsystem('_initialize_openai')
+    figma_integration = _LazySubsystem('_build_figma_integration')
+    pdf_design_analyzer = _LazySubsystem('_build_pdf_design_analyzer')
+    ticket_storage = _LazySubsystem('_build_ticket_storage')
+    media_analyzer = _LazySubsystem('_build_media_analyzer')
+    design_ingestion = _LazySubsystem('_build_design_ingestion')
+    feedback_system = _LazySubsystem('_build_feedback_system')
+    feedback_learning = _LazySubsystem('_build_feedback_learning')
+    smart_routing = _LazySubsystem('_build_smart_routing')
+    vision_analyzer = _LazySubsystem('_build_vision_analyzer')
+    
     def __init__(self, config_path: str = "config.json"):
+        init_started = time.perf_counter()
+        self._subsystems = {}
+        self._subsystem_lock = threading.RLock()
+        self.startup_report = {'init_seconds': 0.0, 'subsystems': {}}
+        
         self.config = self._load_config(config_path)
-        self.openai_client = None
-        self.tech_stack_context = self._load_tech_stack_context()
         
-        # Initialize integrations
-        try:
-            from figma_integration import FigmaIntegration
-            self.figma_integration = FigmaIntegration()
-            print("🎨 Figma integration initialized")
-            FIGMA_AVAILABLE = True
-        except ImportError as e:
-            print(f"⚠️ Figma integration not available: {e}")
-            self.figma_integration = None
-            FIGMA_AVAILABLE = False
-            
-        try:
-            from pdf_design_analyzer import PDFDesignAnalyzer
-            self.pdf_design_analyzer = PDFDesignAnalyzer()
-            print("📄 PDF design analyzer initialized")
-            PDF_DESIGN_AVAILABLE = True
-        except ImportError as e:
-            print(f"⚠️ PDF design analyzer not available: {e}")
-            self.pdf_design_analyzer = None
-            PDF_DESIGN_AVAILABLE = False
-
-        # Initialize ticket storage for knowledge
-        try:
-            from ticket_storage_system import TicketStorageSystem
-            self.ticket_storage = TicketStorageSystem()
-            print("🧠 Ticket knowledge system initialized")
-            TICKET_KNOWLEDGE_AVAILABLE = True
-        except ImportError as e:
-            print(f"⚠️ Ticket knowledge not available: {e}")
-            self.ticket_storage = None
-            TICKET_KNOWLEDGE_AVAILABLE = False
-
-        # Initialize media analyzer
-        try:
-            from media_analyzer import MediaAnalyzer
-            self.media_analyzer = MediaAnalyzer()
-            print("📸 Media analyzer initialized")
-            MEDIA_ANALYSIS_AVAILABLE = True
-        except ImportError as e:
-            print(f"⚠️ Media analyzer not available: {e}")
-            self.media_analyzer = None
-            MEDIA_ANALYSIS_AVAILABLE = False
-            self.feedback_system = FeedbackSystem()
-                
-
-        # Initialize feedback system
-        try:
-            from feedback_system import FeedbackSystem
-            self.feedback_system = FeedbackSystem()
-            print("📝 Feedback system initialized")
-            FEEDBACK_AVAILABLE = True
-            
-            # Initialize feedback learning system
-            if FEEDBACK_LEARNING_AVAILABLE:
-                try:
-                    self.feedback_learning = FeedbackLearningSystem(self.feedback_system)
-                    print("🧠 Feedback Learning System initialized")
-                except Exception as e:
-                    print(f"⚠️ Feedback learning system initialization failed: {e}")
-                    self.feedback_learning = None
-            else:
-                self.feedback_learning = None
-                
-        except ImportError as e:
-            print(f"⚠️ Feedback system not available: {e}")
-            self.feedback_system = None
-            self.feedback_learning = None
-            FEEDBACK_AVAILABLE = False
-        # Initialize GPT-4 Vision analyzer
-
-        # Initialize smart routing system
-        if SMART_ROUTING_AVAILABLE:
-            try:
-                self.smart_routing = SmartRoutingSystem()
-                print("🎯 Smart routing system initialized")
-            except Exception as e:
-                print(f"⚠️ Smart routing system initialization failed: {e}")
-                self.smart_routing = None
-        else:
-            self.smart_routing = None
-
-        if GPT4_VISION_AVAILABLE:
-            try:
-                self.vision_analyzer = GPT4VisionAnalyzer()
-                print("🤖 GPT-4 Vision analyzer initialized")
-            except Exception as e:
-                print(f"⚠️ GPT-4 Vision analyzer initialization failed: {e}")
-                self.vision_analyzer = None
-        else:
-            self.vision_analyzer = None
+        # Concurrent section generation settings
+        self.parallel_sections = self.config.get('parallel_sections', False)
+        self.section_workers = self.config.get('section_workers', len(ANALYSIS_SECTIONS))
+        self.section_timeout = self.config.get('section_timeout', 60)
         
-        self._initialize_openai()
+        # 'sections' makes one LLM call per section, 'structured' asks for every
+        # section in a single JSON response
+        self.analysis_mode = self.config.get('analysis_mode', 'sections')
         
+        # Model, token budget and section set are picked per ticket
+        self.tier_policy = TierPolicy.from_config(self.config)
+        self.tier_metrics = TierMetrics()
+        
+        # Token budgets for the context blocks of each prompt
+        self.prompt_budget = PromptBudget(self.config.get('prompt_token_budgets'))
+        
+        # Stage-level tracing; spans are appended to trace_export_path as JSON lines if set
+        self.tracing_enabled = self.config.get('tracing_enabled', True)
+        self.trace_export_path = self.config.get('trace_export_path')
+        
+        self.tech_stack_context = self._load_tech_stack_context()
         print("🔧 Tech stack context loaded")
         
         self.figma_patterns = [
@@ -247,6 +451,113 @@ class JiraFigmaAnalyzer:
                 "Are there any budget constraints we should be aware of?"
             ]
         }
+        
+        self.startup_report['init_seconds'] = time.perf_counter() - init_started
+        print(f"🔧 Analyzer ready in {self.startup_report['init_seconds']:.3f}s (integrations load on first use)")
+    
+    def _get_subsystem(self, name: str, builder: str):
+        """Build an integration the first time it is requested and cache it.
+        
+        Integrations that fail to build are cached as None, matching the
+        previous behavior of the eager initialization.
+        """
+        if name in self._subsystems:
+            return self._subsystems[name]
+        
+        with self._subsystem_lock:
+            if name not in self._subsystems:
+                started = time.perf_counter()
+                try:
+                    self._subsystems[name] = getattr(self, builder)()
+                except Exception as e:
+                    print(f"⚠️ {name} not available: {e}")
+                    self._subsystems[name] = None
+                self.startup_report['subsystems'][name] = {
+                    'available': self._subsystems[name] is not None,
+                    'seconds': time.perf_counter() - started
+                }
+        return self._subsystems[name]
+    
+    def get_startup_report(self) -> Dict[str, Any]:
+        """Get analyzer init time plus load time of every integration built so far."""
+        subsystems = dict(self.startup_report['subsystems'])
+        return {
+            'init_seconds': self.startup_report['init_seconds'],
+            'subsystems': subsystems,
+            'subsystem_seconds': sum(s['seconds'] for s in subsystems.values()),
+            'not_loaded': [
+                name for name, attr in vars(JiraFigmaAnalyzer).items()
+                if isinstance(attr, _LazySubsystem) and name not in subsystems
+            ]
+        }
+    
+    def _build_llm_cache(self) -> LLMResponseCache:
+        # Persistent cache shared by every OpenAI call the analyzer makes
+        return LLMResponseCache(
+            ttl_seconds=self.config.get('llm_cache_ttl_seconds', 7 * 24 * 3600),
+            max_entries=self.config.get('llm_cache_max_entries', 5000),
+            bypass=None if self.config.get('llm_cache_enabled', True) else True
+        )
+    
+    def _build_figma_integration(self):
+        from figma_integration import FigmaIntegration
+        figma_integration = FigmaIntegration()
+        print("🎨 Figma integration initialized")
+        return figma_integration
+    
+    def _build_pdf_design_analyzer(self):
+        from pdf_design_analyzer import PDFDesignAnalyzer
+        pdf_design_analyzer = PDFDesignAnalyzer()
+        print("📄 PDF design analyzer initialized")
+        return pdf_design_analyzer
+    
+    def _build_ticket_storage(self):
+        from ticket_storage_system import TicketStorageSystem
+        ticket_storage = TicketStorageSystem()
+        print("🧠 Ticket knowledge system initialized")
+        return ticket_storage
+    
+    def _build_media_analyzer(self):
+        from media_analyzer import MediaAnalyzer
+        media_analyzer = MediaAnalyzer()
+        print("📸 Media analyzer initialized")
+        return media_analyzer
+    
+    def _build_design_ingestion(self):
+        # One instance per analyzer, so its process pool and the workers' analyzers outlive a ticket
+        return DesignIngestion(
+            figma_integration_factory=lambda: self.figma_integration,
+            thread_workers=self.config.get('design_thread_workers', 4),
+            process_workers=self.config.get('design_process_workers', 2),
+            timeout=self.config.get('design_ingestion_timeout', 180)
+        )
+    
+    def _build_feedback_system(self):
+        from feedback_system import FeedbackSystem
+        feedback_system = FeedbackSystem()
+        print("📝 Feedback system initialized")
+        return feedback_system
+    
+    def _build_feedback_learning(self):
+        from feedback_learning_system import FeedbackLearningSystem
+        if not self.feedback_system:
+            return None
+        feedback_learning = FeedbackLearningSystem(self.feedback_system)
+        print("🧠 Feedback Learning System initialized")
+        return feedback_learning
+    
+    def _build_smart_routing(self):
+        from smart_routing_system import SmartRoutingSystem
+        smart_routing = SmartRoutingSystem()
+        print("🎯 Smart routing system initialized")
+        return smart_routing
+    
+    def _build_vision_analyzer(self):
+        from gpt4_vision_integration import GPT4VisionAnalyzer
+        vision_analyzer = GPT4VisionAnalyzer(cache=self.llm_cache,
+                                             rate_limiter=get_rate_limiter(self.config.get('openai_rate_limits')))
+        print("🤖 GPT-4 Vision analyzer initialized")
+        return vision_analyzer
     
     def extract_figma_links(self, text: str) -> List[str]:
         """Extract Figma links from text."""
@@ -304,132 +615,695 @@ class JiraFigmaAnalyzer:
             pdf_design_paths=pdf_design_paths
         )
     
-    def analyze_ticket_content(self, ticket: JiraTicket) -> AnalysisResult:
-        """Analyze ticket content and generate questions and suggestions."""
+    def analyze_ticket_content(self, ticket: JiraTicket, parallel: Optional[bool] = None,
+                               mode: Optional[str] = None, previous: Optional[Dict] = None,
+                               deadline: Optional[float] = None,
+                               sections: Optional[Iterable[str]] = None) -> AnalysisResult:
+        """Analyze ticket content and generate questions and suggestions.
+        
+        Args:
+            ticket: The ticket to analyze
+            parallel: Run the section generators concurrently. Defaults to the
+                ``parallel_sections`` config setting.
+            mode: 'sections' or 'structured'. Defaults to the ``analysis_mode``
+                config setting.
+            previous: Stored analysis of an earlier run of this ticket. Sections
+                whose inputs haven't changed since are reused instead of regenerated.
+            deadline: Seconds the analysis may take. Every section starts from its
+                heuristic answer and LLM results only replace it if they arrive in
+                time; late calls are abandoned and the section is recorded as degraded.
+                Defaults to the ``analysis_deadline`` config setting (no deadline).
+            sections: Sections to generate (names from ANALYSIS_SECTIONS); defaults
+                to all. Only the inputs these sections depend on are gathered, e.g.
+                test cases alone skip media analysis; other sections are left empty.
+        """
+        for event in self.iter_analysis(ticket, parallel=parallel, mode=mode, previous=previous,
+                                        deadline=deadline, sections=sections):
+            if isinstance(event, AnalysisFinished):
+                return event.result
+    
+    def iter_analysis(self, ticket: JiraTicket, parallel: Optional[bool] = None,
+                      mode: Optional[str] = None, previous: Optional[Dict] = None,
+                      deadline: Optional[float] = None,
+                      sections: Optional[Iterable[str]] = None) -> Iterator[AnalysisEvent]:
+        """Analyze a ticket, yielding progress events as each step completes.
+        
+        Yields DesignAnalyzed for every design source, SectionStarted and
+        SectionCompleted for every section (reused sections complete
+        immediately) and finally AnalysisFinished with the full result.
+        Takes the same arguments as analyze_ticket_content.
+        """
+        requested = self.resolve_sections(sections)
+        trace = self._start_trace(ticket)
+        try:
+            for event in self._iter_analysis_stages(ticket, parallel, mode, previous, deadline, requested):
+                if trace and isinstance(event, AnalysisFinished):
+                    self._finish_trace(trace, event.result)
+                yield event
+        finally:
+            if trace and trace.root.end is None:
+                end_trace(trace)
+    
+    @staticmethod
+    def resolve_sections(sections: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """Validate a requested-sections set, returning it in ANALYSIS_SECTIONS order (None for all).
         
-        # Basic content analysis
-        analysis = self._analyze_content(ticket)
+        Raises ValueError for unknown section names or an empty selection.
+        """
+        if sections is None:
+            return None
+        if isinstance(sections, str):
+            sections = [name.strip() for name in sections.split(',') if name.strip()]
+        known = [section for section, _ in ANALYSIS_SECTIONS]
+        if not sections:
+            raise ValueError(f"No analysis sections requested. Choose from: {', '.join(known)}")
+        unknown = sorted(set(sections) - set(known))
+        if unknown:
+            raise ValueError(f"Unknown analysis section(s): {', '.join(unknown)}. Choose from: {', '.join(known)}")
+        return [section for section in known if section in set(sections)]
+    
+    def _iter_analysis_stages(self, ticket: JiraTicket, parallel: Optional[bool], mode: Optional[str],
+                              previous: Optional[Dict], deadline: Optional[float],
+                              requested: Optional[List[str]]) -> Iterator[AnalysisEvent]:
+        """The analysis pipeline behind iter_analysis, with a span per stage."""
+        wanted = requested if requested is not None else [section for section, _ in ANALYSIS_SECTIONS]
+        inputs = required_inputs(wanted)
+        if deadline is None:
+            deadline = self.config.get('analysis_deadline')
+        started = time.monotonic()
+        deadline_at = started + deadline if deadline else None
         
-        # Analyze Figma designs if present
-        figma_context = None
-        if ticket.figma_links and self.figma_integration:
-            print(f"🎨 Analyzing {len(ticket.figma_links)} Figma design(s)...")
-            figma_context = self._analyze_figma_designs(ticket.figma_links)
+        # Basic content analysis
+        with span('content_analysis'):
+            analysis = self._analyze_content(ticket)
+        
+        if requested is not None:
+            print(f"🎯 Requested sections: {', '.join(requested)} (inputs: {', '.join(inputs)})")
+        
+        if 'knowledge' in inputs:
+            # Get relevant ticket knowledge
+            with span('knowledge.tickets') as stage:
+                ticket_knowledge = self._get_relevant_ticket_knowledge(ticket)
+                analysis = self._enhance_analysis_with_ticket_knowledge(analysis, ticket_knowledge)
+                stage.set(similar_tickets=len(ticket_knowledge.get('relevant_tickets', [])))
             
-            # Enhance analysis with Figma context
-            if figma_context:
-                analysis['figma_designs'] = figma_context
-                # Add type checking to prevent 'str' object has no attribute 'get' error
-                analysis['has_complex_design'] = any(
-                    design.get('complexity_score', 0) > 6 
-                    for design in figma_context 
-                    if isinstance(design, dict)
-                )
-                analysis['total_screens'] = sum(
-                    len(design.get('screens', [])) 
-                    for design in figma_context 
-                    if isinstance(design, dict)
-                )
-                analysis['ui_components_count'] = sum(
-                    len(design.get('ui_components', [])) 
-                    for design in figma_context 
-                    if isinstance(design, dict)
-                )
+            # Get Figma design knowledge from past tickets
+            with span('knowledge.figma') as stage:
+                figma_knowledge = self._get_figma_design_knowledge(ticket)
+                analysis = self._enhance_analysis_with_figma_knowledge(analysis, figma_knowledge, ticket)
+                stage.set(design_patterns=len(figma_knowledge.get('design_patterns', [])))
+        
+        # Fingerprint the inputs and work out which earlier sections still hold
+        with span('fingerprints'):
+            ticket_context = self._get_ticket_context(ticket, analysis)
+            fingerprints = compute_fingerprints(
+                ticket, lambda: self._get_knowledge_version(ticket_context), self._get_figma_file_version, inputs
+            )
+        reused = {
+            section: items for section, items in reusable_sections(previous, fingerprints).items()
+            if section in wanted
+        }
+        stale = [section for section in wanted if section not in reused]
+        
+        # Sections the tier skipped last time stay skipped while their inputs are unchanged and the
+        # re-selected tier still leaves them out. Without design sources there's nothing to ingest
+        # that the tier policy scores, so the tier can be re-selected from the content analysis.
+        tier_skipped = {}
+        held = held_tier_skips(previous, fingerprints)
+        has_designs = ticket.figma_links or ticket.pdf_design_paths or ticket.media_files
+        if stale and all(section in held for section in stale) and not has_designs:
+            tier = self.tier_policy.select(ticket, analysis).tier
+            if not any(tier.includes(section) for section in stale):
+                tier_skipped = {section: tier.name for section in stale}
+                stale = []
+        if previous:
+            print(f"♻️ Reusing {len(reused)} unchanged section(s), regenerating {len(stale)}")
+        if tier_skipped:
+            print(f"   ⏭️ Still skipping sections for this tier: {', '.join(tier_skipped)}")
+        for section, _ in ANALYSIS_SECTIONS:
+            if section in reused:
+                yield SectionCompleted(section, reused[section], reused=True)
+        if not stale:
+            yield AnalysisFinished(self._build_result(
+                ticket, reused, fingerprints, reused, (previous or {}).get('design_sources'), [],
+                (previous or {}).get('model_tier'),
+                requested, tier_skipped
+            ))
+            return
+        
+        # Analyze the Figma links, PDF designs and media files the sections need, concurrently
+        indexed_sources = []
+        with span('design_ingestion') as stage:
+            for index, source in self._iter_design_sources(ticket, deadline_at, inputs):
+                indexed_sources.append((index, source))
+                record_span(f"design.{source.kind}", source.seconds, error=source.error,
+                            source=source.source, ok=source.ok)
+                yield DesignAnalyzed(source.kind, source.source, source.ok, source.error, source.seconds)
+            stage.set(sources=len(indexed_sources))
+        ingested = DesignIngestion.merge(indexed_sources)
+        analysis['design_sources'] = [
+            result.to_report() for kind in ('figma', 'pdf', 'media') for result in ingested[kind]
+        ]
         
-        # Analyze PDF designs if present
-        pdf_context = None
-        if ticket.pdf_design_paths and self.pdf_design_analyzer:
-            print(f"📄 Analyzing {len(ticket.pdf_design_paths)} PDF design(s)...")
-            pdf_context = self._analyze_pdf_designs(ticket.pdf_design_paths)
-            
-            # Enhance analysis with PDF context
-            if pdf_context:
-                analysis['pdf_designs'] = pdf_context
-                # Add type checking to prevent 'str' object has no attribute 'get' error
-                analysis['has_complex_pdf'] = any(
-                    design.get('complexity_score', 0) > 6 
-                    for design in pdf_context 
-                    if isinstance(design, dict)
-                )
-                analysis['total_pdf_pages'] = sum(
-                    len(design.get('pages', [])) 
-                    for design in pdf_context 
-                    if isinstance(design, dict)
-                )
-                analysis['ui_components_count_pdf'] = sum(
-                    len(design.get('ui_components', [])) 
-                    for design in pdf_context 
-                    if isinstance(design, dict)
-                )
+        # Enhance analysis with Figma context
+        figma_context = [result.context for result in ingested['figma'] if result.ok]
+        if figma_context:
+            analysis['figma_designs'] = figma_context
+            # Add type checking to prevent 'str' object has no attribute 'get' error
+            analysis['has_complex_design'] = any(
+                design.get('complexity_score', 0) > 6 
+                for design in figma_context 
+                if isinstance(design, dict)
+            )
+            analysis['total_screens'] = sum(
+                len(design.get('screens', [])) 
+                for design in figma_context 
+                if isinstance(design, dict)
+            )
+            analysis['ui_components_count'] = sum(
+                len(design.get('ui_components', [])) 
+                for design in figma_context 
+                if isinstance(design, dict)
+            )
         
-        # Analyze media files if present
-        media_context = None
-        if ticket.media_files and self.media_analyzer:
-            print(f"📸 Analyzing {len(ticket.media_files)} media file(s)...")
-            media_context = self._analyze_media_files(ticket.media_files)
-            
-            # Enhance analysis with media context
-            if media_context:
-                analysis['media_files'] = media_context
-                analysis['has_complex_media'] = any(
-                    media.get('complexity_score', 0) > 6 
-                    for media in media_context 
-                    if isinstance(media, dict)
-                )
-                analysis['total_media_elements'] = sum(
-                    len(media.get('ui_elements', [])) 
-                    for media in media_context 
-                    if isinstance(media, dict)
-                )
-                analysis['extracted_text_from_media'] = ' '.join(
-                    media.get('extracted_text', '') 
-                    for media in media_context 
-                    if isinstance(media, dict)
-                )
+        # Enhance analysis with PDF context
+        pdf_context = [result.context for result in ingested['pdf'] if result.ok]
+        if pdf_context:
+            analysis['pdf_designs'] = pdf_context
+            # Add type checking to prevent 'str' object has no attribute 'get' error
+            analysis['has_complex_pdf'] = any(
+                design.get('complexity_score', 0) > 6 
+                for design in pdf_context 
+                if isinstance(design, dict)
+            )
+            analysis['total_pdf_pages'] = sum(
+                len(design.get('pages', [])) 
+                for design in pdf_context 
+                if isinstance(design, dict)
+            )
+            analysis['ui_components_count_pdf'] = sum(
+                len(design.get('ui_components', [])) 
+                for design in pdf_context 
+                if isinstance(design, dict)
+            )
+        
+        # Enhance analysis with media context
+        media_context = [result.context for result in ingested['media'] if result.ok]
+        if media_context:
+            analysis['media_files'] = media_context
+            analysis['has_complex_media'] = any(
+                media.get('complexity_score', 0) > 6 
+                for media in media_context 
+                if isinstance(media, dict)
+            )
+            analysis['total_media_elements'] = sum(
+                len(media.get('ui_elements', [])) 
+                for media in media_context 
+                if isinstance(media, dict)
+            )
+            analysis['extracted_text_from_media'] = ' '.join(
+                media.get('extracted_text', '') 
+                for media in media_context 
+                if isinstance(media, dict)
+            )
         
-        # Get relevant ticket knowledge
-        ticket_knowledge = self._get_relevant_ticket_knowledge(ticket)
-        analysis = self._enhance_analysis_with_ticket_knowledge(analysis, ticket_knowledge)
+        # Render the shared prompt context once for every section generator
+        if LLM_SECTIONS.intersection(stale) and self.openai_client:
+            with span('prompt_context'):
+                ticket_context.prime()
         
-        # Get Figma design knowledge from past tickets
-        figma_knowledge = self._get_figma_design_knowledge(ticket)
-        analysis = self._enhance_analysis_with_figma_knowledge(analysis, figma_knowledge, ticket)
+        # Pick the model, token budget and section set for this ticket
+        selection = self.tier_policy.select(ticket, analysis)
+        analysis['model_tier'] = selection
+        skipped = [section for section in stale if not selection.tier.includes(section)]
+        print(f"🎚️ Model tier: {selection.tier.name} ({selection.tier.model}, score {selection.score}"
+              f"{': ' + ', '.join(selection.reasons) if selection.reasons else ''})")
+        if skipped:
+            print(f"   ⏭️ Skipping sections for this tier: {', '.join(skipped)}")
 
         # Generate questions with enhanced context
-        questions = self._generate_questions(ticket, analysis)
-        clarifications = self._generate_clarifications(ticket, analysis)
-        tech_considerations = self._generate_technical_considerations(ticket, analysis)
-        design_questions = self._generate_design_questions(ticket, analysis)
-        business_questions = self._generate_business_questions(ticket, analysis)
-        risks = self._generate_risk_areas(ticket, analysis)
-        test_cases = self._generate_test_cases(ticket, analysis)
-        
+        if parallel is None:
+            parallel = self.parallel_sections
+        if deadline_at is not None:
+            # Only the thread pool can abandon a late section
+            parallel = True
+        only = [section for section in stale if selection.tier.includes(section)]
+        if (mode or self.analysis_mode) == 'structured':
+            events = self._iter_sections_structured(ticket, analysis, parallel, only=only, deadline_at=deadline_at)
+        elif parallel:
+            events = self._iter_sections_parallel(ticket, analysis, only=only, deadline_at=deadline_at)
+        else:
+            events = self._iter_sections_sequential(ticket, analysis, only=only)
+        
+        sections = dict(reused)
+        degraded = []
+        with span('sections', tier=selection.tier.name, count=len(only)):
+            for event in events:
+                if isinstance(event, SectionCompleted):
+                    sections[event.section] = event.items
+                    if event.fallback:
+                        degraded.append(event.section)
+                yield event
+        
+        if degraded:
+            print(f"⚠️ Degraded to heuristic answers: {', '.join(degraded)}")
+        self.tier_metrics.record_analysis(selection, time.monotonic() - started)
+        yield AnalysisFinished(self._build_result(
+            ticket, sections, fingerprints, reused, analysis['design_sources'], degraded, selection.to_report(),
+            requested, {section: selection.tier.name for section in skipped}
+        ))
+    
+    def _build_result(self, ticket: JiraTicket, sections: Dict[str, List[str]], fingerprints: Dict[str, str],
+                      reused: Dict[str, List[str]], design_sources: Optional[List[Dict]],
+                      degraded: List[str], model_tier: Optional[Dict[str, Any]],
+                      requested: Optional[List[str]] = None,
+                      tier_skipped: Optional[Dict[str, str]] = None) -> AnalysisResult:
+        """Assemble an AnalysisResult, recording the inputs each section depended on.
+        
+        Sections that weren't requested or that the model tier skipped are left empty; skipped
+        sections are recorded with the tier that skipped them so a re-analysis can tell whether
+        they're still skipped.
+        """
+        tier_skipped = tier_skipped or {}
+        skipped_fingerprints = section_fingerprints(fingerprints, list(tier_skipped))
         return AnalysisResult(
             ticket=ticket,
-            suggested_questions=questions,
-            clarifications_needed=clarifications,
-            technical_considerations=tech_considerations,
-            design_questions=design_questions,
-            business_questions=business_questions,
-            risk_areas=risks,
-            test_cases=test_cases
+            requested_sections=requested,
+            design_sources=design_sources,
+            model_tier=model_tier,
+            degraded_sections=[section for section, _ in ANALYSIS_SECTIONS if section in degraded],
+            tier_skipped_sections={
+                section: {'tier': tier, 'fingerprints': skipped_fingerprints[section]}
+                for section, tier in tier_skipped.items()
+            },
+            fingerprints=fingerprints,
+            section_fingerprints=section_fingerprints(fingerprints, list(sections)),
+            reused_sections=[section for section, _ in ANALYSIS_SECTIONS if section in reused],
+            **{section: sections.get(section, []) for section, _ in ANALYSIS_SECTIONS}
+        )
+    
+    def _get_figma_file_version(self, figma_url: str) -> Optional[str]:
+        """Get the current version of a linked Figma file, if it can be looked up."""
+        if not self.figma_integration or not hasattr(self.figma_integration, 'get_file_version'):
+            return None
+        file_key = self.figma_integration.extract_figma_file_key(figma_url)
+        return self.figma_integration.get_file_version(file_key) if file_key else None
+    
+    def reanalyze_ticket(self, ticket: JiraTicket, report: Optional[str] = None,
+                         **kwargs) -> AnalysisResult:
+        """Analyze a ticket, reusing unchanged sections of its stored analysis, and store the result.
+        
+        Args:
+            ticket: The (possibly edited) ticket
+            report: Markdown report to store alongside; generated when omitted
+            **kwargs: Passed through to analyze_ticket_content
+        """
+        for event in self.iter_reanalysis(ticket, report=report, **kwargs):
+            if isinstance(event, AnalysisFinished):
+                return event.result
+    
+    def iter_reanalysis(self, ticket: JiraTicket, report: Optional[str] = None,
+                        **kwargs) -> Iterator[AnalysisEvent]:
+        """Streaming variant of reanalyze_ticket; the result is stored before AnalysisFinished is yielded."""
+        trace = self._start_trace(ticket, reanalysis=True)
+        try:
+            previous = None
+            if self.ticket_storage:
+                with span('storage.load'):
+                    stored = self.ticket_storage.get_ticket(ticket.ticket_id)
+                    previous = stored.get('analysis') if stored else None
+            
+            for event in self.iter_analysis(ticket, previous=previous, **kwargs):
+                if isinstance(event, AnalysisFinished) and self.ticket_storage:
+                    # A partial reanalysis keeps the stored answers of the sections it skipped
+                    result = self._merge_previous_sections(event.result, previous)
+                    try:
+                        if report is None:
+                            with span('report_generation'):
+                                report = self.generate_report(result)
+                        with span('storage'):
+                            self.ticket_storage.store_ticket({
+                                "id": ticket.ticket_id,
+                                "ticket_key": ticket.ticket_id,
+                                "title": ticket.title,
+                                "description": ticket.description,
+                                "analysis": self.get_storage_analysis(result),
+                                "report": report
+                            })
+                    except Exception as e:
+                        print(f"⚠️ Failed to store analysis for {ticket.ticket_id}: {e}")
+                if trace and isinstance(event, AnalysisFinished):
+                    self._finish_trace(trace, event.result)
+                yield event
+        finally:
+            if trace and trace.root.end is None:
+                end_trace(trace)
+    
+    def _merge_previous_sections(self, result: AnalysisResult, previous: Optional[Dict]) -> AnalysisResult:
+        """Fill the sections a section-selective analysis didn't request from a stored analysis."""
+        if result.requested_sections is None or not previous:
+            return result
+        carried = [
+            section for section, _ in ANALYSIS_SECTIONS
+            if section not in result.requested_sections and isinstance(previous.get(section), list)
+        ]
+        previous_fingerprints = previous.get('section_fingerprints') or {}
+        previous_degraded = previous.get('degraded_sections') or []
+        previous_skipped = previous.get('tier_skipped_sections') or {}
+        previous_requested = previous.get('requested_sections')
+        requested = None
+        if previous_requested is not None:
+            covered = set(previous_requested) | set(result.requested_sections)
+            requested = [section for section, _ in ANALYSIS_SECTIONS if section in covered]
+        return replace(
+            result,
+            **{section: previous[section] for section in carried},
+            fingerprints={**(previous.get('fingerprints') or {}), **(result.fingerprints or {})},
+            section_fingerprints={
+                **{section: previous_fingerprints[section] for section in carried if section in previous_fingerprints},
+                **(result.section_fingerprints or {})
+            },
+            degraded_sections=[
+                section for section, _ in ANALYSIS_SECTIONS
+                if section in (result.degraded_sections or []) or (section in carried and section in previous_degraded)
+            ],
+            tier_skipped_sections={
+                **{section: previous_skipped[section] for section in carried if section in previous_skipped},
+                **(result.tier_skipped_sections or {})
+            },
+            requested_sections=requested
+        )
+    
+    def _start_trace(self, ticket: JiraTicket, **attributes) -> Optional[Trace]:
+        """Start a trace for an analysis, unless tracing is off or one is already running."""
+        if not self.tracing_enabled or current_trace() is not None:
+            return None
+        return start_trace('analysis', ticket_id=ticket.ticket_id, **attributes)
+    
+    def _finish_trace(self, trace: Trace, result: AnalysisResult):
+        """End a trace, attach its per-stage latencies to the result and export its spans."""
+        end_trace(trace)
+        result.timings = trace.summary()
+        result.trace_id = trace.trace_id
+        if self.trace_export_path:
+            try:
+                trace.export_jsonl(self.trace_export_path)
+            except OSError as e:
+                print(f"⚠️ Could not export trace {trace.trace_id}: {e}")
+    
+    def get_storage_analysis(self, result: AnalysisResult) -> Dict[str, Any]:
+        """Get the analysis dict stored with a ticket, including its input fingerprints."""
+        return {
+            **{section: getattr(result, section) for section, _ in ANALYSIS_SECTIONS},
+            "figma_designs": getattr(result, "figma_designs", []),
+            "pdf_designs": getattr(result, "pdf_designs", []),
+            "media_files": getattr(result, "media_files", []),
+            "design_sources": result.design_sources or [],
+            "degraded_sections": result.degraded_sections or [],
+            "tier_skipped_sections": result.tier_skipped_sections or {},
+            "requested_sections": result.requested_sections,
+            "model_tier": result.model_tier,
+            "timings": result.timings,
+            "fingerprints": result.fingerprints or {},
+            "section_fingerprints": result.section_fingerprints or {}
+        }
+    
+    def _iter_design_sources(self, ticket: JiraTicket, deadline_at: Optional[float] = None,
+                             inputs: Optional[List[str]] = None) -> Iterator[Tuple[int, SourceResult]]:
+        """Analyze the ticket's design sources concurrently, yielding each as it finishes.
+        
+        Args:
+            inputs: Kinds of input ('figma', 'pdf', 'media') to analyze; defaults to all
+        """
+        def wanted(kind: str, sources: Optional[List[str]]) -> List[str]:
+            return (sources or []) if inputs is None or kind in inputs else []
+        
+        figma_links = wanted('figma', ticket.figma_links)
+        pdf_paths = wanted('pdf', ticket.pdf_design_paths)
+        media_files = wanted('media', ticket.media_files)
+        if figma_links and self.figma_integration:
+            print(f"🎨 Analyzing {len(figma_links)} Figma design(s)...")
+        if pdf_paths:
+            print(f"📄 Analyzing {len(pdf_paths)} PDF design(s)...")
+        if media_files:
+            print(f"📸 Analyzing {len(media_files)} media file(s)...")
+        
+        ingestion = self.design_ingestion
+        timeout = ingestion.timeout
+        if deadline_at is not None:
+            timeout = max(0.0, min(timeout, deadline_at - time.monotonic()))
+        return ingestion.iter_ingest(figma_links, pdf_paths, media_files, timeout)
+    
+    def _get_ticket_context(self, ticket: JiraTicket, analysis: Dict) -> TicketContext:
+        """Get the TicketContext for this analysis, building it on first use."""
+        ctx = analysis.get('ticket_context')
+        if ctx is None or ctx.ticket is not ticket:
+            ctx = TicketContext(self, ticket, analysis)
+            analysis['ticket_context'] = ctx
+        return ctx
+    
+    def _generate_sections_sequential(self, ticket: JiraTicket, analysis: Dict,
+                                      only: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Run the section generators one after another."""
+        return _collect_sections(self._iter_sections_sequential(ticket, analysis, only))
+    
+    def _generate_sections_parallel(self, ticket: JiraTicket, analysis: Dict,
+                                    only: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Run the independent section generators on a bounded thread pool."""
+        return _collect_sections(self._iter_sections_parallel(ticket, analysis, only))
+    
+    def _iter_sections_sequential(self, ticket: JiraTicket, analysis: Dict,
+                                  only: Optional[List[str]] = None) -> Iterator[AnalysisEvent]:
+        """Run the section generators one after another, yielding progress events."""
+        for section, generator in ANALYSIS_SECTIONS:
+            if only is not None and section not in only:
+                continue
+            yield SectionStarted(section)
+            started = time.monotonic()
+            items = self._run_section(section, getattr(self, generator), ticket, analysis, None)
+            yield SectionCompleted(section, items, seconds=time.monotonic() - started)
+    
+    def _iter_sections_parallel(self, ticket: JiraTicket, analysis: Dict, only: Optional[List[str]] = None,
+                                deadline_at: Optional[float] = None) -> Iterator[AnalysisEvent]:
+        """Run the section generators on a bounded thread pool, yielding each as it completes.
+        
+        Each section gets ``section_timeout`` seconds from submission (less if
+        ``deadline_at`` comes first); a section that times out or raises falls
+        back to its non-LLM answer.
+        """
+        sections = [section for section, _ in ANALYSIS_SECTIONS if only is None or section in only]
+        # With a deadline, have every heuristic answer ready before any LLM call starts
+        fallbacks = {}
+        if deadline_at is not None:
+            fallbacks = {section: self._get_section_fallback(section, ticket, analysis) for section in sections}
+        
+        executor = ThreadPoolExecutor(max_workers=self.section_workers, thread_name_prefix="analysis-section")
+        try:
+            started = time.monotonic()
+            futures = {
+                executor.submit(propagate(self._run_section), section, getattr(self, generator),
+                                ticket, analysis, deadline_at): section
+                for section, generator in ANALYSIS_SECTIONS if section in sections
+            }
+            for section in sections:
+                yield SectionStarted(section)
+            
+            # Measured when the wait starts, so time spent by the consumer of the
+            # events above doesn't push the cutoff past the deadline
+            cutoff = started + self.section_timeout
+            if deadline_at is not None:
+                cutoff = min(cutoff, deadline_at)
+            timeout = max(0.0, cutoff - time.monotonic())
+            
+            pending = set(futures)
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    pending.discard(future)
+                    section = futures[future]
+                    try:
+                        items, fallback = future.result(), False
+                    except Exception as e:
+                        print(f"⚠️ Section '{section}' failed: {e}")
+                        items, fallback = fallbacks.get(section) or self._get_section_fallback(section, ticket, analysis), True
+                    yield SectionCompleted(section, items, fallback=fallback, seconds=time.monotonic() - started)
+            except FutureTimeoutError:
+                for future in pending:
+                    future.cancel()
+                    section = futures[future]
+                    print(f"⏱️ Section '{section}' timed out after {time.monotonic() - started:.1f}s, using fallback")
+                    items = fallbacks.get(section) or self._get_section_fallback(section, ticket, analysis)
+                    yield SectionCompleted(section, items, fallback=True, seconds=time.monotonic() - started)
+            
+            print(f"⚡ Generated {len(futures)} sections in {time.monotonic() - started:.2f}s")
+        finally:
+            # Don't block on generators that overran their timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _chat_completion(self, analysis: Dict, max_tokens: int, **kwargs):
+        """Make a chat completion with the model and token budget of the analysis's tier.
+        
+        Args:
+            analysis: Analysis dict holding the TierSelection under 'model_tier'
+            max_tokens: The call site's budget at the standard tier
+            **kwargs: Passed through to chat.completions.create
+        """
+        selection = analysis.get('model_tier')
+        if not isinstance(selection, TierSelection):
+            selection = TierSelection(self.tier_policy.default_tier)
+            analysis['model_tier'] = selection
+        
+        started = time.monotonic()
+        with span('llm_call', model=selection.tier.model, tier=selection.tier.name,
+                  max_tokens=selection.tier.max_tokens(max_tokens)) as stage:
+            try:
+                response = self.openai_client.chat.completions.create(
+                    model=selection.tier.model,
+                    max_tokens=selection.tier.max_tokens(max_tokens),
+                    **kwargs
+                )
+            except Exception:
+                selection.record_call(time.monotonic() - started, failed=True)
+                raise
+            usage = getattr(response, 'usage', None)
+            selection.record_call(time.monotonic() - started, usage)
+            if usage is not None:
+                stage.set(prompt_tokens=getattr(usage, 'prompt_tokens', None),
+                          completion_tokens=getattr(usage, 'completion_tokens', None))
+        return response
+    
+    @staticmethod
+    def _run_section(section: str, generator, ticket: JiraTicket, analysis: Dict,
+                     deadline_at: Optional[float]) -> List[str]:
+        """Run one section generator with its LLM calls bounded by the analysis deadline."""
+        with span(f"section.{section}") as stage, request_deadline(deadline_at):
+            items = generator(ticket, analysis)
+            stage.set(items=len(items))
+            return items
+    
+    def _get_section_fallback(self, section: str, ticket: JiraTicket, analysis: Dict) -> List[str]:
+        """Get the heuristic (non-LLM) answer for a section."""
+        try:
+            if section == 'suggested_questions':
+                return self._get_basic_questions(ticket, analysis)
+            if section == 'design_questions':
+                return self._get_basic_design_questions()
+            if section == 'business_questions':
+                return self._get_basic_business_questions(ticket, analysis)
+            if section == 'test_cases':
+                return self._get_basic_test_cases(ticket, analysis)
+        except Exception as e:
+            print(f"⚠️ Fallback for section '{section}' failed: {e}")
+        return []
+    
+    def _generate_sections_structured(self, ticket: JiraTicket, analysis: Dict, parallel: bool,
+                                      only: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Generate every section from a single JSON-mode LLM call."""
+        return _collect_sections(self._iter_sections_structured(ticket, analysis, parallel, only))
+    
+    def _iter_sections_structured(self, ticket: JiraTicket, analysis: Dict, parallel: bool,
+                                  only: Optional[List[str]] = None,
+                                  deadline_at: Optional[float] = None) -> Iterator[AnalysisEvent]:
+        """Generate every section from a single JSON-mode LLM call, yielding progress events.
+        
+        Sections missing from the response (or that fail to parse) are
+        regenerated through their normal per-section generators.
+        """
+        wanted = [section for section, _ in ANALYSIS_SECTIONS if only is None or section in only]
+        for section in wanted:
+            yield SectionStarted(section)
+        
+        sections = {}
+        started = time.monotonic()
+        structured = [section for section in wanted if section in STRUCTURED_SECTION_LIMITS]
+        if self.openai_client and structured:
+            try:
+                with request_deadline(deadline_at):
+                    response = self._chat_completion(
+                        analysis,
+                        messages=self._build_structured_messages(ticket, analysis, structured),
+                        response_format={"type": "json_object"},
+                        max_tokens=3000,
+                        temperature=0.6
+                    )
+                sections = self._parse_structured_sections(response.choices[0].message.content)
+                print(f"✅ Structured analysis returned {len(sections)}/{len(structured)} sections")
+            except Exception as e:
+                print(f"⚠️ Structured analysis failed: {e}")
+        
+        for section in wanted:
+            if section in sections:
+                yield SectionCompleted(section, sections[section], seconds=time.monotonic() - started)
+        
+        missing = [section for section in wanted if section not in sections]
+        if missing:
+            if parallel:
+                events = self._iter_sections_parallel(ticket, analysis, only=missing, deadline_at=deadline_at)
+            else:
+                events = self._iter_sections_sequential(ticket, analysis, only=missing)
+            # These sections were already announced above
+            yield from (event for event in events if not isinstance(event, SectionStarted))
+    
+    def _build_structured_messages(self, ticket: JiraTicket, analysis: Dict,
+                                   sections: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """Build the single prompt that asks for the sections (default: all) as one JSON object."""
+        ctx = self._get_ticket_context(ticket, analysis)
+        task_context = ctx.fit_task_context('structured', [
+            ContextBlock('feedback', ctx.feedback_block, priority=1),
+        ])
+        keys = '\n'.join(
+            f'- "{section}": {description}' for section, description in STRUCTURED_SECTION_PROMPTS.items()
+            if sections is None or section in sections
         )
+        return ctx.build_messages(f"""You are a senior software architect, product manager, UX designer and QA engineer for Habitto, a financial advisory platform. Analyze the Jira ticket and return ONE JSON object with exactly these keys, each a list of strings:
+
+{keys}
+
+Do not number the items. Focus only on the topic of the ticket and avoid generic questions.
+
+{task_context['feedback']}""")
+    
+    def _parse_structured_sections(self, content: str) -> Dict[str, List[str]]:
+        """Parse the structured JSON response, keeping only well-formed sections."""
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            # Tolerate prose around the JSON object
+            start, end = (content or '').find('{'), (content or '').rfind('}') + 1
+            if start < 0 or end <= start:
+                return {}
+            try:
+                data = json.loads(content[start:end])
+            except ValueError:
+                return {}
+        
+        if not isinstance(data, dict):
+            return {}
+        
+        sections = {}
+        for section, limit in STRUCTURED_SECTION_LIMITS.items():
+            items = data.get(section)
+            if not isinstance(items, list):
+                continue
+            items = [re.sub(r'^\d+\.\s*', '', item.strip()) for item in items if isinstance(item, str) and item.strip()]
+            if items:
+                sections[section] = items[:limit]
+        return sections
     
     def _analyze_content_keywords(self, ticket: JiraTicket) -> Dict:
         """Analyze ticket content for relevant keywords and patterns."""
-        text = f"{ticket.title} {ticket.description}".lower()
+        flags = TICKET_KEYWORDS.classify(f"{ticket.title} {ticket.description}")
         
         analysis = {
-            'has_mobile': any(word in text for word in ['mobile', 'responsive', 'tablet', 'ios', 'android']),
-            'has_performance': any(word in text for word in ['performance', 'speed', 'load', 'optimization']),
-            'has_accessibility': any(word in text for word in ['accessibility', 'a11y', 'wcag', 'screen reader']),
-            'has_integration': any(word in text for word in ['api', 'integration', 'third-party', 'external']),
-            'has_security': any(word in text for word in ['security', 'authentication', 'authorization', 'encryption']),
-            'has_internationalization': any(word in text for word in ['i18n', 'internationalization', 'localization', 'multi-language']),
-            'has_animation': any(word in text for word in ['animation', 'transition', 'motion', 'interaction']),
-            'has_error_handling': any(word in text for word in ['error', 'exception', 'fallback', 'edge case']),
-            'has_data': any(word in text for word in ['data', 'database', 'storage', 'cache']),
-            'has_user_flow': any(word in text for word in ['user flow', 'workflow', 'process', 'journey']),
+            'has_mobile': 'mobile' in flags,
+            'has_performance': 'performance' in flags,
+            'has_accessibility': 'accessibility' in flags,
+            'has_integration': 'integration' in flags,
+            'has_security': 'security' in flags,
+            'has_internationalization': 'internationalization' in flags,
+            'has_animation': 'animation' in flags,
+            'has_error_handling': 'error_handling' in flags,
+            'has_data': 'data' in flags,
+            'has_user_flow': 'user_flow' in flags,
             'figma_count': len(ticket.figma_links),
             'priority_level': ticket.priority,
             'has_labels': len(ticket.labels) > 0,
@@ -453,111 +1327,30 @@ class JiraFigmaAnalyzer:
         """Generate clarifying questions based on ticket content and knowledge."""
         questions = []
         
-        # Get confluence context for domain-specific questions
-        confluence_context = ""
-        detected_topics = []
-        if hasattr(self, '_confluence_context') and self._confluence_context.get('relevant_documents'):
-            relevant_docs = self._confluence_context['relevant_documents']
-            detected_topics = self._confluence_context.get('detected_topics', [])
-            tech_stack = []
-            features = []
-            business_rules = []
-            
-            for doc in relevant_docs:
-                tech_stack.extend(doc.get('tech_stack', []))
-                features.extend(doc.get('features', []))
-                business_rules.extend(doc.get('business_rules', []))
-            
-            # Build topic-aware context
-            topic_context = f"Detected Topics: {', '.join(detected_topics)}" if detected_topics and detected_topics != ['general'] else "General feature development"
-            
-            confluence_context = f"""
-            
-            Topic-Specific Context:
-            - {topic_context}
-            - Filtered Documents: {len(relevant_docs)} documents relevant to these topics
-            - Tech Stack: {', '.join(set(tech_stack[:10]))}
-            - Key Features: {', '.join(set(features[:5]))}
-            - Business Rules: {', '.join(set(business_rules[:3]))}
-            
-            Domain: Financial Advisory Platform (Habitto)
-            """
-        
-        # Get ticket knowledge context
-        ticket_knowledge_context = ""
-        if analysis.get('ticket_knowledge') and analysis['ticket_knowledge'].get('relevant_tickets'):
-            knowledge = analysis['ticket_knowledge']
-            ticket_knowledge_context = f"""
-            
-            Knowledge from Similar Past Tickets:
-            - {len(knowledge['relevant_tickets'])} similar tickets found in knowledge base
-            - Common question patterns: {', '.join(knowledge.get('question_patterns', [])[:3])}
-            - Common risk areas: {', '.join(knowledge.get('risk_patterns', [])[:2])}
-            - Insights: {', '.join(knowledge.get('insights', [])[:2])}
-            """
-
-        # Get Figma design knowledge context
-        figma_design_knowledge_context = ""
-        if analysis.get('figma_knowledge') and analysis['figma_knowledge'].get('design_patterns'):
-            figma_knowledge = analysis['figma_knowledge']
-            figma_design_knowledge_context = f"""
-            
-            Figma Design Knowledge from Past Tickets:
-            - {len(figma_knowledge['design_patterns'])} Figma design patterns analyzed
-            - Total Figma tickets in knowledge base: {figma_knowledge.get('total_figma_tickets', 0)}
-            - Design insights: {', '.join(figma_knowledge.get('figma_insights', [])[:3])}
-            - Common components: {', '.join(figma_knowledge.get('component_patterns', [])[:5])}
-            - Predicted complexity: {analysis.get('predicted_design_complexity', 'Unknown')} questions
-            - Complexity level: {analysis.get('design_complexity_level', 'Unknown')}
-            """
-
         if self.openai_client:
             try:
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": f"""You are a senior software architect and business analyst specializing in financial advisory platforms. Generate specific, actionable clarifying questions for this Jira ticket.
-                            
-                            IMPORTANT: This ticket is specifically about {', '.join(detected_topics) if detected_topics and detected_topics != ['general'] else 'general feature development'}. 
-                            Focus your questions ONLY on this topic area and avoid generic or unrelated questions.
-                            
-                            Focus on:
-                - Technical implementation details specific to {', '.join(detected_topics) if detected_topics and detected_topics != ['general'] else 'the feature'}
-                            - Business requirements clarity for this specific functionality
-                            - Integration points with existing {', '.join(detected_topics) if detected_topics and detected_topics != ['general'] else 'systems'}
-                - User experience considerations for {', '.join(detected_topics) if detected_topics and detected_topics != ['general'] else 'the feature'}
-                            - Risk mitigation specific to this domain
-                            
-                            Context: {confluence_context}
-                            {ticket_knowledge_context}
-                            {figma_design_knowledge_context}
-                            
-                            {self._get_feedback_learning_context(detected_topics) if self.feedback_learning else ''}
-                            
-                            Generate 8-12 specific questions that are directly relevant to implementing this {', '.join(detected_topics) if detected_topics and detected_topics != ['general'] else 'feature'} correctly."""
-                        },
-                        {
-                            "role": "user",
-                            "content": f"""
-                            Ticket: {ticket.title}
-                            Description: {ticket.description}
-                            Priority: {ticket.priority}
-                            Components: {', '.join(ticket.components)}
-                            
-                            Analysis Context:
-                            - Figma Links: {len(ticket.figma_links) if ticket.figma_links else 0}
-                            - Media Files: {len(analysis.get('media_files', []))} uploaded images/videos
-                            - Has Mobile Elements: {analysis.get('has_mobile', False)}
-                            - Has API Integration: {analysis.get('has_integration', False)}
-                            - Complexity Indicators: {analysis.get('complexity_indicators', [])}
-                            
-                            Media Analysis (if available):
-                            {self._get_media_context_for_questions(analysis)}
-                            """
-                        }
-                    ],
+                ctx = self._get_ticket_context(ticket, analysis)
+                focus = ctx.topics_label
+                task_context = ctx.fit_task_context('suggested_questions', [
+                    ContextBlock('feedback', ctx.feedback_block, priority=1),
+                ])
+                response = self._chat_completion(
+                    analysis,
+                    messages=ctx.build_messages(f"""You are a senior software architect and business analyst specializing in financial advisory platforms. Generate specific, actionable clarifying questions for this Jira ticket.
+
+IMPORTANT: This ticket is specifically about {focus or 'general feature development'}.
+Focus your questions ONLY on this topic area and avoid generic or unrelated questions.
+
+Focus on:
+- Technical implementation details specific to {focus or 'the feature'}
+- Business requirements clarity for this specific functionality
+- Integration points with existing {focus or 'systems'}
+- User experience considerations for {focus or 'the feature'}
+- Risk mitigation specific to this domain
+
+{task_context['feedback']}
+
+Generate 8-12 specific questions that are directly relevant to implementing this {focus or 'feature'} correctly."""),
                     max_tokens=1000,
                     temperature=0.7
                 )
@@ -579,17 +1372,17 @@ class JiraFigmaAnalyzer:
     def _get_basic_questions(self, ticket: JiraTicket, analysis: Dict) -> List[str]:
         """Fallback to basic questions if AI fails or is not available."""
         questions = []
-        content_lower = f"{ticket.title} {ticket.description}".lower()
+        flags = TICKET_KEYWORDS.classify(f"{ticket.title} {ticket.description}")
         
         # Habitto-specific business questions
-        if any(word in content_lower for word in ['profile', 'user', 'occupation', 'country']):
+        if 'profile' in flags:
             questions.append("How does enabling profile editing support Habitto's user engagement and retention goals?")
             questions.append("What user research or feedback indicated the need for editable occupation/country fields?")
             questions.append("Will this feature help with user onboarding completion rates or profile completeness metrics?")
             questions.append("Are there any compliance requirements for collecting and updating occupation/country data?")
         
         # Analytics and tracking business questions
-        if any(word in content_lower for word in ['mixpanel', 'event', 'track']):
+        if 'analytics' in flags:
             questions.append("How will the Mixpanel tracking data be used to improve Habitto's user experience?")
             questions.append("What business KPIs should this feature impact (user satisfaction, profile completion, etc.)?")
         
@@ -608,79 +1401,36 @@ class JiraFigmaAnalyzer:
         # AI-powered business questions
         if self.openai_client:
             try:
-                # Build Confluence context if available
-                confluence_context = ""
-                detected_topics = []
-                if hasattr(self, '_confluence_context') and self._confluence_context:
-                    ctx = self._confluence_context
-                    detected_topics = ctx.get('detected_topics', [])
-                    topic_focus = ', '.join(detected_topics).title() if detected_topics and detected_topics != ['general'] else "General Feature Development"
-                    
-                    confluence_context = f"""
-                
-                Topic-Specific Knowledge Base Context:
-                - Topic Focus: {topic_focus}
-                - Available Documents: {len(ctx.get('relevant_documents', []))} (filtered for {topic_focus})
-                - Key Business Rules: {len([rule for doc in ctx.get('relevant_documents', []) for rule in doc.get('business_rules', [])])} rules identified
-                - Domain: Financial Advisory Platform (Habitto)
-                """
-                    
-                    # Include specific business rules from documents
-                    all_business_rules = []
-                    for doc in ctx.get('relevant_documents', [])[:2]:
-                        all_business_rules.extend(doc.get('business_rules', [])[:3])
-                    
-                    if all_business_rules:
-                        confluence_context += f"""
-                
-                Relevant Business Rules from Documentation:
-                """
-                        for i, rule in enumerate(all_business_rules[:5], 1):
-                            confluence_context += f"\n{i}. {rule[:100]}{'...' if len(rule) > 100 else ''}"
-                
-                topic_specific_focus = f"This ticket is specifically about {', '.join(detected_topics)} functionality" if detected_topics and detected_topics != ['general'] else "This is a general feature request"
+                ctx = self._get_ticket_context(ticket, analysis)
+                topic_specific_focus = f"This ticket is specifically about {ctx.topics_label} functionality" if ctx.topics_label else "This is a general feature request"
                 
                 prompt = f"""You are a product manager for a financial advisory platform analyzing a feature request. Generate specific business questions that address strategic, operational, and value-related concerns.
+
+IMPORTANT: {topic_specific_focus}. Focus your business questions specifically on this domain and avoid generic questions.
+
+Generate 12-15 specific business questions focusing on:
+
+**Financial Services Context:**
+- Revenue impact and monetization opportunities
+- Client acquisition and retention effects
+- Advisor productivity and efficiency gains
+- Compliance and regulatory considerations
+- Risk management and mitigation
+
+**Strategic Business Questions:**
+- Market differentiation and competitive advantage
+- Scalability and operational impact
+- Resource requirements and ROI
+- Integration with existing business processes
+- Success metrics and measurement criteria
+
+Consider the business rules and context from the knowledge base. Make questions specific to financial advisory services, appointment management, and client relationship workflows.
+
+Return only questions, one per line, numbered 1-15."""
                 
-                IMPORTANT: {topic_specific_focus}. Focus your business questions specifically on this domain and avoid generic questions.
-                
-                Ticket Details:
-                - Title: {ticket.title}
-                - Description: {ticket.description}
-                - Priority: {ticket.priority}
-                - Labels: {", ".join(ticket.labels or [])}
-                - Components: {", ".join(ticket.components or [])}
-                - Has Figma: {analysis.get("figma_count", 0) > 0}
-                - Has Mobile: {analysis.get("has_mobile", False)}
-                - Has Integration: {analysis.get("has_integration", False)}
-                - Has Performance: {analysis.get("has_performance", False)}
-                - Has Accessibility: {analysis.get("has_accessibility", False)}
-                - Has PDF: {analysis.get("pdf_designs", [])}
-                {confluence_context}
-                
-                Generate 12-15 specific business questions focusing on:
-                
-                **Financial Services Context:**
-                - Revenue impact and monetization opportunities
-                - Client acquisition and retention effects
-                - Advisor productivity and efficiency gains
-                - Compliance and regulatory considerations
-                - Risk management and mitigation
-                
-                **Strategic Business Questions:**
-                - Market differentiation and competitive advantage
-                - Scalability and operational impact
-                - Resource requirements and ROI
-                - Integration with existing business processes
-                - Success metrics and measurement criteria
-                
-                Consider the business rules and context from the knowledge base. Make questions specific to financial advisory services, appointment management, and client relationship workflows.
-                
-                Return only questions, one per line, numbered 1-15."""
-                
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
+                response = self._chat_completion(
+                    analysis,
+                    messages=ctx.build_messages(prompt),
                     max_tokens=1000,
                     temperature=0.7
                 )
@@ -707,17 +1457,17 @@ class JiraFigmaAnalyzer:
     def _get_basic_business_questions(self, ticket: JiraTicket, analysis: Dict) -> List[str]:
         """Fallback to basic business questions if AI fails or is not available."""
         questions = []
-        content_lower = f"{ticket.title} {ticket.description}".lower()
+        flags = TICKET_KEYWORDS.classify(f"{ticket.title} {ticket.description}")
         
         # Habitto-specific business questions
-        if any(word in content_lower for word in ['profile', 'user', 'occupation', 'country']):
+        if 'profile' in flags:
             questions.append("How does enabling profile editing support Habitto's user engagement and retention goals?")
             questions.append("What user research or feedback indicated the need for editable occupation/country fields?")
             questions.append("Will this feature help with user onboarding completion rates or profile completeness metrics?")
             questions.append("Are there any compliance requirements for collecting and updating occupation/country data?")
         
         # Analytics and tracking business questions
-        if any(word in content_lower for word in ['mixpanel', 'event', 'track']):
+        if 'analytics' in flags:
             questions.append("How will the Mixpanel tracking data be used to improve Habitto's user experience?")
             questions.append("What business KPIs should this feature impact (user satisfaction, profile completion, etc.)?")
         
@@ -754,81 +1504,42 @@ class JiraFigmaAnalyzer:
         # AI-powered test case generation
         if self.openai_client:
             try:
-                # Build Confluence context if available
-                confluence_context = ""
-                if hasattr(self, '_confluence_context') and self._confluence_context:
-                    ctx = self._confluence_context
-                    confluence_context = f"""
-                
-                System Context from Knowledge Base:
-                - Integration Points: {len([tech for doc in ctx.get('relevant_documents', []) for tech in doc.get('tech_stack', []) if 'api' in tech.lower() or 'integration' in tech.lower()])} identified
-                - Key Technologies: {', '.join(ctx.get('knowledge_base_summary', {}).get('tech_stack', [])[:5])}
-                - Business Rules: {len([rule for doc in ctx.get('relevant_documents', []) for rule in doc.get('business_rules', [])])} rules to validate
-                """
-                    
-                    # Include specific components that might need testing
-                    all_components = []
-                    for doc in ctx.get('relevant_documents', [])[:2]:
-                        all_components.extend(doc.get('components', [])[:5])
-                    
-                    if all_components:
-                        confluence_context += f"""
-                
-                Related System Components to Test:
-                {', '.join(list(set(all_components))[:8])}
-                """
-                
-                prompt = f"""You are a QA engineer creating comprehensive test cases for a financial advisory platform feature. Generate specific, actionable test cases based on the ticket content and system context.
-
-                Ticket Details:
-                - Title: {ticket.title}
-                - Description: {ticket.description}
-                - Priority: {ticket.priority}
-                - Labels: {", ".join(ticket.labels or [])}
-                - Components: {", ".join(ticket.components or [])}
-                - Has Figma: {analysis.get("figma_count", 0) > 0}
-                - Has Mobile: {analysis.get("has_mobile", False)}
-                - Has Integration: {analysis.get("has_integration", False)}
-                - Has PDF: {analysis.get("pdf_designs", [])}
-                - Media Files: {len(analysis.get('media_files', []))} uploaded
-                {confluence_context}
-                
-                Media Analysis Context:
-                {self._get_media_context_for_questions(analysis)}
-                
-                Generate 20-25 specific test cases organized in these categories:
-                
-                **Functional Tests (8-10 tests):**
-                - Core feature functionality validation
-                - User workflow and journey testing
-                - Integration with existing financial advisory features
-                - Business rule validation from knowledge base
-                
-                **Security & Compliance Tests (4-5 tests):**
-                - Data protection and privacy validation
-                - Financial services compliance requirements
-                - User authentication and authorization
-                - Audit trail and logging verification
-                
-                **Performance & Reliability Tests (4-5 tests):**
-                - Response time and load testing
-                - System stability under stress
-                - Error handling and recovery
-                - Data consistency and integrity
-                
-                **User Experience Tests (4-5 tests):**
-                - Accessibility compliance (WCAG)
-                - Cross-browser and device compatibility
-                - User interface responsiveness
-                - Error message clarity and helpfulness
-                
-                Make test cases specific to financial advisory workflows, appointment scheduling, and client management contexts. Reference system components and business rules from the knowledge base when relevant.
-                
-                Format: Return test cases as bullet points with clear test objectives and expected outcomes."""
-                
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
+                ctx = self._get_ticket_context(ticket, analysis)
+                prompt = """You are a QA engineer creating comprehensive test cases for a financial advisory platform feature. Generate specific, actionable test cases based on the ticket content and system context.
+
+Generate 20-25 specific test cases organized in these categories:
+
+**Functional Tests (8-10 tests):**
+- Core feature functionality validation
+- User workflow and journey testing
+- Integration with existing financial advisory features
+- Business rule validation from knowledge base
+
+**Security & Compliance Tests (4-5 tests):**
+- Data protection and privacy validation
+- Financial services compliance requirements
+- User authentication and authorization
+- Audit trail and logging verification
+
+**Performance & Reliability Tests (4-5 tests):**
+- Response time and load testing
+- System stability under stress
+- Error handling and recovery
+- Data consistency and integrity
+
+**User Experience Tests (4-5 tests):**
+- Accessibility compliance (WCAG)
+- Cross-browser and device compatibility
+- User interface responsiveness
+- Error message clarity and helpfulness
+
+Make test cases specific to financial advisory workflows, appointment scheduling, and client management contexts. Reference system components and business rules from the knowledge base when relevant.
+
+Format: Return test cases as bullet points with clear test objectives and expected outcomes."""
+                
+                response = self._chat_completion(
+                    analysis,
+                    messages=ctx.build_messages(prompt),
                     max_tokens=1500,
                     temperature=0.6
                 )
@@ -922,8 +1633,8 @@ class JiraFigmaAnalyzer:
         """Generate design-specific questions for the ticket."""
         questions = []
         
-        # Extract keywords once at the beginning
-        ticket_keywords = self._extract_relevant_keywords(ticket)
+        ctx = self._get_ticket_context(ticket, analysis)
+        ticket_keywords = ctx.keywords
         
         # Enhanced Figma design questions using AI with actual design context
         if analysis.get("figma_designs"):
@@ -996,18 +1707,20 @@ class JiraFigmaAnalyzer:
                 Note: Focus specifically on components and screens related to: {', '.join(ticket_keywords)}
                                 """
             
+            task_context = ctx.fit_task_context('design_questions', [
+                ContextBlock('figma_design_details', design_context.strip(), priority=1),
+                ContextBlock('design_feedback', ctx.design_feedback_block, priority=2),
+            ])
+            
             # Always try to generate questions, with fallback
             try:
                 if self.openai_client and design_context.strip():
-                    response = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": """You are a senior UX/UI designer and React Native developer with expertise in Japanese localization. Generate highly specific design questions based ONLY on the exact ticket requirements provided.
+                    response = self._chat_completion(
+                    analysis,
+                    messages=ctx.build_messages(f"""You are a senior UX/UI designer and React Native developer with expertise in Japanese localization. Generate highly specific design questions based ONLY on the exact ticket requirements provided.
 
 CRITICAL REQUIREMENTS:
-                    1. Read the ticket title and description carefully
+1. Read the ticket title and description carefully
 2. Generate questions ONLY about the specific feature mentioned in the ticket
 3. DO NOT ask about random screens or components from the Figma file
 4. Focus on the exact UI elements needed for this specific feature
@@ -1016,43 +1729,24 @@ CRITICAL REQUIREMENTS:
 7. If no relevant screens are found in Figma, generate implementation questions for the specific feature
 
 JAPANESE CONTENT CONSIDERATIONS:
-                    - If Japanese text is detected in the design, include questions about text expansion/contraction
+- If Japanese text is detected in the design, include questions about text expansion/contraction
 - Consider Japanese typography, character support, and input methods
 - Ask about localization strategy for Japanese vs English content
 - Consider Japanese UI patterns and user expectations
 
-Generate 6-8 targeted questions about implementing THIS SPECIFIC FEATURE."""
-                            },
-                            {
-                                "role": "user", 
-                                "content": f"""
-TICKET TO ANALYZE:
-                    Title: {ticket.title}
-Description: {ticket.description}
-
-SPECIFIC FEATURE TO FOCUS ON: 
-                    {ticket.title}
-
-REQUIREMENTS FROM DESCRIPTION:
-                    {ticket.description}
+SPECIFIC FEATURE TO FOCUS ON: {ticket.title}
 
-MEDIA ANALYSIS (if provided):
-    {self._get_media_context_for_questions(analysis)}
-
-FIGMA SCREEN INTERACTIONS (if available):
-    {self._get_figma_interaction_context(analysis)}
-
-GPT-4 VISUAL ANALYSIS (if available):
-    {self._get_visual_context_for_questions(analysis)}
+FIGMA DESIGN DETAILS:
+{task_context['figma_design_details']}
 
 FEEDBACK-DRIVEN IMPROVEMENTS (if available):
-    {self._get_feedback_learning_context(['design']) if self.feedback_learning else ''}
+{task_context['design_feedback']}
 
-Generate design questions that are DIRECTLY related to implementing this specific feature: "{ticket.title}"
+Generate 6-8 targeted questions that are DIRECTLY related to implementing this specific feature: "{ticket.title}"
 
 Focus on:
-    - UI components needed for this exact feature
-- User interaction patterns for this specific functionality  
+- UI components needed for this exact feature
+- User interaction patterns for this specific functionality
 - Navigation flows and button behaviors from Figma screens
 - Success/error states and screen transitions
 - Back button functionality and navigation hierarchy
@@ -1063,12 +1757,12 @@ Focus on:
 - Accessibility for this specific feature
 
 DO NOT ask about:
-    - Random screens from the Figma file
+- Random screens from the Figma file
 - Unrelated features or components
 - General app design questions
 
 Example good questions for UI interactions and navigation:
-    - Where should the "Back" button navigate when pressed?
+- Where should the "Back" button navigate when pressed?
 - What should happen when the user taps the "Submit" button?
 - How should the success screen be designed after form submission?
 - Where should the "Next" button lead in the user flow?
@@ -1078,24 +1772,19 @@ Example good questions for UI interactions and navigation:
 - How should the navigation hierarchy work between screens?
 
 Example good questions for "Enable Editing of Occupation, Country of Residence":
-    - How should the occupation dropdown be designed and positioned in the profile form?
+- How should the occupation dropdown be designed and positioned in the profile form?
 - What validation states should be shown for country selection?
 - How should the save/update flow work for these specific fields?
 - Where should the back button navigate from the profile editing screen?
 - What should happen when the user successfully updates their information?
 
-Generate similar targeted questions for: {ticket.title}
-
 IMPORTANT: Based on the Figma screens and buttons detected above, ask specific questions about:
-    1. Button navigation destinations
-2. Success/error screen flows  
+1. Button navigation destinations
+2. Success/error screen flows
 3. Back button behavior
 4. Form submission outcomes
 5. Screen transition animations
-6. Loading and feedback states
-                                """
-                            }
-                        ],
+6. Loading and feedback states"""),
                         max_tokens=800,
                     temperature=0.7
                 )
@@ -1547,17 +2236,24 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
     def _initialize_openai(self):
         """Initialize OpenAI client."""
         api_key = os.getenv('OPENAI_API_KEY')
-        if api_key:
-            try:
-                from openai import OpenAI
-                self.openai_client = OpenAI(api_key=api_key)
-                print("✅ OpenAI client initialized")
-            except ImportError:
-                print("⚠️ OpenAI library not installed. AI features disabled.")
-                self.openai_client = None
-        else:
-            self.openai_client = None
+        if not api_key:
             print("⚠️ OpenAI API key not found. AI features disabled.")
+            return None
+        
+        try:
+            from openai import OpenAI
+        except ImportError:
+            print("⚠️ OpenAI library not installed. AI features disabled.")
+            return None
+        
+        # Retries are paced by the shared rate limiter, not the SDK; cache hits skip the limiter
+        openai_client = CachedOpenAIClient(
+            RateLimitedOpenAIClient(OpenAI(api_key=api_key, max_retries=0),
+                                    get_rate_limiter(self.config.get('openai_rate_limits'))),
+            self.llm_cache
+        )
+        print("✅ OpenAI client initialized")
+        return openai_client
     
     def _load_tech_stack_context(self) -> Dict:
         """Load tech stack context from file."""
@@ -1584,18 +2280,19 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
 
     def _analyze_content(self, ticket: JiraTicket) -> Dict:
         """Analyze ticket content for keywords and context."""
-        content = f"{ticket.title} {ticket.description}".lower()
+        content = f"{ticket.title} {ticket.description}"
+        flags = TICKET_KEYWORDS.classify(content)
         
         analysis = {
             "priority_level": ticket.priority or "Medium",
             "figma_count": len(ticket.figma_links),
-            "has_mobile": any(keyword in content for keyword in ['mobile', 'ios', 'android', 'app', 'react native']),
-            "has_integration": any(keyword in content for keyword in ['api', 'integration', 'connect', 'sync', 'webhook']),
-            "has_performance": any(keyword in content for keyword in ['performance', 'speed', 'optimization', 'cache', 'load']),
-            "has_accessibility": any(keyword in content for keyword in ['accessibility', 'a11y', 'screen reader', 'wcag']),
-            "has_security": any(keyword in content for keyword in ['security', 'authentication', 'authorization', 'compliance']),
-            "has_database": any(keyword in content for keyword in ['database', 'data', 'storage', 'persistence']),
-            "has_ui_ux": any(keyword in content for keyword in ['design', 'ui', 'ux', 'interface', 'user experience']),
+            "has_mobile": 'mobile' in flags,
+            "has_integration": 'integration' in flags,
+            "has_performance": 'performance' in flags,
+            "has_accessibility": 'accessibility' in flags,
+            "has_security": 'security' in flags,
+            "has_database": 'data' in flags,
+            "has_ui_ux": 'ui_ux' in flags,
             "complexity_indicators": self._assess_complexity_indicators(content),
         }
         
@@ -1604,17 +2301,18 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
     def _assess_complexity_indicators(self, content: str) -> List[str]:
         """Assess complexity indicators from ticket content."""
         indicators = []
+        flags = TICKET_KEYWORDS.classify(content)
         
-        if any(word in content for word in ['multiple', 'several', 'various', 'complex']):
+        if 'multiple_components' in flags:
             indicators.append("Multiple components involved")
         
-        if any(word in content for word in ['integration', 'connect', 'sync']):
+        if 'system_integration' in flags:
             indicators.append("System integration required")
         
-        if any(word in content for word in ['new', 'create', 'build', 'develop']):
+        if 'new_development' in flags:
             indicators.append("New development work")
         
-        if any(word in content for word in ['refactor', 'redesign', 'rebuild']):
+        if 'refactoring' in flags:
             indicators.append("Significant refactoring needed")
         
         return indicators
@@ -1625,26 +2323,9 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         
         for pdf_path in pdf_paths:
             try:
-                print(f"   📄 Processing: {pdf_path}")
-                pdf_analysis = self.pdf_design_analyzer.analyze_pdf_design(pdf_path)
-                
-                if pdf_analysis:
-                    pdf_context = self.pdf_design_analyzer.get_design_context_for_analysis(pdf_analysis)
-                    # Rename keys to match expected format
-                    pdf_context['pdf_name'] = pdf_context['design_name']
-                    pdf_context['pdf_complexity'] = pdf_context['design_complexity']
-                    pdf_context['pages'] = [f"Page {i+1}" for i in range(pdf_context['pages_count'])]
-                    
+                pdf_context = analyze_pdf_source(pdf_path, self.pdf_design_analyzer)
+                if pdf_context:
                     pdf_designs.append(pdf_context)
-                    print(f"   ✅ PDF analyzed: {pdf_context['pdf_name']}")
-                    print(f"      📄 Pages: {pdf_context['pages_count']}")
-                    print(f"      🧩 Components: {len(pdf_context['ui_components'])}")
-                    print(f"      📱 Screens: {len(pdf_context['screens'])}")
-                    print(f"      🎨 Type: {pdf_context['design_type']}")
-                    print(f"      ⚡ Complexity: {pdf_context['pdf_complexity']:.1f}/10")
-                else:
-                    print(f"   ❌ Failed to analyze PDF: {pdf_path}")
-                    
             except Exception as e:
                 print(f"   ❌ Error analyzing PDF design: {e}")
                 continue
@@ -1657,19 +2338,9 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         
         for figma_url in figma_links:
             try:
-                print(f"   📥 Processing: {figma_url}")
-                design = self.figma_integration.analyze_figma_design(figma_url)
-                
-                if design:
-                    design_context = self.figma_integration.get_design_context_for_analysis(design)
+                design_context = analyze_figma_source(figma_url, self.figma_integration)
+                if design_context:
                     figma_designs.append(design_context)
-                    print(f"   ✅ Design analyzed: {design_context['design_name']}")
-                    print(f"      📱 Screens: {len(design_context['screens'])}")
-                    print(f"      🧩 Components: {design_context['components_count']}")
-                    print(f"      ⚡ Complexity: {design_context['design_complexity']:.1f}/10")
-                else:
-                    print(f"   ❌ Failed to analyze design from: {figma_url}")
-                    
             except Exception as e:
                 print(f"   ❌ Error analyzing Figma design: {e}")
                 continue
@@ -1805,45 +2476,36 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         
         return risks[:8]  # Limit to top 8
 
+    def _get_knowledge_version(self, ticket_context: TicketContext) -> Dict[str, Any]:
+        """Version of the knowledge bases the prompts draw on, for fingerprinting.
+        
+        Covers the implemented-features knowledge base, the Confluence documents
+        and recorded feedback. Similar and recent Figma tickets are left out:
+        they change with every stored ticket.
+        """
+        snapshot = self.ticket_storage.knowledge_snapshot if self.ticket_storage else get_snapshot()
+        feedback_system = self.feedback_system if self.feedback_learning else None
+        return {
+            'figma_knowledge': snapshot.get_version(),
+            'confluence': ticket_context.confluence.get('relevant_documents', []),
+            'feedback': feedback_system.get_version() if feedback_system else None,
+        }
+    
     def _get_relevant_ticket_knowledge(self, ticket: JiraTicket) -> Dict[str, Any]:
         """Get relevant knowledge from previously stored tickets."""
         if not hasattr(self, 'ticket_storage') or not self.ticket_storage:
             return {'relevant_tickets': [], 'insights': []}
         
         try:
-            # Search for similar tickets
-            search_query = f"{ticket.title} {ticket.description}"
-            similar_tickets = self.ticket_storage.search_tickets(search_query, limit=5)
-            
-            # Get statistics for patterns
-            stats = self.ticket_storage.get_statistics()
+            # Top similar tickets with their question and risk snippets, in one query
+            similar_tickets = self.ticket_storage.find_similar_tickets(
+                f"{ticket.title} {ticket.description}", limit=5, exclude_ticket_id=ticket.ticket_id
+            )
             
             # Extract insights from similar tickets
             insights = []
-            question_patterns = set()
-            risk_patterns = set()
-                        
-            for stored_ticket in similar_tickets:
-                # Add type checking to prevent 'str' object has no attribute 'get' error
-                if not isinstance(stored_ticket, dict):
-                    continue
-                
-                # Get full ticket details to access analysis data
-                ticket_id = stored_ticket.get('ticket_id')
-                if ticket_id:
-                    full_ticket = self.ticket_storage.get_ticket(ticket_id)
-                    if full_ticket and isinstance(full_ticket, dict):
-                        # Add unique question patterns from analysis
-                        analysis = full_ticket.get('analysis', {})
-                        if isinstance(analysis, dict):
-                            for q in analysis.get('suggested_questions', [])[:3]:
-                                if isinstance(q, str) and len(q) > 20:  # Avoid very short questions
-                                    question_patterns.add(q)
-
-                            # Add unique risk patterns  
-                            for r in analysis.get('risk_areas', [])[:2]:
-                                if isinstance(r, str) and len(r) > 15:  # Avoid very short risks
-                                    risk_patterns.add(r)
+            question_patterns = {q for t in similar_tickets for q in t['question_snippets']}
+            risk_patterns = {r for t in similar_tickets for r in t['risk_snippets']}
             
             # Generate insights
             if similar_tickets:
@@ -1851,18 +2513,18 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
                 
                 # Common question themes
                 if question_patterns:
-                    insights.append(f"Common question themes from past tickets: {', '.join(list(question_patterns)[:2])}")
+                    insights.append(f"Common question themes from past tickets: {', '.join(sorted(question_patterns)[:2])}")
                 
                 # Common risk areas
                 if risk_patterns:
-                    insights.append(f"Common risks from similar tickets: {', '.join(list(risk_patterns)[:2])}")
+                    insights.append(f"Common risks from similar tickets: {', '.join(sorted(risk_patterns)[:2])}")
             
             return {
                 'relevant_tickets': similar_tickets[:3],  # Top 3 most relevant
                 'insights': insights,
-                'total_stored_tickets': stats.get('total_tickets', 0),
-                'question_patterns': list(question_patterns)[:5],
-                'risk_patterns': list(risk_patterns)[:3]
+                'total_stored_tickets': self.ticket_storage.get_ticket_count(),
+                'question_patterns': sorted(question_patterns)[:5],
+                'risk_patterns': sorted(risk_patterns)[:3]
             }
             
         except Exception as e:
@@ -1893,142 +2555,25 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         return analysis
 
     def _get_figma_design_knowledge(self, ticket: JiraTicket) -> Dict[str, Any]:
-        """Get design knowledge from stored tickets and implemented features knowledge base."""
-        knowledge_data = {
-            'design_patterns': [],
-            'figma_insights': [],
-            'implementation_notes': [],
-            'component_patterns': [],
-            'total_figma_tickets': 0
-        }
-        
-        # 1. Get knowledge from stored tickets with Figma links
-        if hasattr(self, 'ticket_storage') and self.ticket_storage:
-            try:
-                figma_tickets = self.ticket_storage.search_figma_tickets(limit=20)
-                
-                complexity_patterns = []
-                component_patterns = set()
-                implementation_notes = set()
-                
-                for stored_ticket in figma_tickets:
-                    if isinstance(stored_ticket, dict):
-                        # Get full ticket details
-                        ticket_id = stored_ticket.get('ticket_id')
-                        if ticket_id:
-                            full_ticket = self.ticket_storage.get_ticket(ticket_id)
-                            if full_ticket and isinstance(full_ticket, dict):
-                                analysis = full_ticket.get('analysis', {})
-                                if isinstance(analysis, dict):
-                                    figma_designs = analysis.get('figma_designs', [])
-                                    if figma_designs and len(figma_designs) > 0:
-                                        question_count = len(analysis.get('suggested_questions', []))
-                                        if question_count > 0:
-                                            complexity_patterns.append({
-                                                'figma_count': len(figma_designs),
-                                                'question_count': question_count,
-                                                'test_case_count': len(analysis.get('test_cases', [])),
-                                                'title': full_ticket.get('title', ''),
-                                                'components': analysis.get('components', [])
-                                            })
-                                        
-                                        # Get design questions
-                                        for question in analysis.get('design_questions', [])[:3]:
-                                            if isinstance(question, str) and ('figma' in question.lower() or 'design' in question.lower()):
-                                                implementation_notes.add(question)
-                                        
-                                        # Get components
-                                        for comp in analysis.get('components', []):
-                                            if comp and isinstance(comp, str):
-                                                component_patterns.add(comp)
-                
-                knowledge_data['design_patterns'].extend(complexity_patterns)
-                knowledge_data['component_patterns'].extend(list(component_patterns))
-                knowledge_data['implementation_notes'].extend(list(implementation_notes))
-                knowledge_data['total_figma_tickets'] = len(figma_tickets)
-                
-            except Exception as e:
-                print(f"⚠️ Could not retrieve ticket-based Figma knowledge: {e}")
+        """Get design knowledge from stored tickets and implemented features knowledge base.
         
-        # 2. Get knowledge from implemented features knowledge base
+        Reads the most recent Figma tickets from storage and the knowledge
+        snapshot, which changes to knowledge_base/figma_knowledge.json keep up to date.
+        """
         try:
-            from pathlib import Path
-            import json
-            
-            knowledge_file = Path("knowledge_base") / "figma_knowledge.json"
-            if knowledge_file.exists():
-                with open(knowledge_file, 'r') as f:
-                    implemented_features = json.load(f)
-                
-                if implemented_features:
-                    # Analyze implemented features for patterns
-                    feature_insights = []
-                    complexity_mapping = {'Low': 1, 'Medium': 2, 'High': 3, 'Very High': 4}
-                    
-                    # Group by complexity
-                    by_complexity = {}
-                    for feature in implemented_features:
-                        complexity = feature.get('complexity_rating', 'Medium')
-                        if complexity not in by_complexity:
-                            by_complexity[complexity] = []
-                        by_complexity[complexity].append(feature)
-                    
-                    # Generate insights from implemented features
-                    for complexity, features in by_complexity.items():
-                        avg_dev_time = sum(f.get('development_time', 0) for f in features) / len(features)
-                        avg_team_size = sum(f.get('team_size', 0) for f in features) / len(features)
-                        
-                        if features:
-                            feature_insights.append(f"{complexity} complexity features: avg {avg_dev_time:.1f} days, {avg_team_size:.1f} team size")
-                    
-                    # Most complex implemented feature
-                    most_complex = max(implemented_features, key=lambda x: complexity_mapping.get(x.get('complexity_rating', 'Low'), 1))
-                    feature_insights.append(f"Most complex implemented: '{most_complex['feature_name']}' ({most_complex['complexity_rating']})")
-                    
-                    # Technology patterns
-                    all_techs = []
-                    for feature in implemented_features:
-                        all_techs.extend(feature.get('technology_stack', []))
-                    
-                    tech_counts = {}
-                    for tech in all_techs:
-                        tech_counts[tech] = tech_counts.get(tech, 0) + 1
-                    
-                    common_techs = sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-                    if common_techs:
-                        feature_insights.append(f"Common technologies: {', '.join([tech for tech, _ in common_techs])}")
-                    
-                    # Extract implementation patterns
-                    implementation_patterns = []
-                    for feature in implemented_features:
-                        if feature.get('figma_analysis'):
-                            analysis = feature['figma_analysis']
-                            implementation_patterns.append({
-                                'feature_name': feature['feature_name'],
-                                'complexity_rating': feature['complexity_rating'],
-                                'development_time': feature['development_time'],
-                                'team_size': feature['team_size'],
-                                'total_screens': analysis.get('total_screens', 0),
-                                'total_components': analysis.get('total_components', 0),
-                                'complexity_score': analysis.get('complexity_score', 0),
-                                'technology_stack': feature.get('technology_stack', [])
-                            })
-                    
-                    # Update knowledge data with implemented features insights
-                    knowledge_data['figma_insights'].extend(feature_insights)
-                    knowledge_data['design_patterns'].extend(implementation_patterns[:10])
-                    knowledge_data['total_implemented_features'] = len(implemented_features)
-                    
-                    # Extract unique components from implemented features
-                    all_components = set()
-                    for feature in implemented_features:
-                        if feature.get('figma_analysis', {}).get('components'):
-                            all_components.update(feature['figma_analysis']['components'][:5])
-                    
-                    knowledge_data['component_patterns'].extend(list(all_components)[:8])
-                    
+            if hasattr(self, 'ticket_storage') and self.ticket_storage:
+                knowledge_data = self.ticket_storage.get_figma_design_knowledge(exclude_ticket_id=ticket.ticket_id)
+            else:
+                knowledge_data = get_snapshot().get_knowledge(exclude_ticket_id=ticket.ticket_id)
         except Exception as e:
-            print(f"⚠️ Could not retrieve implemented features knowledge: {e}")
+            print(f"⚠️ Could not retrieve Figma design knowledge: {e}")
+            knowledge_data = {
+                'design_patterns': [],
+                'figma_insights': [],
+                'implementation_notes': [],
+                'component_patterns': [],
+                'total_figma_tickets': 0
+            }
         
         # Generate combined insights
         if knowledge_data['design_patterns']:
@@ -2252,25 +2797,9 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         
         for media_file in media_files:
             try:
-                print(f"📸 Processing media file: {media_file}")
-                
-                # Analyze the media file
-                analysis = self.media_analyzer.analyze_media_file(media_file)
-                
-                if analysis:
-                    # Convert to dict for JSON serialization
-                    media_context = self.media_analyzer.get_analysis_context(analysis)
-                    media_context.update({
-                        'filename': analysis.filename,
-                        'media_id': analysis.media_id,
-                        'analysis_date': analysis.analysis_date
-                    })
-                    
+                media_context = analyze_media_source(media_file, self.media_analyzer)
+                if media_context:
                     media_analyses.append(media_context)
-                    print(f"✅ Media analysis complete: {analysis.content_type} ({analysis.media_type})")
-                else:
-                    print(f"⚠️ Could not analyze media file: {media_file}")
-                    
             except Exception as e:
                 print(f"❌ Error analyzing media file {media_file}: {e}")
                 continue
@@ -2293,7 +2822,7 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         # Perform the analysis
         return self.analyze_ticket_content(ticket)
 
-    def analyze_visual_content(self, image_path: str, ticket: JiraTicket = None) -> Optional[VisualAnalysisResult]:
+    def analyze_visual_content(self, image_path: str, ticket: JiraTicket = None) -> Optional['VisualAnalysisResult']:
         """Analyze visual content (screenshots, mockups) using GPT-4 Vision."""
         if not self.vision_analyzer:
             print("⚠️ GPT-4 Vision analyzer not available")
@@ -2355,7 +2884,7 @@ IMPORTANT: Based on the Figma screens and buttons detected above, ask specific q
         
         return enhanced_analysis
     
-    def generate_visual_questions(self, visual_analysis: VisualAnalysisResult, ticket: JiraTicket) -> List[str]:
+    def generate_visual_questions(self, visual_analysis: 'VisualAnalysisResult', ticket: JiraTicket) -> List[str]:
         """Generate specific questions based on GPT-4 Vision analysis."""
         questions = []
         
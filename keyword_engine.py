@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Keyword Classification Engine for Jira-Figma Analyzer
+
+Compiles every keyword vocabulary used to flag ticket content (topics,
+complexity indicators, routing skills, ticket type and priority) into one
+trie-shaped regular expression. A single pass over the text finds every
+vocabulary term at a word boundary and returns the set of flags they map
+to, so feature extraction costs O(text) however many vocabularies there are.
+"""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Iterable, FrozenSet, Set
+
+# Topic flags shared by the analyzer's content analysis and question fallbacks
+TOPIC_VOCABULARY: Dict[str, List[str]] = {
+    'mobile': ['mobile', 'mobile app', 'responsive', 'tablet', 'ios', 'android', 'react native'],
+    'performance': ['performance', 'speed', 'load', 'loading', 'load time', 'optimization', 'optimize',
+                    'cache', 'caching', 'latency'],
+    'accessibility': ['accessibility', 'a11y', 'wcag', 'screen reader'],
+    'integration': ['api', 'integration', 'integrate', 'third-party', 'third party', 'external', 'connect',
+                    'connection', 'sync', 'synchronization', 'webhook', 'endpoint'],
+    'security': ['security', 'authentication', 'authorization', 'encryption', 'compliance'],
+    'internationalization': ['i18n', 'internationalization', 'localization', 'multi-language', 'translation'],
+    'animation': ['animation', 'transition', 'motion', 'interaction'],
+    'error_handling': ['error', 'exception', 'fallback', 'edge case', 'validation'],
+    'data': ['data', 'database', 'storage', 'cache', 'persistence'],
+    'user_flow': ['user flow', 'workflow', 'process', 'journey'],
+    'ui_ux': ['design', 'ui', 'ux', 'interface', 'user interface', 'user experience', 'screen'],
+    'profile': ['profile', 'user', 'occupation', 'country'],
+    'analytics': ['mixpanel', 'event', 'track', 'tracking', 'analytics'],
+}
+
+# Complexity indicators reported in the analysis
+COMPLEXITY_VOCABULARY: Dict[str, List[str]] = {
+    'multiple_components': ['multiple', 'several', 'various', 'complex'],
+    'system_integration': ['integration', 'integrate', 'connect', 'sync', 'synchronization'],
+    'new_development': ['new', 'create', 'build', 'develop', 'development', 'implement'],
+    'refactoring': ['refactor', 'refactoring', 'redesign', 'rebuild', 'rewrite'],
+}
+
+# Skills, complexity, type and priority signals used by smart routing
+ROUTING_VOCABULARY: Dict[str, List[str]] = {
+    'skill:react_native': ['react native', 'rn', 'mobile app', 'ios', 'android'],
+    'skill:javascript': ['javascript', 'js', 'frontend', 'front-end', 'ui'],
+    'skill:python': ['python', 'backend', 'back-end', 'api', 'django', 'flask'],
+    'skill:figma': ['figma', 'design', 'mockup', 'prototype'],
+    'skill:japanese': ['japanese', 'japan', 'localization', 'i18n'],
+    'skill:testing': ['test', 'testing', 'qa', 'quality'],
+    'skill:api_integration': ['api', 'integration', 'endpoint', 'rest api'],
+    'skill:database': ['database', 'sql', 'data', 'storage'],
+    'skill:ui_ux': ['ui', 'ux', 'user interface', 'user experience'],
+    'skill:accessibility': ['accessibility', 'a11y', 'wcag', 'screen reader'],
+    'complexity:high': ['complex', 'difficult', 'challenging', 'advanced', 'sophisticated'],
+    'complexity:medium': ['moderate', 'standard', 'typical', 'normal'],
+    'complexity:low': ['simple', 'easy', 'basic', 'straightforward'],
+    'type:bug': ['bug', 'fix', 'error', 'crash', 'broken'],
+    'type:feature': ['feature', 'new', 'add'],
+    'type:enhancement': ['improve', 'enhance', 'optimize', 'improvement', 'enhancement'],
+    'priority:critical': ['urgent', 'critical', 'asap', 'blocker'],
+    'priority:high': ['high', 'important'],
+    'priority:low': ['low', 'minor'],
+    'needs:figma': ['figma'],
+    'needs:backend': ['backend', 'back-end', 'api', 'database', 'python'],
+    'needs:frontend': ['frontend', 'front-end', 'ui', 'react', 'javascript'],
+    'needs:mobile': ['mobile', 'react native', 'ios', 'android'],
+    'needs:testing': ['test', 'testing'],
+    'needs:japanese': ['japanese', 'japan'],
+    'needs:design': ['design', 'figma', 'ui', 'ux'],
+}
+
+# Inflections accepted after a term, so 'error' also matches 'errors'
+_PLURAL_SUFFIX = r'(?:e?s)?'
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie, so matching never rescans a shared prefix."""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Greedy: try the longer term first, fall back to the shorter one
+            return '(?:' + body + ')?' if len(branches) == 1 and len(body) > 1 else body + '?'
+        return body
+
+    return build(trie)
+
+
+class KeywordEngine:
+    """Finds every flag whose vocabulary occurs in a text, in one regex pass."""
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]], cache_size: int = 256):
+        """Compile the vocabularies.
+
+        Args:
+            vocabularies: Flag name -> terms that raise it. Terms are matched
+                case-insensitively at word boundaries, with an optional plural suffix.
+            cache_size: Recently classified texts kept, so analyzer helpers
+                working on the same ticket text share one pass
+        """
+        self.term_flags: Dict[str, Set[str]] = defaultdict(set)
+        for flag, terms in vocabularies.items():
+            for term in terms:
+                self.term_flags[term.lower().strip()].add(flag)
+
+        # A match is the longest term starting at a position; terms that are
+        # word-prefixes of it (e.g. 'user' in 'user flow') match there too
+        self._flags_at_match: Dict[str, FrozenSet[str]] = {}
+        for term in self.term_flags:
+            flags = set()
+            for other, other_flags in self.term_flags.items():
+                if term.startswith(other) and (len(term) == len(other) or not re.match(r'\w', term[len(other)])):
+                    flags |= other_flags
+            self._flags_at_match[term] = frozenset(flags)
+
+        # Zero-width lookahead so overlapping terms ('react native', 'native app') are all found
+        self._pattern = re.compile(
+            r'(?<!\w)(?=(' + _trie_pattern(self.term_flags) + r')' + _PLURAL_SUFFIX + r'(?!\w))'
+        )
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, text: str) -> FrozenSet[str]:
+        """Get every flag raised by the text."""
+        flags: Set[str] = set()
+        for match in self._pattern.finditer(text.lower()):
+            flags |= self._flags_at_match[match.group(1)]
+        return frozenset(flags)
+
+    def matched_terms(self, text: str) -> List[str]:
+        """Get the vocabulary terms found in the text, in order of appearance."""
+        return [match.group(1) for match in self._pattern.finditer(text.lower())]
+
+
+# Engine shared by the analyzer and smart routing
+TICKET_KEYWORDS = KeywordEngine({**TOPIC_VOCABULARY, **COMPLEXITY_VOCABULARY, **ROUTING_VOCABULARY})
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Figma Knowledge Snapshot for Jira-Figma Analyzer
+
+Builds the design knowledge the analyzer feeds into every prompt: patterns
+from the most recent Figma tickets plus the implemented-features knowledge
+base. The recent tickets come from an indexed query on the ticket store, and
+the knowledge base aggregate is kept on disk and only recomputed when its
+file changes, so looking up knowledge costs the same however long the
+history is.
+"""
+
+import json
+import os
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+# Bump when the snapshot layout changes; older snapshots are rebuilt
+SCHEMA_VERSION = 2
+
+DEFAULT_KNOWLEDGE_FILE = os.path.join("knowledge_base", "figma_knowledge.json")
+
+# Snapshots already loaded by this process, by path
+_snapshots: Dict[str, 'FigmaKnowledgeSnapshot'] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(snapshot_path: Optional[str] = None,
+                 knowledge_file: str = DEFAULT_KNOWLEDGE_FILE) -> 'FigmaKnowledgeSnapshot':
+    """Get this process's snapshot for a path, loading it on first use.
+
+    Args:
+        snapshot_path: Where the snapshot is persisted; None keeps it in memory only
+        knowledge_file: Implemented-features knowledge base to aggregate
+    """
+    key = f"{snapshot_path}|{knowledge_file}"
+    with _snapshots_lock:
+        if key not in _snapshots:
+            _snapshots[key] = FigmaKnowledgeSnapshot(snapshot_path, knowledge_file)
+        return _snapshots[key]
+
+
+def _ticket_entry(title: str, description: str, analysis: Dict[str, Any],
+                  ticket_key: str = '') -> Optional[Dict[str, Any]]:
+    """Reduce a stored ticket to the knowledge it contributes, or None if it has no Figma context."""
+    analysis = analysis if isinstance(analysis, dict) else {}
+    figma_designs = analysis.get('figma_designs', [])
+    searchable = f"{title or ''} {description or ''} {ticket_key or ''}".lower()
+    if 'figma' not in searchable and not figma_designs:
+        return None
+
+    entry = {'title': title or '', 'pattern': None, 'components': [], 'implementation_notes': []}
+    if figma_designs:
+        question_count = len(analysis.get('suggested_questions', []))
+        if question_count > 0:
+            entry['pattern'] = {
+                'figma_count': len(figma_designs),
+                'question_count': question_count,
+                'test_case_count': len(analysis.get('test_cases', [])),
+                'title': title or '',
+                'components': analysis.get('components', [])
+            }
+        entry['implementation_notes'] = [
+            question for question in analysis.get('design_questions', [])[:3]
+            if isinstance(question, str) and ('figma' in question.lower() or 'design' in question.lower())
+        ]
+        entry['components'] = [comp for comp in analysis.get('components', []) if comp and isinstance(comp, str)]
+    return entry
+
+
+def _aggregate_implemented_features(implemented_features: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate the implemented-features knowledge base into prompt-ready insights."""
+    if not implemented_features:
+        return {}
+
+    feature_insights = []
+    complexity_mapping = {'Low': 1, 'Medium': 2, 'High': 3, 'Very High': 4}
+
+    # Group by complexity
+    by_complexity = {}
+    for feature in implemented_features:
+        by_complexity.setdefault(feature.get('complexity_rating', 'Medium'), []).append(feature)
+
+    for complexity, features in by_complexity.items():
+        avg_dev_time = sum(f.get('development_time', 0) for f in features) / len(features)
+        avg_team_size = sum(f.get('team_size', 0) for f in features) / len(features)
+        feature_insights.append(f"{complexity} complexity features: avg {avg_dev_time:.1f} days, {avg_team_size:.1f} team size")
+
+    # Most complex implemented feature
+    most_complex = max(implemented_features, key=lambda x: complexity_mapping.get(x.get('complexity_rating', 'Low'), 1))
+    feature_insights.append(f"Most complex implemented: '{most_complex['feature_name']}' ({most_complex['complexity_rating']})")
+
+    # Technology patterns
+    tech_counts = {}
+    for feature in implemented_features:
+        for tech in feature.get('technology_stack', []):
+            tech_counts[tech] = tech_counts.get(tech, 0) + 1
+    common_techs = sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    if common_techs:
+        feature_insights.append(f"Common technologies: {', '.join([tech for tech, _ in common_techs])}")
+
+    # Implementation patterns
+    implementation_patterns = []
+    all_components = set()
+    for feature in implemented_features:
+        if feature.get('figma_analysis'):
+            analysis = feature['figma_analysis']
+            implementation_patterns.append({
+                'feature_name': feature['feature_name'],
+                'complexity_rating': feature['complexity_rating'],
+                'development_time': feature['development_time'],
+                'team_size': feature['team_size'],
+                'total_screens': analysis.get('total_screens', 0),
+                'total_components': analysis.get('total_components', 0),
+                'complexity_score': analysis.get('complexity_score', 0),
+                'technology_stack': feature.get('technology_stack', [])
+            })
+            if analysis.get('components'):
+                all_components.update(analysis['components'][:5])
+
+    return {
+        'figma_insights': feature_insights,
+        'design_patterns': implementation_patterns[:10],
+        'component_patterns': sorted(all_components)[:8],
+        'total_implemented_features': len(implemented_features)
+    }
+
+
+class FigmaKnowledgeSnapshot:
+    """Versioned aggregate of the implemented-features knowledge base.
+
+    Ticket knowledge isn't kept here: get_knowledge is given the most recent
+    Figma tickets, which the ticket store reads from an index.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None,
+                 knowledge_file: str = DEFAULT_KNOWLEDGE_FILE, window: int = 20):
+        """Initialize the snapshot, loading it from disk if present.
+
+        Args:
+            snapshot_path: JSON file the aggregate is persisted to; None keeps it in memory
+            knowledge_file: Implemented-features knowledge base to aggregate
+            window: Most recent Figma tickets to draw patterns from
+        """
+        self.snapshot_path = snapshot_path
+        self.knowledge_file = knowledge_file
+        self.window = window
+        self._lock = threading.RLock()
+        self.version = 0
+        self.implemented: Dict[str, Any] = {}
+        self.knowledge_signature: Optional[List[int]] = None
+        self._load()
+
+    def get_knowledge(self, recent_tickets: Iterable[Tuple[str, str, str, str, Dict[str, Any]]] = (),
+                      exclude_ticket_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get the design knowledge for a ticket, leaving out the ticket itself.
+
+        Args:
+            recent_tickets: (id, ticket_key, title, description, analysis) rows
+                of Figma tickets, newest first; only the first ``window`` are used
+            exclude_ticket_id: Ticket being analyzed
+
+        Returns the same shape _get_figma_design_knowledge has always produced.
+        """
+        entries = (
+            _ticket_entry(title, description, analysis, ticket_key)
+            for ticket_id, ticket_key, title, description, analysis in recent_tickets
+            if ticket_id != exclude_ticket_id
+        )
+        recent = list(islice((entry for entry in entries if entry), self.window))
+
+        with self._lock:
+            self._refresh_implemented()
+            knowledge_data = {
+                'design_patterns': [entry['pattern'] for entry in recent if entry['pattern']],
+                'figma_insights': [],
+                'implementation_notes': sorted({note for entry in recent for note in entry['implementation_notes']}),
+                'component_patterns': sorted({comp for entry in recent for comp in entry['components']}),
+                'total_figma_tickets': len(recent),
+                'snapshot_version': self.version
+            }
+
+            if self.implemented:
+                knowledge_data['figma_insights'].extend(self.implemented['figma_insights'])
+                knowledge_data['design_patterns'].extend(self.implemented['design_patterns'])
+                knowledge_data['component_patterns'].extend(self.implemented['component_patterns'])
+                knowledge_data['total_implemented_features'] = self.implemented['total_implemented_features']
+            return knowledge_data
+
+    def get_version(self) -> Optional[List[int]]:
+        """Get the signature of the knowledge base file the aggregate was built from.
+
+        Unlike ``version`` it is the same in every process, and it only
+        changes when the knowledge base file does.
+        """
+        with self._lock:
+            self._refresh_implemented()
+            return self.knowledge_signature
+
+    def _refresh_implemented(self):
+        """Re-aggregate the knowledge base if its file changed since the last aggregation."""
+        try:
+            stat = os.stat(self.knowledge_file)
+            signature = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            signature = None
+        if signature == self.knowledge_signature:
+            return
+
+        implemented = {}
+        if signature:
+            try:
+                with open(self.knowledge_file, 'r') as f:
+                    implemented = _aggregate_implemented_features(json.load(f))
+            except Exception as e:
+                print(f"⚠️ Could not retrieve implemented features knowledge: {e}")
+        self.implemented = implemented
+        self.knowledge_signature = signature
+        self._commit()
+
+    def _commit(self):
+        """Bump the version and persist the aggregate.
+
+        Only runs when the knowledge base file changes. Processes racing here
+        write the same aggregate, and the replace is atomic.
+        """
+        self.version += 1
+        if not self.snapshot_path:
+            return
+        data = {
+            'schema_version': SCHEMA_VERSION,
+            'version': self.version,
+            'implemented': self.implemented,
+            'knowledge_signature': self.knowledge_signature
+        }
+        try:
+            Path(self.snapshot_path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"⚠️ Could not save Figma knowledge snapshot: {e}")
+
+    def _load(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load Figma knowledge snapshot, rebuilding: {e}")
+            return
+        if data.get('schema_version') != SCHEMA_VERSION:
+            return
+
+        self.version = data.get('version', 0)
+        self.implemented = data.get('implemented', {})
+        self.knowledge_signature = data.get('knowledge_signature')
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache for Jira-Figma Analyzer
+
+Persistent SQLite cache for OpenAI chat completions. Responses are keyed on a
+hash of model, messages, temperature and max_tokens, expire after a TTL and
+are evicted least-recently-used once the cache grows past its size limit.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any
+
+
+class LLMResponseCache:
+    """SQLite-backed cache for LLM responses with TTL and LRU eviction."""
+
+    def __init__(self, storage_dir: str = "llm_cache", ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 5000, bypass: Optional[bool] = None):
+        """Initialize the cache.
+
+        Args:
+            storage_dir: Directory holding the cache database
+            ttl_seconds: Age after which an entry is treated as a miss
+            max_entries: Number of entries kept before LRU eviction kicks in
+            bypass: Skip the cache entirely. Defaults to the LLM_CACHE_BYPASS
+                environment variable.
+        """
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(exist_ok=True)
+        self.db_path = self.storage_dir / "llm_cache.db"
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        if bypass is None:
+            bypass = os.getenv('LLM_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes')
+        self.bypass = bypass
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_database(self):
+        """Initialize the cache database."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,  -- JSON
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed)')
+            conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None, **extra) -> str:
+        """Hash the request parameters that determine a response."""
+        payload = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+        }
+        # Parameters such as response_format change the shape of the answer
+        payload.update({k: v for k, v in extra.items() if v is not None})
+        serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None on a miss or expired entry."""
+        if self.bypass:
+            return None
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT response, created_at FROM responses WHERE cache_key = ?', (cache_key,))
+                row = cursor.fetchone()
+
+                if row and now - row[1] <= self.ttl_seconds:
+                    cursor.execute(
+                        'UPDATE responses SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?',
+                        (now, cache_key)
+                    )
+                    conn.commit()
+                    self._record(hit=True)
+                    return json.loads(row[0])
+
+                if row:
+                    cursor.execute('DELETE FROM responses WHERE cache_key = ?', (cache_key,))
+                    conn.commit()
+        except Exception as e:
+            print(f"⚠️ LLM cache read failed: {e}")
+
+        self._record(hit=False)
+        return None
+
+    def set(self, cache_key: str, response: Dict[str, Any], model: str = ""):
+        """Store a response and evict least-recently-used entries over the limit."""
+        if self.bypass:
+            return
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO responses (cache_key, model, response, created_at, last_accessed, hit_count)
+                    VALUES (?, ?, ?, ?, ?, 0)
+                ''', (cache_key, model, json.dumps(response, default=str), now, now))
+
+                cursor.execute('SELECT COUNT(*) FROM responses')
+                overflow = cursor.fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    cursor.execute('''
+                        DELETE FROM responses WHERE cache_key IN (
+                            SELECT cache_key FROM responses ORDER BY last_accessed ASC LIMIT ?
+                        )
+                    ''', (overflow,))
+                conn.commit()
+        except Exception as e:
+            print(f"⚠️ LLM cache write failed: {e}")
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM responses')
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for this process and the current cache size."""
+        with self._connect() as conn:
+            entries = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'bypass': self.bypass
+        }
+
+
+# Monotonic deadline for chat completions made by the current thread
+_request_deadline = threading.local()
+
+
+@contextmanager
+def request_deadline(deadline_at: Optional[float]):
+    """Bound every chat completion this thread makes to a ``time.monotonic()`` deadline.
+
+    Requests are sent with the remaining time as their timeout, and requests
+    made after the deadline fail straight away with TimeoutError.
+    """
+    previous = getattr(_request_deadline, 'at', None)
+    _request_deadline.at = deadline_at
+    try:
+        yield
+    finally:
+        _request_deadline.at = previous
+
+
+def current_request_deadline() -> Optional[float]:
+    """Get the deadline set by request_deadline() for this thread, if any."""
+    return getattr(_request_deadline, 'at', None)
+
+
+def _to_namespace(data: Any) -> Any:
+    """Turn a cached response dict back into attribute-style objects."""
+    return json.loads(json.dumps(data), object_hook=lambda d: SimpleNamespace(**d))
+
+
+class _CachedCompletions:
+    """Stand-in for ``client.chat.completions`` that consults the cache first."""
+
+    def __init__(self, completions, cache: LLMResponseCache):
+        self._completions = completions
+        self._cache = cache
+
+    def create(self, bypass_cache: bool = False, **kwargs):
+        cache_key = LLMResponseCache.make_key(
+            kwargs.get('model'),
+            kwargs.get('messages', []),
+            kwargs.get('temperature'),
+            kwargs.get('max_tokens'),
+            response_format=kwargs.get('response_format')
+        )
+
+        if not bypass_cache:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return _to_namespace(cached)
+
+        deadline_at = current_request_deadline()
+        if deadline_at is not None:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("analysis deadline passed before the request was sent")
+            kwargs['timeout'] = min(kwargs.get('timeout') or remaining, remaining)
+
+        response = self._completions.create(**kwargs)
+
+        if not bypass_cache:
+            if hasattr(response, 'model_dump'):
+                data = response.model_dump()
+            else:
+                data = {'choices': [{'message': {'content': response.choices[0].message.content}}]}
+            self._cache.set(cache_key, data, model=kwargs.get('model', ''))
+
+        return response
+
+
+class CachedOpenAIClient:
+    """Wraps an OpenAI client so chat completions go through an LLMResponseCache.
+
+    Everything other than ``chat.completions.create`` is delegated to the
+    wrapped client unchanged.
+    """
+
+    def __init__(self, client, cache: LLMResponseCache):
+        self._client = client
+        self.cache = cache
+        self.chat = SimpleNamespace(completions=_CachedCompletions(client.chat.completions, cache))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
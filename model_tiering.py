@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Complexity-aware Model Tiering for Jira-Figma Analyzer
+
+Picks the model, token budget and set of sections to generate for each
+ticket. Trivial tickets get a small fast model and a reduced section set;
+complex tickets with several designs get a larger token budget. Latency and
+token usage are recorded per tier so the thresholds can be tuned.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+# Tier definitions; override any field through the ``model_tiers`` config key
+DEFAULT_TIERS: Dict[str, Dict[str, Any]] = {
+    'light': {
+        'model': 'gpt-4o-mini',
+        'token_scale': 0.6,
+        'sections': ['suggested_questions', 'clarifications_needed', 'technical_considerations',
+                     'risk_areas', 'test_cases'],
+    },
+    'standard': {
+        'model': DEFAULT_MODEL,
+        'token_scale': 1.0,
+        'sections': None,
+    },
+    'complex': {
+        'model': DEFAULT_MODEL,
+        'token_scale': 1.5,
+        'sections': None,
+    },
+}
+
+
+@dataclass
+class ModelTier:
+    """Model and token budget used for one class of ticket."""
+    name: str
+    model: str = DEFAULT_MODEL
+    token_scale: float = 1.0
+    sections: Optional[List[str]] = None  # None generates every section
+
+    def max_tokens(self, base: int) -> int:
+        """Scale a call site's default max_tokens to this tier's budget."""
+        return max(64, int(base * self.token_scale))
+
+    def includes(self, section: str) -> bool:
+        return self.sections is None or section in self.sections
+
+
+@dataclass
+class TierSelection:
+    """The tier chosen for one analysis, plus the LLM usage it accrued."""
+    tier: ModelTier
+    score: int = 0
+    reasons: List[str] = field(default_factory=list)
+    calls: int = 0
+    failures: int = 0
+    llm_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record_call(self, seconds: float, usage: Any = None, failed: bool = False):
+        """Record one chat completion made for this analysis."""
+        with self._lock:
+            self.calls += 1
+            self.failures += int(failed)
+            self.llm_seconds += seconds
+            if usage is not None:
+                self.prompt_tokens += getattr(usage, 'prompt_tokens', 0) or 0
+                self.completion_tokens += getattr(usage, 'completion_tokens', 0) or 0
+
+    def to_report(self) -> Dict[str, Any]:
+        """Summary stored with the analysis."""
+        return {
+            'tier': self.tier.name,
+            'model': self.tier.model,
+            'score': self.score,
+            'reasons': self.reasons,
+            'sections': self.tier.sections,
+            'calls': self.calls,
+            'failures': self.failures,
+            'llm_seconds': round(self.llm_seconds, 3),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+        }
+
+
+class TierPolicy:
+    """Scores a ticket's complexity and maps the score to a tier."""
+
+    def __init__(self, tiers: Dict[str, ModelTier], light_max_score: int = 1,
+                 complex_min_score: int = 5, enabled: bool = True):
+        """Initialize the policy.
+
+        Args:
+            tiers: Tier definitions by name; must include 'light', 'standard' and 'complex'
+            light_max_score: Highest score (with no designs attached) that counts as trivial
+            complex_min_score: Lowest score that counts as complex
+            enabled: When False every ticket gets the standard tier
+        """
+        self.tiers = tiers
+        self.light_max_score = light_max_score
+        self.complex_min_score = complex_min_score
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'TierPolicy':
+        """Build the policy from the analyzer config."""
+        overrides = config.get('model_tiers') or {}
+        tiers = {}
+        for name, defaults in DEFAULT_TIERS.items():
+            settings = {**defaults, **overrides.get(name, {})}
+            tiers[name] = ModelTier(name, settings['model'], settings['token_scale'], settings['sections'])
+        return cls(
+            tiers,
+            light_max_score=config.get('tier_light_max_score', 1),
+            complex_min_score=config.get('tier_complex_min_score', 5),
+            enabled=config.get('model_tiering', True)
+        )
+
+    @property
+    def default_tier(self) -> ModelTier:
+        return self.tiers['standard']
+
+    def select(self, ticket, analysis: Dict[str, Any]) -> TierSelection:
+        """Choose the tier for a ticket from its content analysis and ingested designs."""
+        if not self.enabled:
+            return TierSelection(self.default_tier, reasons=["tiering disabled"])
+
+        score, reasons = 0, []
+
+        indicators = analysis.get('complexity_indicators', [])
+        if indicators:
+            score += len(indicators)
+            reasons.append(f"{len(indicators)} complexity indicator(s)")
+
+        words = len(f"{ticket.title} {ticket.description}".split())
+        if words > 150:
+            score += 1 if words <= 400 else 2
+            reasons.append(f"{words} words")
+
+        design_sources = (len(ticket.figma_links or []) + len(ticket.pdf_design_paths or [])
+                          + len(ticket.media_files or []))
+        if design_sources:
+            score += design_sources
+            reasons.append(f"{design_sources} design source(s)")
+
+        design_complexity = max([
+            design.get('design_complexity', design.get('pdf_complexity', design.get('complexity_score', 0))) or 0
+            for key in ('figma_designs', 'pdf_designs', 'media_files')
+            for design in analysis.get(key, [])
+            if isinstance(design, dict)
+        ] or [0])
+        if design_complexity > 4:
+            score += 2 if design_complexity > 7 else 1
+            reasons.append(f"design complexity {design_complexity:.1f}/10")
+
+        if analysis.get('priority_level') in ['High', 'Critical', 'Highest']:
+            score += 1
+            reasons.append(f"{analysis['priority_level']} priority")
+
+        if score >= self.complex_min_score or design_sources >= 2:
+            name = 'complex'
+        elif score <= self.light_max_score and not design_sources:
+            name = 'light'
+        else:
+            name = 'standard'
+        return TierSelection(self.tiers[name], score, reasons)
+
+
+class TierMetrics:
+    """Process-wide latency and token usage per tier."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+
+    def record_analysis(self, selection: TierSelection, seconds: float):
+        """Add a finished analysis and the LLM usage it accrued to its tier's totals."""
+        with self._lock:
+            totals = self._tiers.setdefault(selection.tier.name, {
+                'analyses': 0, 'analysis_seconds': 0.0, 'calls': 0, 'failures': 0,
+                'llm_seconds': 0.0, 'prompt_tokens': 0, 'completion_tokens': 0
+            })
+            totals['analyses'] += 1
+            totals['analysis_seconds'] += seconds
+            totals['calls'] += selection.calls
+            totals['failures'] += selection.failures
+            totals['llm_seconds'] += selection.llm_seconds
+            totals['prompt_tokens'] += selection.prompt_tokens
+            totals['completion_tokens'] += selection.completion_tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get totals and averages per tier."""
+        with self._lock:
+            report = {}
+            for name, totals in self._tiers.items():
+                analyses, calls = totals['analyses'], totals['calls']
+                report[name] = {
+                    **totals,
+                    'avg_analysis_seconds': totals['analysis_seconds'] / analyses if analyses else 0.0,
+                    'avg_call_seconds': totals['llm_seconds'] / calls if calls else 0.0,
+                    'avg_tokens_per_analysis': (
+                        (totals['prompt_tokens'] + totals['completion_tokens']) / analyses if analyses else 0.0
+                    ),
+                }
+            return report
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Shared OpenAI Rate Limiter for Jira-Figma Analyzer
+
+One process-wide limiter that every OpenAI call goes through: token buckets
+for requests and tokens per minute, a bound on concurrent requests, and
+jittered exponential retry that honors Retry-After. A 429 pauses every
+caller for the advertised time instead of letting each thread hammer the
+API on its own, so batch throughput settles at the provider limit rather
+than collapsing into fallbacks.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any, Callable
+
+from llm_cache import current_request_deadline
+from prompt_budget import count_tokens
+
+DEFAULT_LIMITS: Dict[str, Any] = {
+    'requests_per_minute': 500,
+    'tokens_per_minute': 200000,
+    'max_concurrency': 8,
+    'max_retries': 5,
+    'retry_base_delay': 1.0,
+    'retry_max_delay': 30.0,
+}
+
+# Responses worth retrying: rate limits, timeouts and transient server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# Exceptions without a status code that are worth retrying (OpenAI SDK and requests)
+RETRYABLE_ERRORS = {'APIConnectionError', 'APITimeoutError', 'ConnectionError', 'ConnectTimeout',
+                    'ReadTimeout', 'Timeout', 'ChunkedEncodingError'}
+
+# Rough prompt cost of one image sent at high detail
+IMAGE_TOKENS = 765
+
+_limiter: Optional['OpenAIRateLimiter'] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(settings: Optional[Dict[str, Any]] = None) -> 'OpenAIRateLimiter':
+    """Get the process-wide limiter, applying any settings given.
+
+    Args:
+        settings: Overrides of DEFAULT_LIMITS, e.g. the ``openai_rate_limits`` config key
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = OpenAIRateLimiter(**{**DEFAULT_LIMITS, **(settings or {})})
+        elif settings:
+            _limiter.configure(**settings)
+        return _limiter
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """Upper estimate of the tokens a chat request will use: prompt plus completion budget."""
+    total = max_tokens or 0
+    for message in messages or []:
+        content = message.get('content', '')
+        total += 4
+        if isinstance(content, str):
+            total += count_tokens(content)
+            continue
+        for part in content or []:
+            if part.get('type') == 'image_url':
+                total += IMAGE_TOKENS
+            else:
+                total += count_tokens(part.get('text', ''))
+    return total
+
+
+def _status_of(obj: Any) -> Optional[int]:
+    status = getattr(obj, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_seconds(obj: Any) -> Optional[float]:
+    """Read Retry-After (or OpenAI's retry-after-ms) from a response or an exception carrying one."""
+    response = obj if hasattr(obj, 'headers') else getattr(obj, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    def header(name: str) -> Optional[str]:
+        return headers.get(name) or headers.get(name.title())
+
+    try:
+        milliseconds = header('retry-after-ms')
+        if milliseconds:
+            return max(0.0, float(milliseconds) / 1000)
+        value = header('retry-after')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Reservation-style token bucket refilled continuously at a per-minute rate.
+
+    Callers take what they need up front and are told how long to wait until
+    the bucket covers it, so the lock is never held while sleeping.
+    """
+
+    def __init__(self, per_minute: Optional[float]):
+        self._lock = threading.Lock()
+        self.configure(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def configure(self, per_minute: Optional[float]):
+        with self._lock:
+            self.unlimited = not per_minute
+            self.capacity = float(per_minute or 0)
+            self.rate = self.capacity / 60.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` and get the seconds to wait before using it."""
+        if self.unlimited or amount <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            # Requests bigger than the whole bucket would otherwise never fit
+            self.level -= min(amount, self.capacity)
+            return -self.level / self.rate if self.level < 0 else 0.0
+
+    def adjust(self, amount: float):
+        """Return unused tokens (positive) or charge for an underestimate (negative)."""
+        if self.unlimited or not amount:
+            return
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+class OpenAIRateLimiter:
+    """Request/token rate limits, concurrency bound and retry policy for OpenAI calls."""
+
+    def __init__(self, requests_per_minute: Optional[int] = 500, tokens_per_minute: Optional[int] = 200000,
+                 max_concurrency: int = 8, max_retries: int = 5, retry_base_delay: float = 1.0,
+                 retry_max_delay: float = 30.0):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget; None or 0 disables the limit
+            tokens_per_minute: Token budget (prompt plus completion); None or 0 disables the limit
+            max_concurrency: Requests allowed in flight at once
+            max_retries: Retries after the first attempt for retryable failures
+            retry_base_delay: Backoff before the first retry, doubled per attempt
+            retry_max_delay: Longest backoff between attempts, unless Retry-After asks for more
+        """
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self._slots = threading.Condition()
+        self._in_flight = 0
+        self._cooldown_until = 0.0
+        self._random = random.Random()
+        self._metrics_lock = threading.Lock()
+        self._recent = deque()  # (finished_at, tokens) of the last minute's successful requests
+        self._metrics = {
+            'calls': 0, 'attempts': 0, 'succeeded': 0, 'failed': 0, 'retries': 0,
+            'rate_limited': 0, 'server_errors': 0, 'max_in_flight': 0, 'tokens': 0,
+            'request_seconds': 0.0, 'throttle_seconds': 0.0, 'retry_wait_seconds': 0.0
+        }
+        self.configure(requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute,
+                       max_concurrency=max_concurrency, max_retries=max_retries,
+                       retry_base_delay=retry_base_delay, retry_max_delay=retry_max_delay)
+
+    def configure(self, **settings):
+        """Change limits in place; requests already waiting pick up the new values."""
+        if 'requests_per_minute' in settings:
+            self.request_bucket.configure(settings['requests_per_minute'])
+        if 'tokens_per_minute' in settings:
+            self.token_bucket.configure(settings['tokens_per_minute'])
+        if 'max_concurrency' in settings:
+            with self._slots:
+                self.max_concurrency = max(1, int(settings['max_concurrency']))
+                self._slots.notify_all()
+        for name, cast in (('max_retries', int), ('retry_base_delay', float), ('retry_max_delay', float)):
+            if name in settings:
+                setattr(self, name, cast(settings[name]))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt + 1``."""
+        if retry_after is not None:
+            # The server knows best; add a little jitter so callers don't return in lockstep
+            return retry_after + self._random.uniform(0, self.retry_base_delay / 2)
+        cap = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return self._random.uniform(cap / 2, cap)
+
+    def call(self, fn: Callable[[], Any], estimated_tokens: int = 0,
+             usage: Optional[Callable[[Any], Optional[int]]] = None,
+             deadline_at: Optional[float] = None) -> Any:
+        """Run an OpenAI request under the limits, retrying transient failures.
+
+        Args:
+            fn: Makes the request; called once per attempt
+            estimated_tokens: Tokens to reserve from the per-minute budget
+            usage: Gets the tokens actually used from a result, to settle the reservation
+            deadline_at: ``time.monotonic()`` deadline; no attempt or retry wait goes past it
+
+        Returns the result of ``fn``. Responses with a retryable status code
+        (e.g. from requests) are returned as-is once retries run out;
+        exceptions are re-raised.
+        """
+        self._count('calls')
+        attempt = 0
+        while True:
+            self._throttle(estimated_tokens, deadline_at)
+            self._acquire_slot(deadline_at)
+            started = time.monotonic()
+            error, result = None, None
+            try:
+                result = fn()
+            except Exception as e:
+                error = e
+            finally:
+                self._release_slot(time.monotonic() - started)
+
+            failure = error if error is not None else result
+            status = _status_of(failure)
+            if error is None and status not in RETRYABLE_STATUS:
+                self._succeeded(result, estimated_tokens, usage)
+                return result
+
+            if status == 429:
+                self._count('rate_limited')
+            elif status is not None and status >= 500:
+                self._count('server_errors')
+            retryable = status in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_ERRORS
+            # The request was refused, so its tokens were never spent
+            self.token_bucket.adjust(estimated_tokens)
+
+            delay = self.backoff(attempt, retry_after_seconds(failure)) if retryable else 0.0
+            out_of_time = deadline_at is not None and time.monotonic() + delay >= deadline_at
+            if not retryable or attempt >= self.max_retries or out_of_time:
+                self._count('failed')
+                if error is not None:
+                    raise error
+                return result
+
+            if status == 429:
+                # Everyone backs off, not just the caller that hit the limit
+                with self._slots:
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            print(f"🔁 OpenAI request failed ({status or type(error).__name__}), "
+                  f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            self._count('retries')
+            self._count('retry_wait_seconds', delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _throttle(self, estimated_tokens: int, deadline_at: Optional[float]):
+        """Wait out any 429 cool-down and the request/token buckets."""
+        wait = max(0.0, self._cooldown_until - time.monotonic())
+        wait = max(wait, self.request_bucket.reserve(1), self.token_bucket.reserve(estimated_tokens))
+        if wait <= 0:
+            return
+        if deadline_at is not None and time.monotonic() + wait >= deadline_at:
+            self.request_bucket.adjust(1)
+            self.token_bucket.adjust(estimated_tokens)
+            raise TimeoutError("analysis deadline would pass while waiting for the OpenAI rate limit")
+        self._count('throttle_seconds', wait)
+        time.sleep(wait)
+
+    def _acquire_slot(self, deadline_at: Optional[float]):
+        with self._slots:
+            while self._in_flight >= self.max_concurrency:
+                timeout = None if deadline_at is None else deadline_at - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    raise TimeoutError("analysis deadline passed while waiting for an OpenAI request slot")
+                self._slots.wait(timeout)
+            self._in_flight += 1
+            in_flight = self._in_flight
+        with self._metrics_lock:
+            self._metrics['attempts'] += 1
+            self._metrics['max_in_flight'] = max(self._metrics['max_in_flight'], in_flight)
+
+    def _release_slot(self, seconds: float):
+        with self._slots:
+            self._in_flight -= 1
+            self._slots.notify()
+        self._count('request_seconds', seconds)
+
+    def _succeeded(self, result: Any, estimated_tokens: int, usage: Optional[Callable[[Any], Optional[int]]]):
+        tokens = None
+        if usage is not None:
+            try:
+                tokens = usage(result)
+            except Exception:
+                tokens = None
+        if tokens is not None:
+            self.token_bucket.adjust(estimated_tokens - tokens)
+        tokens = estimated_tokens if tokens is None else tokens
+
+        now = time.monotonic()
+        with self._metrics_lock:
+            self._metrics['succeeded'] += 1
+            self._metrics['tokens'] += tokens
+            self._recent.append((now, tokens))
+            while self._recent and self._recent[0][0] < now - 60:
+                self._recent.popleft()
+
+    def _count(self, metric: str, amount: float = 1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get counters, last-minute throughput and the configured limits."""
+        now = time.monotonic()
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            recent = [tokens for finished, tokens in self._recent if finished >= now - 60]
+        with self._slots:
+            metrics['in_flight'] = self._in_flight
+            cooldown = max(0.0, self._cooldown_until - now)
+        attempts = metrics['attempts']
+        return {
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in metrics.items()},
+            'avg_request_seconds': round(metrics['request_seconds'] / attempts, 3) if attempts else 0.0,
+            'last_minute_requests': len(recent),
+            'last_minute_tokens': sum(recent),
+            'cooldown_seconds': round(cooldown, 3),
+            'limits': {
+                'requests_per_minute': None if self.request_bucket.unlimited else self.request_bucket.capacity,
+                'tokens_per_minute': None if self.token_bucket.unlimited else self.token_bucket.capacity,
+                'max_concurrency': self.max_concurrency,
+                'max_retries': self.max_retries,
+            }
+        }
+
+
+def _usage_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return None
+    total = getattr(usage, 'total_tokens', None)
+    if total is None:
+        total = (getattr(usage, 'prompt_tokens', 0) or 0) + (getattr(usage, 'completion_tokens', 0) or 0)
+    return total
+
+
+class _RateLimitedCompletions:
+    """Stand-in for ``client.chat.completions`` that sends every request through the limiter."""
+
+    def __init__(self, completions, limiter: OpenAIRateLimiter):
+        self._completions = completions
+        self._limiter = limiter
+
+    def create(self, **kwargs):
+        deadline_at = current_request_deadline()
+
+        def attempt():
+            if deadline_at is not None:
+                # Each retry only gets the time that is left
+                kwargs['timeout'] = max(0.001, deadline_at - time.monotonic())
+            return self._completions.create(**kwargs)
+
+        return self._limiter.call(
+            attempt,
+            estimated_tokens=estimate_tokens(kwargs.get('messages', []), kwargs.get('max_tokens')),
+            usage=_usage_tokens,
+            deadline_at=deadline_at
+        )
+
+
+class RateLimitedOpenAIClient:
+    """Wraps an OpenAI client so chat completions go through an OpenAIRateLimiter.
+
+    Construct the OpenAI client with ``max_retries=0`` so retries are
+    counted and paced here only.
+    """
+
+    def __init__(self, client, limiter: Optional[OpenAIRateLimiter] = None):
+        self._client = client
+        self.rate_limiter = limiter or get_rate_limiter()
+        self.chat = SimpleNamespace(completions=_RateLimitedCompletions(client.chat.completions, self.rate_limiter))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Prompt Token Budgeting for Jira-Figma Analyzer
+
+Counts the tokens of every context block that goes into a prompt and, when
+the blocks together exceed their budget, compacts the lowest-priority ones
+first: collapsing whitespace and duplicate lines, shortening long lists and
+lines, keeping only the head of a block with a note of what was left out,
+and finally dropping optional blocks. Every decision is logged so prompt
+sizes stay predictable on large Figma files.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_encodings: Dict[str, Any] = {}
+
+# Characters of CJK scripts, which tokenize at roughly one token each
+_CJK = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]')
+
+MIN_BLOCK_TOKENS = 40
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Count the tokens of a piece of text.
+
+    Uses tiktoken when installed and a character-based estimate otherwise.
+    """
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        if model not in _encodings:
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encodings[model] = tiktoken.get_encoding("cl100k_base")
+        return len(_encodings[model].encode(text, disallowed_special=()))
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def _collapse(text: str) -> str:
+    """Strip indentation runs and drop blank and repeated lines."""
+    lines, seen = [], set()
+    for line in text.splitlines():
+        # Keep one level of list indentation, collapse the rest
+        indent = '  ' if line.startswith('  ') and line.strip()[:1] in '-•0123456789' else ''
+        line = indent + re.sub(r'\s+', ' ', line).strip()
+        if not line.strip() or line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def _shorten_lists(text: str, max_items: int = 5, max_chars: int = 240) -> str:
+    """Cap comma-separated lists and overly long lines."""
+    lines = []
+    for line in text.splitlines():
+        head, sep, tail = line.partition(': ')
+        if sep and tail.count(', ') >= max_items:
+            items = tail.split(', ')
+            line = f"{head}: {', '.join(items[:max_items])} (+{len(items) - max_items} more)"
+        if len(line) > max_chars:
+            line = line[:max_chars - 3].rstrip() + '...'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def _keep_head(text: str, max_tokens: int, model: str) -> str:
+    """Keep as many leading lines as fit, noting how many were left out."""
+    lines = text.splitlines()
+    kept, used = [], 0
+    for line in lines:
+        cost = count_tokens(line, model) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    if len(kept) == len(lines):
+        return text
+    if not kept and lines:
+        # A single oversized line: cut it down by characters
+        kept = [lines[0][:max(max_tokens, 1) * 3].rstrip() + '...']
+    omitted = len(lines) - len(kept)
+    if omitted:
+        kept.append(f"[... {omitted} more line(s) omitted to fit the prompt budget]")
+    return '\n'.join(kept)
+
+
+@dataclass
+class ContextBlock:
+    """One named block of prompt context."""
+    name: str
+    text: str
+    priority: int = 1  # Higher numbers are compacted and dropped first
+    required: bool = False  # Required blocks are shortened but never dropped
+    original_tokens: int = 0
+    tokens: int = 0
+    actions: List[str] = field(default_factory=list)
+
+
+class PromptBudget:
+    """Fits context blocks into a token budget."""
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, model: str = "gpt-3.5-turbo"):
+        """Initialize the budget manager.
+
+        Args:
+            budgets: Token budget per prompt part (e.g. 'shared_prefix',
+                'design_questions'); parts without an entry use 'default'
+            model: Model whose tokenizer is used for counting
+        """
+        self.budgets = {'default': 1500, 'shared_prefix': 3000, **(budgets or {})}
+        self.model = model
+
+    def budget_for(self, part: str) -> int:
+        return self.budgets.get(part, self.budgets['default'])
+
+    def fit(self, part: str, blocks: List[ContextBlock]) -> Dict[str, Any]:
+        """Compact blocks in place until they fit the part's budget.
+
+        Returns a report of the budget, token counts and per-block actions.
+        """
+        budget = self.budget_for(part)
+        for block in blocks:
+            block.original_tokens = block.tokens = count_tokens(block.text, self.model)
+        original = self._total(blocks)
+
+        by_priority = sorted(blocks, key=lambda b: (-b.priority, b.required))
+        steps = [
+            ('collapsed', lambda b: _collapse(b.text)),
+            ('lists shortened', lambda b: _shorten_lists(b.text)),
+        ]
+        for action, compact in steps:
+            for block in by_priority:
+                if self._total(blocks) <= budget:
+                    break
+                self._apply(block, compact(block), action)
+
+        # Keep only the head of the least important optional blocks
+        for block in by_priority:
+            if block.required:
+                continue
+            overflow = self._total(blocks) - budget
+            if overflow <= 0:
+                break
+            target = max(MIN_BLOCK_TOKENS, block.tokens - overflow)
+            if target < block.tokens:
+                self._apply(block, _keep_head(block.text, target, self.model), 'truncated')
+
+        # Then drop optional blocks altogether
+        for block in by_priority:
+            if self._total(blocks) <= budget:
+                break
+            if not block.required and block.text:
+                self._apply(block, '', 'dropped')
+
+        # As a last resort cut down the required blocks, largest first
+        for block in sorted(blocks, key=lambda b: -b.tokens):
+            overflow = self._total(blocks) - budget
+            if overflow <= 0:
+                break
+            self._apply(block, _keep_head(block.text, max(1, block.tokens - overflow), self.model), 'truncated')
+
+        report = {
+            'part': part,
+            'budget': budget,
+            'original_tokens': original,
+            'tokens': self._total(blocks),
+            'blocks': {
+                block.name: {'original_tokens': block.original_tokens, 'tokens': block.tokens, 'actions': block.actions}
+                for block in blocks
+            }
+        }
+        self._log(report)
+        return report
+
+    def _apply(self, block: ContextBlock, text: str, action: str):
+        if text == block.text:
+            return
+        block.text = text
+        block.tokens = count_tokens(text, self.model)
+        block.actions.append(action)
+
+    @staticmethod
+    def _total(blocks: List[ContextBlock]) -> int:
+        # Blocks are joined with a blank line, roughly one token each
+        return sum(block.tokens + 1 for block in blocks if block.text)
+
+    @staticmethod
+    def _log(report: Dict[str, Any]):
+        changed = [
+            f"{name} {info['original_tokens']}→{info['tokens']} ({', '.join(info['actions'])})"
+            for name, info in report['blocks'].items() if info['actions']
+        ]
+        if changed:
+            print(f"📏 Prompt budget for {report['part']}: {report['original_tokens']}→{report['tokens']} tokens "
+                  f"(limit {report['budget']}); {'; '.join(changed)}")
@@ -12,6 +12,8 @@ import numpy as np
 from collections import defaultdict
 import os
 
+from keyword_engine import TICKET_KEYWORDS
+
 @dataclass
 class DeveloperProfile:
     """Developer profile with skills, workload, and performance data"""
@@ -335,42 +337,22 @@ class SmartRoutingSystem:
     
     def analyze_ticket_requirements(self, ticket_data: Dict) -> TicketRequirement:
         """Analyze ticket data to extract requirements"""
-        # Extract skills from ticket content
-        required_skills = []
         complexity_level = 5  # default
         estimated_effort = 3  # default story points
         
         # Analyze title and description for skill requirements
-        content = f"{ticket_data.get('title', '')} {ticket_data.get('description', '')}".lower()
-        
-        # Skill detection based on keywords
-        skill_keywords = {
-            "react_native": ["react native", "rn", "mobile app", "ios", "android"],
-            "javascript": ["javascript", "js", "frontend", "ui"],
-            "python": ["python", "backend", "api", "django", "flask"],
-            "figma": ["figma", "design", "mockup", "prototype"],
-            "japanese": ["japanese", "japan", "localization", "i18n"],
-            "testing": ["test", "testing", "qa", "quality"],
-            "api_integration": ["api", "integration", "endpoint", "rest"],
-            "database": ["database", "sql", "data", "storage"],
-            "ui_ux": ["ui", "ux", "user interface", "user experience"],
-            "accessibility": ["accessibility", "a11y", "wcag", "screen reader"]
-        }
+        content = f"{ticket_data.get('title', '')} {ticket_data.get('description', '')}"
+        flags = TICKET_KEYWORDS.classify(content)
         
-        for skill, keywords in skill_keywords.items():
-            if any(keyword in content for keyword in keywords):
-                required_skills.append(skill)
+        # Skill detection based on keywords (vocabularies live in keyword_engine)
+        skills = ["react_native", "javascript", "python", "figma", "japanese",
+                  "testing", "api_integration", "database", "ui_ux", "accessibility"]
+        required_skills = [skill for skill in skills if f"skill:{skill}" in flags]
         
         # Determine complexity based on content analysis
-        complexity_indicators = {
-            "high": ["complex", "difficult", "challenging", "advanced", "sophisticated"],
-            "medium": ["moderate", "standard", "typical", "normal"],
-            "low": ["simple", "easy", "basic", "straightforward"]
-        }
-        
-        for level, indicators in complexity_indicators.items():
-            if any(indicator in content for indicator in indicators):
-                complexity_level = {"high": 8, "medium": 5, "low": 2}[level]
+        for level, score in (("high", 8), ("medium", 5), ("low", 2)):
+            if f"complexity:{level}" in flags:
+                complexity_level = score
                 break
         
         # Estimate effort based on complexity and content length
@@ -383,22 +365,10 @@ class SmartRoutingSystem:
             estimated_effort = max(1, complexity_level - 1)
         
         # Determine ticket type
-        ticket_type = "task"
-        if "bug" in content or "fix" in content or "error" in content:
-            ticket_type = "bug"
-        elif "feature" in content or "new" in content or "add" in content:
-            ticket_type = "feature"
-        elif "improve" in content or "enhance" in content or "optimize" in content:
-            ticket_type = "enhancement"
+        ticket_type = next((t for t in ("bug", "feature", "enhancement") if f"type:{t}" in flags), "task")
         
         # Determine priority
-        priority = "medium"
-        if "urgent" in content or "critical" in content or "asap" in content:
-            priority = "critical"
-        elif "high" in content or "important" in content:
-            priority = "high"
-        elif "low" in content or "minor" in content:
-            priority = "low"
+        priority = next((p for p in ("critical", "high", "low") if f"priority:{p}" in flags), "medium")
         
         return TicketRequirement(
             ticket_id=ticket_data.get('ticket_id', 'unknown'),
@@ -410,13 +380,13 @@ class SmartRoutingSystem:
             priority=priority,
             ticket_type=ticket_type,
             deadline=ticket_data.get('deadline'),
-            figma_required="figma" in content,
-            backend_required=any(skill in content for skill in ["backend", "api", "database", "python"]),
-            frontend_required=any(skill in content for skill in ["frontend", "ui", "react", "javascript"]),
-            mobile_required=any(skill in content for skill in ["mobile", "react native", "ios", "android"]),
-            testing_required="test" in content or "testing" in content,
-            japanese_required="japanese" in content or "japan" in content,
-            design_skills_required=any(skill in content for skill in ["design", "figma", "ui", "ux"])
+            figma_required="needs:figma" in flags,
+            backend_required="needs:backend" in flags,
+            frontend_required="needs:frontend" in flags,
+            mobile_required="needs:mobile" in flags,
+            testing_required="needs:testing" in flags,
+            japanese_required="needs:japanese" in flags,
+            design_skills_required="needs:design" in flags
         )
     
     def calculate_skill_match_score(self, developer: DeveloperProfile, requirements: TicketRequirement) -> float:
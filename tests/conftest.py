@@ -0,0 +1,22 @@
+"""Shared fixtures for the unit tests. The modules live at the repository root."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_ticket():
+    """Build a JiraTicket-shaped object with defaults for the fields not given."""
+    def make(**fields):
+        defaults = {
+            'ticket_id': 'TEST-1', 'title': 'Title', 'description': 'Description',
+            'priority': None, 'labels': None, 'components': None,
+            'figma_links': None, 'pdf_design_paths': None, 'media_files': None,
+        }
+        return SimpleNamespace(**{**defaults, **fields})
+    return make
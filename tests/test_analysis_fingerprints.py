@@ -0,0 +1,103 @@
+from analysis_fingerprints import (
+    INPUTS, compute_fingerprints, held_tier_skips, required_inputs, reusable_sections, section_fingerprints
+)
+
+
+def test_required_inputs_follow_inputs_order():
+    assert required_inputs(['technical_considerations']) == ['content', 'figma', 'pdf']
+    assert required_inputs(['suggested_questions']) == INPUTS
+    assert required_inputs([]) == []
+
+
+def test_fingerprints_change_only_with_their_input(make_ticket):
+    before = compute_fingerprints(make_ticket(), lambda: 'kb')
+    after = compute_fingerprints(make_ticket(description='Changed'), lambda: 'kb')
+
+    assert set(before) == set(INPUTS)
+    assert before['content'] != after['content']
+    assert {name: value for name, value in before.items() if name != 'content'} == \
+        {name: value for name, value in after.items() if name != 'content'}
+
+
+def test_fingerprints_ignore_label_order(make_ticket):
+    first = compute_fingerprints(make_ticket(labels=['a', 'b']), lambda: 'kb', inputs=['metadata'])
+    second = compute_fingerprints(make_ticket(labels=['b', 'a']), lambda: 'kb', inputs=['metadata'])
+    assert first == second
+
+
+def test_skipped_inputs_are_never_computed(make_ticket):
+    def knowledge():
+        raise AssertionError("knowledge version looked up for an unused input")
+
+    assert list(compute_fingerprints(make_ticket(), knowledge, inputs=['content'])) == ['content']
+
+
+def test_knowledge_version_may_be_any_json_value(make_ticket):
+    version = {'figma_knowledge': [1, 2], 'confluence': [], 'feedback': [3, None]}
+    same = compute_fingerprints(make_ticket(), lambda: dict(version), inputs=['knowledge'])
+    assert compute_fingerprints(make_ticket(), lambda: version, inputs=['knowledge']) == same
+    assert compute_fingerprints(make_ticket(), lambda: {**version, 'feedback': [4, None]},
+                                inputs=['knowledge']) != same
+
+
+def test_figma_fingerprint_tracks_file_version(make_ticket):
+    ticket = make_ticket(figma_links=['https://www.figma.com/design/abc/Screen'])
+    v1 = compute_fingerprints(ticket, lambda: 'kb', figma_version=lambda link: '1', inputs=['figma'])
+    v2 = compute_fingerprints(ticket, lambda: 'kb', figma_version=lambda link: '2', inputs=['figma'])
+    assert v1 != v2
+
+
+def test_files_are_hashed_by_content(make_ticket, tmp_path):
+    pdf = tmp_path / 'design.pdf'
+    pdf.write_bytes(b'first')
+    ticket = make_ticket(pdf_design_paths=[str(pdf)])
+    first = compute_fingerprints(ticket, lambda: 'kb', inputs=['pdf'])
+    pdf.write_bytes(b'second')
+    assert compute_fingerprints(ticket, lambda: 'kb', inputs=['pdf']) != first
+
+
+def _previous(fingerprints, **sections):
+    return {
+        **sections,
+        'section_fingerprints': section_fingerprints(fingerprints, list(sections)),
+    }
+
+
+def test_unchanged_sections_are_reused(make_ticket):
+    fingerprints = compute_fingerprints(make_ticket(), lambda: 'kb')
+    previous = _previous(fingerprints, test_cases=['case'], risk_areas=['risk'])
+
+    assert reusable_sections(previous, fingerprints) == {'test_cases': ['case'], 'risk_areas': ['risk']}
+
+
+def test_sections_depending_on_a_changed_input_are_not_reused(make_ticket):
+    fingerprints = compute_fingerprints(make_ticket(), lambda: 'kb')
+    previous = _previous(fingerprints, test_cases=['case'], risk_areas=['risk'])
+
+    # risk_areas doesn't read the knowledge base; test_cases does
+    changed = {**fingerprints, 'knowledge': 'different'}
+    assert reusable_sections(previous, changed) == {'risk_areas': ['risk']}
+
+
+def test_degraded_and_stale_sections_are_not_reused(make_ticket):
+    fingerprints = compute_fingerprints(make_ticket(), lambda: 'kb')
+    previous = _previous(fingerprints, test_cases=['case'], risk_areas=['risk'])
+    previous['degraded_sections'] = ['test_cases']
+    # Recorded against an older dependency list
+    previous['section_fingerprints']['risk_areas'] = {'content': fingerprints['content']}
+
+    assert reusable_sections(previous, fingerprints) == {}
+
+
+def test_nothing_is_reused_without_a_previous_analysis():
+    assert reusable_sections(None, {}) == {}
+    assert reusable_sections({'test_cases': ['case']}, {}) == {}
+
+
+def test_tier_skips_are_held_only_while_their_inputs_are_unchanged(make_ticket):
+    fingerprints = compute_fingerprints(make_ticket(), lambda: 'kb')
+    recorded = section_fingerprints(fingerprints, ['design_questions'])['design_questions']
+    previous = {'tier_skipped_sections': {'design_questions': {'tier': 'light', 'fingerprints': recorded}}}
+    assert held_tier_skips(previous, fingerprints) == {'design_questions': 'light'}
+    assert held_tier_skips(previous, compute_fingerprints(make_ticket(), lambda: 'new kb')) == {}
+    assert held_tier_skips({}, fingerprints) == {}
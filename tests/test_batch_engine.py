@@ -0,0 +1,101 @@
+import json
+
+from batch_engine import BatchCheckpoint, BatchEngine, BatchItem, ticket_key
+
+
+class StubAnalyzer:
+    """Analyzer double that fails the tickets whose key is in ``failing``."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.analyzed = []
+
+    def parse_jira_ticket(self, ticket_data):
+        return ticket_data
+
+    def analyze_ticket_content(self, ticket, sections=None):
+        self.analyzed.append(ticket['key'])
+        if ticket['key'] in self.failing:
+            raise RuntimeError("boom")
+        return {'key': ticket['key']}
+
+
+def _ticket_files(directory, keys):
+    paths = []
+    for key in keys:
+        path = directory / f"{key}.json"
+        path.write_text(json.dumps({'key': key, 'title': key}))
+        paths.append(str(path))
+    return paths
+
+
+def test_ticket_key_prefers_the_jira_key():
+    assert ticket_key('a.json', {'key': ' PROJ-1 '}) == 'PROJ-1'
+    assert ticket_key('a.json', {}) == 'a.json'
+    assert ticket_key('a.json', ['not', 'a', 'ticket']) == 'a.json'
+
+
+def test_checkpoint_resumes_completed_tickets_only(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    checkpoint = BatchCheckpoint(str(path))
+    checkpoint.record(BatchItem('a.json', 'A-1', 'ok'))
+    checkpoint.record(BatchItem('b.json', 'A-2', 'failed', error='boom'))
+    checkpoint.close()
+
+    resumed = BatchCheckpoint(str(path))
+    assert resumed.is_done('A-1')
+    assert not resumed.is_done('A-2')
+    resumed.close()
+
+
+def test_checkpoint_forgets_a_ticket_that_later_failed(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    checkpoint = BatchCheckpoint(str(path))
+    checkpoint.record(BatchItem('a.json', 'A-1', 'ok'))
+    checkpoint.record(BatchItem('a.json', 'A-1', 'failed'))
+    checkpoint.close()
+
+    resumed = BatchCheckpoint(str(path))
+    assert resumed.completed == set()
+    resumed.close()
+
+
+def test_checkpoint_ignores_a_partial_last_line(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    path.write_text(json.dumps({'ticket_id': 'A-1', 'status': 'ok'}) + '\n{"ticket_id": "A-2", "sta')
+    checkpoint = BatchCheckpoint(str(path))
+    assert checkpoint.completed == {'A-1'}
+    checkpoint.close()
+
+
+def test_checkpoint_without_resume_starts_over(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    path.write_text(json.dumps({'ticket_id': 'A-1', 'status': 'ok'}) + '\n')
+    checkpoint = BatchCheckpoint(str(path), resume=False)
+    assert checkpoint.completed == set()
+    checkpoint.close()
+
+
+def test_rerun_skips_completed_and_retries_failed_tickets(tmp_path):
+    paths = _ticket_files(tmp_path, ['A-1', 'A-2', 'A-3'])
+    checkpoint = str(tmp_path / 'checkpoint.jsonl')
+
+    first = StubAnalyzer(failing={'A-2'})
+    statuses = {item.ticket_id: item.status
+                for item in BatchEngine(workers=0, checkpoint_path=checkpoint, analyzer=first).run(paths)}
+    assert statuses == {'A-1': 'ok', 'A-2': 'failed', 'A-3': 'ok'}
+
+    second = StubAnalyzer()
+    statuses = {item.ticket_id: item.status
+                for item in BatchEngine(workers=0, checkpoint_path=checkpoint, analyzer=second).run(paths)}
+    assert statuses == {'A-1': 'skipped', 'A-2': 'ok', 'A-3': 'skipped'}
+    assert second.analyzed == ['A-2']
+
+
+def test_unreadable_ticket_file_fails_without_stopping_the_batch(tmp_path):
+    paths = _ticket_files(tmp_path, ['A-1'])
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{not json')
+
+    items = list(BatchEngine(workers=0, analyzer=StubAnalyzer()).run([str(broken)] + paths))
+    assert [(item.ticket_id, item.status) for item in items] == [('broken.json', 'failed'), ('A-1', 'ok')]
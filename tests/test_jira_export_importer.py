@@ -0,0 +1,92 @@
+import io
+import json
+
+import pytest
+
+from jira_export_importer import iter_csv, iter_export, iter_json_array, iter_xml
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1 << 20])
+def test_json_array_elements_survive_any_chunk_boundary(chunk_size):
+    items = [1, 23, 456, -1.5e3, True, None, "a, b]", {"key": "PROJ-1", "labels": ["x"]}, [1, [2]]]
+    assert list(iter_json_array(io.StringIO(json.dumps(items)), chunk_size)) == items
+
+
+def test_numbers_cut_at_the_chunk_end_are_read_whole():
+    assert list(iter_json_array(io.StringIO('[1, 23, 456]'), chunk_size=2)) == [1, 23, 456]
+
+
+@pytest.mark.parametrize('chunk_size', [4, 1 << 20])
+def test_json_issues_are_read_from_a_search_response(chunk_size):
+    document = '{"startAt": 0, "total": 2, "issues": [{"key": "A-1"}, {"key": "A-2"}]}'
+    assert [issue['key'] for issue in iter_json_array(io.StringIO(document), chunk_size)] == ['A-1', 'A-2']
+
+
+def test_empty_json_array_yields_nothing():
+    assert list(iter_json_array(io.StringIO(' [ ] '))) == []
+
+
+@pytest.mark.parametrize('document', ['{"total": 0}', '"text"', '[1, 2', '[{"key": "A-1"'])
+def test_malformed_json_is_rejected(document):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(document), chunk_size=4))
+
+
+def test_csv_merges_repeated_columns():
+    export = (
+        'Issue key,Summary,Labels,Labels,Comment,Unknown\n'
+        'PROJ-1,Login,auth,,"2024-01-02 10:00;abc123;Looks good",ignored\n'
+        '\n'
+        'PROJ-2,Signup,,,,\n'
+    )
+    tickets = list(iter_csv(io.StringIO(export)))
+
+    assert [ticket['key'] for ticket in tickets] == ['PROJ-1', 'PROJ-2']
+    assert tickets[0]['labels'] == ['auth']
+    assert tickets[0]['comments'] == [{'created': '2024-01-02 10:00', 'author': 'abc123', 'body': 'Looks good'}]
+    assert 'Unknown' not in tickets[0]
+    assert tickets[1]['labels'] == [] and tickets[1]['comments'] == []
+
+
+def test_csv_without_a_header_yields_nothing():
+    assert list(iter_csv(io.StringIO(''))) == []
+
+
+XML_EXPORT = b"""<?xml version="1.0"?>
+<rss><channel>
+  <title>Export</title>
+  <item>
+    <title>[PROJ-1] Login page</title>
+    <key>PROJ-1</key>
+    <description>&lt;p&gt;First &amp;amp; second&lt;/p&gt;</description>
+    <labels><label>auth</label><label> </label></labels>
+    <component>Web</component>
+    <comments><comment author="ann" created="today">&lt;b&gt;Done&lt;/b&gt;</comment></comments>
+  </item>
+  <item>
+    <title>[PROJ-2] Signup</title>
+    <summary>Signup form</summary>
+    <key>PROJ-2</key>
+  </item>
+</channel></rss>
+"""
+
+
+def test_xml_items_become_flat_tickets():
+    first, second = iter_xml(io.BytesIO(XML_EXPORT))
+
+    assert first['key'] == 'PROJ-1'
+    assert first['summary'] == 'Login page'
+    assert first['description'] == 'First & second'
+    assert first['labels'] == ['auth']
+    assert first['components'] == ['Web']
+    assert first['comments'] == [{'author': 'ann', 'created': 'today', 'body': 'Done'}]
+    assert second['summary'] == 'Signup form'
+
+
+def test_export_format_is_detected_from_content(tmp_path):
+    path = tmp_path / 'export.txt'
+    path.write_text('{"key": "A-1", "fields": {"summary": "One"}}\n{"key": "A-2"}\n')
+    tickets = list(iter_export(str(path)))
+    assert [ticket['key'] for ticket in tickets] == ['A-1', 'A-2']
+    assert tickets[0]['summary'] == 'One'
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from analysis_fingerprints import compute_fingerprints, reusable_sections, section_fingerprints
+from feedback_system import FeedbackSystem
+from jira_figma_analyzer import (
+    ANALYSIS_SECTIONS, AnalysisFinished, JiraFigmaAnalyzer, JiraTicket, SectionStarted, TicketContext
+)
+from ticket_storage_system import TicketStorageSystem
+
+resolve_sections = JiraFigmaAnalyzer.resolve_sections
+ALL_SECTIONS = [section for section, _ in ANALYSIS_SECTIONS]
+
+
+def test_none_means_every_section():
+    assert resolve_sections(None) is None
+
+
+def test_sections_come_back_in_pipeline_order():
+    assert resolve_sections(['test_cases', 'suggested_questions', 'test_cases']) == \
+        ['suggested_questions', 'test_cases']
+
+
+def test_comma_separated_string_is_accepted():
+    assert resolve_sections(' risk_areas , test_cases,') == ['risk_areas', 'test_cases']
+    assert resolve_sections(','.join(reversed(ALL_SECTIONS))) == ALL_SECTIONS
+
+
+def test_unknown_section_is_rejected():
+    with pytest.raises(ValueError, match="Unknown analysis section.*bogus"):
+        resolve_sections(['test_cases', 'bogus'])
+
+
+@pytest.mark.parametrize('sections', [[], '', ' , '])
+def test_empty_selection_is_rejected(sections):
+    with pytest.raises(ValueError, match="No analysis sections requested"):
+        resolve_sections(sections)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """Analyzer with no config, storing tickets under tmp_path and without feedback."""
+    analyzer = JiraFigmaAnalyzer(str(tmp_path / 'config.json'))
+    analyzer.ticket_storage = TicketStorageSystem(str(tmp_path / 'tickets'))
+    analyzer.feedback_system = None
+    analyzer.feedback_learning = None
+    yield analyzer
+    analyzer.ticket_storage.db.close()
+
+
+def _knowledge_context(analyzer, ticket):
+    """The ticket's prompt context with the knowledge lookups the pipeline does."""
+    analysis = analyzer._analyze_content(ticket)
+    analysis = analyzer._enhance_analysis_with_ticket_knowledge(
+        analysis, analyzer._get_relevant_ticket_knowledge(ticket))
+    analysis = analyzer._enhance_analysis_with_figma_knowledge(
+        analysis, analyzer._get_figma_design_knowledge(ticket), ticket)
+    return TicketContext(analyzer, ticket, analysis)
+
+
+def test_storing_another_ticket_keeps_a_previous_analysis_fresh(analyzer):
+    analyzer.ticket_storage.store_ticket({
+        'id': 'PROJ-2', 'title': 'Login form', 'description': 'Figma login design for the signup flow',
+        'analysis': {'suggested_questions': ['Q1'], 'figma_designs': [{'design_name': 'Login'}]},
+    })
+    ticket = JiraTicket('PROJ-1', 'Login page', 'Figma login design for the login flow',
+                        labels=[], components=[], figma_links=[], pdf_design_paths=[], media_files=[])
+    before = _knowledge_context(analyzer, ticket)
+    fingerprints = compute_fingerprints(ticket, lambda: analyzer._get_knowledge_version(before))
+    previous = {
+        'test_cases': ['case'], 'design_questions': ['question'],
+        'section_fingerprints': section_fingerprints(fingerprints, ['test_cases', 'design_questions']),
+    }
+
+    analyzer.ticket_storage.store_ticket({
+        'id': 'PROJ-3', 'title': 'Login errors', 'description': 'Figma login design for error states',
+        'analysis': {'suggested_questions': ['Q2'], 'figma_designs': [{'design_name': 'Errors'}]},
+    })
+    after = _knowledge_context(analyzer, ticket)
+
+    # The prompts see the new ticket, but the sections that used the knowledge base still hold
+    assert after.figma_knowledge_block != before.figma_knowledge_block
+    fingerprints = compute_fingerprints(ticket, lambda: analyzer._get_knowledge_version(after))
+    assert reusable_sections(previous, fingerprints) == {'test_cases': ['case'], 'design_questions': ['question']}
+
+
+def test_recorded_feedback_changes_the_knowledge_version(analyzer, tmp_path):
+    analyzer.feedback_system = FeedbackSystem(str(tmp_path / 'feedback'))
+    analyzer.feedback_learning = object()
+    context = TicketContext(analyzer, JiraTicket('PROJ-1', 'Login page', ''), {})
+
+    before = analyzer._get_knowledge_version(context)
+    analyzer.feedback_system.collect_feedback('PROJ-9', 'questions', 2, comment='Too generic')
+    assert analyzer._get_knowledge_version(context) != before
+
+
+def test_deadline_holds_with_a_slow_section_and_a_slow_consumer(analyzer, monkeypatch):
+    analyzer.openai_client = None
+    release = threading.Event()
+
+    def stuck_generator(ticket, analysis):
+        release.wait(10)
+        return ['late question']
+
+    monkeypatch.setattr(analyzer, '_generate_questions', stuck_generator)
+    ticket = JiraTicket('PROJ-1', 'Login page', 'Users sign in with email',
+                        labels=[], components=[], figma_links=[], pdf_design_paths=[], media_files=[])
+    deadline = 0.5
+    try:
+        started = time.monotonic()
+        result = None
+        for event in analyzer.iter_analysis(ticket, deadline=deadline):
+            if isinstance(event, SectionStarted):
+                time.sleep(0.05)  # A consumer streaming events to a client
+            elif isinstance(event, AnalysisFinished):
+                result = event.result
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert elapsed < deadline + 0.2
+    assert 'suggested_questions' in result.degraded_sections
+    assert result.suggested_questions and result.suggested_questions != ['late question']
+
+
+def test_light_ticket_reanalysis_reuses_everything(analyzer):
+    ticket = JiraTicket('PROJ-1', 'Fix typo', 'Rename the save button',
+                        labels=[], components=[], figma_links=[], pdf_design_paths=[], media_files=[])
+    first = analyzer.reanalyze_ticket(ticket, report='')
+    assert first.model_tier['tier'] == 'light'
+    assert set(first.tier_skipped_sections) == {'design_questions', 'business_questions'}
+    assert first.tier_skipped_sections['design_questions']['tier'] == 'light'
+
+    events = list(analyzer.iter_reanalysis(ticket, report=''))
+    assert not [event for event in events if isinstance(event, SectionStarted)]
+    second = events[-1].result
+    assert set(second.reused_sections) == set(ALL_SECTIONS) - set(first.tier_skipped_sections)
+    assert second.tier_skipped_sections == first.tier_skipped_sections
+
+    # Once the ticket outgrows the light tier the skipped sections are generated
+    ticket.description = ' '.join(['word'] * 450)
+    third = analyzer.reanalyze_ticket(ticket, report='')
+    assert third.model_tier['tier'] == 'standard'
+    assert third.tier_skipped_sections == {}
+    assert third.design_questions
@@ -0,0 +1,57 @@
+import pytest
+
+from keyword_engine import TICKET_KEYWORDS, KeywordEngine
+
+
+@pytest.fixture
+def engine():
+    return KeywordEngine({
+        'mobile': ['mobile', 'react native', 'ios'],
+        'frontend': ['react', 'ui'],
+        'apps': ['native app'],
+        'user': ['user'],
+        'flow': ['user flow'],
+        'bug': ['error', 'crash'],
+    })
+
+
+def test_terms_match_case_insensitively_at_word_boundaries(engine):
+    assert engine.classify('iOS CRASH on launch') == {'mobile', 'bug'}
+    assert engine.classify('biosensor guide built') == frozenset()
+
+
+def test_plural_suffix_matches(engine):
+    assert engine.classify('Several errors and crashes') == {'bug'}
+    assert engine.classify('errorless') == frozenset()
+
+
+def test_overlapping_terms_are_all_found(engine):
+    # 'react native' and 'native app' overlap; 'react' is a word-prefix of 'react native'
+    assert engine.classify('Rewrite the React Native app') == {'mobile', 'frontend', 'apps'}
+    assert engine.matched_terms('Rewrite the React Native app') == ['react native', 'native app']
+
+
+def test_longer_term_raises_the_flags_of_its_word_prefixes(engine):
+    assert engine.classify('Update the user flow') == {'user', 'flow'}
+    assert engine.classify('username field') == frozenset()
+
+
+def test_multi_word_term_needs_every_word(engine):
+    assert engine.classify('react to native events') == {'frontend'}
+
+
+def test_terms_with_punctuation_match_literally():
+    engine = KeywordEngine({'backend': ['back-end', 'c++']})
+    assert engine.classify('Back-end and C++ work') == {'backend'}
+    assert engine.classify('back end') == frozenset()
+
+
+def test_repeated_text_is_served_from_the_cache(engine):
+    engine.classify('iOS crash')
+    engine.classify('iOS crash')
+    assert engine.classify.cache_info().hits == 1
+
+
+def test_shared_engine_flags_ticket_content():
+    flags = TICKET_KEYWORDS.classify('Fix login errors in the React Native app ASAP')
+    assert {'type:bug', 'error_handling', 'mobile', 'skill:react_native', 'priority:critical'} <= flags
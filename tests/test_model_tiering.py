@@ -0,0 +1,55 @@
+from model_tiering import TierPolicy
+
+
+def _policy(**config):
+    return TierPolicy.from_config(config)
+
+
+def test_short_ticket_without_designs_gets_light_tier(make_ticket):
+    selection = _policy().select(make_ticket(title='Fix typo', description='Button label'), {})
+    assert selection.tier.name == 'light'
+    assert selection.score == 0
+    assert not selection.tier.includes('design_questions')
+
+
+def test_one_design_source_is_never_light(make_ticket):
+    ticket = make_ticket(figma_links=['https://www.figma.com/design/abc/Screen'])
+    selection = _policy().select(ticket, {})
+    assert selection.tier.name == 'standard'
+    assert "1 design source(s)" in selection.reasons
+
+
+def test_two_design_sources_are_complex(make_ticket):
+    ticket = make_ticket(figma_links=['https://www.figma.com/design/abc/A'], pdf_design_paths=['design.pdf'])
+    assert _policy().select(ticket, {}).tier.name == 'complex'
+
+
+def test_score_adds_indicators_length_and_priority(make_ticket):
+    ticket = make_ticket(description=' '.join(['word'] * 200))
+    analysis = {'complexity_indicators': ['auth', 'payments'], 'priority_level': 'High'}
+    selection = _policy().select(ticket, analysis)
+    assert selection.score == 2 + 1 + 1
+    assert selection.tier.name == 'standard'
+
+    assert _policy(tier_complex_min_score=4).select(ticket, analysis).tier.name == 'complex'
+
+
+def test_design_complexity_raises_the_score(make_ticket):
+    ticket = make_ticket(figma_links=['https://www.figma.com/design/abc/A'])
+    selection = _policy().select(ticket, {'figma_designs': [{'design_complexity': 8.0}, 'not a dict']})
+    assert selection.score == 1 + 2
+    assert "design complexity 8.0/10" in selection.reasons
+
+
+def test_disabled_policy_always_picks_standard(make_ticket):
+    selection = _policy(model_tiering=False).select(make_ticket(), {})
+    assert selection.tier.name == 'standard'
+    assert selection.reasons == ["tiering disabled"]
+
+
+def test_config_overrides_tier_fields():
+    policy = _policy(model_tiers={'light': {'model': 'tiny', 'token_scale': 0.5}})
+    assert policy.tiers['light'].model == 'tiny'
+    assert policy.tiers['light'].max_tokens(1000) == 500
+    assert policy.tiers['light'].max_tokens(10) == 64
+    assert policy.tiers['complex'].includes('design_questions')
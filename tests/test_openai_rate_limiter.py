@@ -0,0 +1,64 @@
+import pytest
+
+import openai_rate_limiter
+from openai_rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; advance it by adding to now[0]."""
+    now = [1000.0]
+    monkeypatch.setattr(openai_rate_limiter.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_full_bucket_serves_without_waiting(clock):
+    bucket = TokenBucket(60)
+    assert bucket.reserve(60) == 0.0
+
+
+def test_overdraft_waits_for_the_refill(clock):
+    bucket = TokenBucket(60)  # one token per second
+    bucket.reserve(60)
+    assert bucket.reserve(3) == pytest.approx(3.0)
+    # The reservation is already taken, so the next caller queues behind it
+    assert bucket.reserve(1) == pytest.approx(4.0)
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(60)
+    bucket.reserve(60)
+    clock[0] += 10
+    assert bucket.reserve(10) == 0.0
+    clock[0] += 3600
+    bucket._refill()
+    assert bucket.level == 60
+
+
+def test_request_bigger_than_the_bucket_still_fits(clock):
+    bucket = TokenBucket(60)
+    assert bucket.reserve(1000) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_adjust_returns_and_charges_tokens(clock):
+    bucket = TokenBucket(60)
+    bucket.reserve(60)
+    bucket.adjust(30)
+    assert bucket.reserve(30) == 0.0
+    bucket.adjust(-6)
+    assert bucket.reserve(1) == pytest.approx(7.0)
+
+
+def test_unlimited_bucket_never_waits(clock):
+    bucket = TokenBucket(None)
+    assert bucket.reserve(10 ** 9) == 0.0
+    bucket.configure(0)
+    assert bucket.unlimited
+
+
+def test_configure_changes_the_rate(clock):
+    bucket = TokenBucket(60)
+    bucket.reserve(60)
+    bucket.configure(120)
+    assert bucket.reserve(2) == pytest.approx(1.0)
@@ -0,0 +1,218 @@
+import json
+
+import pytest
+
+from ticket_storage_system import (
+    SEARCH_COLUMNS, TicketStorageSystem, build_search_query, decode_page_cursor, encode_page_cursor
+)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = TicketStorageSystem(str(tmp_path))
+    yield storage
+    storage.db.close()
+
+
+def _store(storage, ticket_id, title, description='', **analysis):
+    return storage.store_ticket({'id': ticket_id, 'title': title, 'description': description, 'analysis': analysis})
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('login page', '"login" "page"'),
+    ('"sign up" flow', '"sign up" "flow"'),
+    ('err*', '"err"*'),
+    ('"sign up"*', '"sign up"*'),
+    ('title:crash desc:ios', 'title : "crash" description : "ios"'),
+    ('questions:"two words"', 'questions : "two words"'),
+    ('login OR signup', '"login" OR "signup"'),
+    ('OR a OR OR b OR', '"a" OR "b"'),
+    # Not a search field, so searched as typed
+    ('https://figma.com/file', '"https://figma.com/file"'),
+    # Quotes inside a word can't break out of the FTS string
+    ('say"hi', '"say""hi"'),
+])
+def test_build_search_query(query, expected):
+    assert build_search_query(query) == expected
+
+
+@pytest.mark.parametrize('query', ['', '   ', 'OR', '** !!', None])
+def test_build_search_query_without_terms(query):
+    assert build_search_query(query) is None
+
+
+def test_build_search_query_scopes_every_term_to_fields():
+    assert build_search_query('a b', ['title']) == '{title} : ("a" "b")'
+    assert build_search_query('a', ['title', 'desc', 'unknown']) == '{description title} : ("a")'
+
+
+def test_search_ranks_title_matches_first(storage):
+    _store(storage, 'PROJ-1', 'Settings screen', 'The checkout button is misaligned')
+    _store(storage, 'PROJ-2', 'Checkout crash', 'App closes on pay')
+    _store(storage, 'PROJ-3', 'Profile page', 'Unrelated')
+
+    results = storage.search_tickets('checkout')
+    assert [result['id'] for result in results] == ['PROJ-2', 'PROJ-1']
+    assert results[0]['title_highlight'] == '**Checkout** crash'
+
+
+def test_search_matches_prefixes_fields_and_child_rows(storage):
+    _store(storage, 'PROJ-1', 'Login page', suggested_questions=['Should we support passkeys?'])
+    _store(storage, 'PROJ-2', 'Signup page', 'Mentions login in the description')
+
+    assert {result['id'] for result in storage.search_tickets('log*')} == {'PROJ-1', 'PROJ-2'}
+    assert [result['id'] for result in storage.search_tickets('title:login')] == ['PROJ-1']
+    assert [result['id'] for result in storage.search_tickets('passkeys', fields=['questions'])] == ['PROJ-1']
+
+
+def test_search_with_only_syntax_returns_nothing(storage):
+    _store(storage, 'PROJ-1', 'Login page')
+    assert storage.search_tickets('"" OR *') == []
+
+
+def _assert_derived_state_consistent(storage):
+    """Counters, has_figma and the search index all agree with the base tables."""
+    with storage.db.read() as cursor:
+        cursor.execute('SELECT rowid, id, ticket_key, title, description, analysis_data, '
+                       'question_count, test_case_count, risk_count, has_figma FROM tickets')
+        tickets = cursor.fetchall()
+        for rowid, ticket_id, key, title, description, analysis_data, questions, tests, risks, has_figma in tickets:
+            analysis = json.loads(analysis_data)
+            cursor.execute('SELECT question_text FROM questions WHERE ticket_id = ? ORDER BY id', (ticket_id,))
+            question_texts = [row[0] for row in cursor.fetchall()]
+            cursor.execute('SELECT test_case_text FROM test_cases WHERE ticket_id = ? ORDER BY id', (ticket_id,))
+            test_texts = [row[0] for row in cursor.fetchall()]
+
+            assert (questions, tests, risks) == (
+                len(question_texts), len(test_texts), len(analysis.get('risk_areas', []))
+            )
+            text = f"{key} {title} {description}".lower()
+            assert has_figma == int('figma' in text or bool(analysis.get('figma_designs')))
+
+            cursor.execute(f"SELECT {', '.join(SEARCH_COLUMNS)} FROM tickets_fts WHERE rowid = ?", (rowid,))
+            indexed = cursor.fetchone()
+            assert indexed[:3] == (key, title, description)
+            assert sorted((indexed[3] or '').split('\n')) == sorted(question_texts or [''])
+            assert sorted((indexed[4] or '').split('\n')) == sorted(test_texts or [''])
+            assert (indexed[5] or '').split('\n') == (analysis.get('risk_areas') or [''])
+
+        cursor.execute('SELECT COUNT(*) FROM tickets_fts')
+        assert cursor.fetchone()[0] == len(tickets)
+        cursor.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('integrity-check')")
+
+
+def test_store_keeps_counters_and_index_in_sync(storage):
+    _store(storage, 'PROJ-1', 'Login page', 'See the Figma file',
+           suggested_questions=['Q1', 'Q2'], design_questions=['Q3'], test_cases=['T1'], risk_areas=['R1', 'R2'])
+    _store(storage, 'PROJ-2', 'Signup', figma_designs=[{'design_name': 'Signup'}])
+    _store(storage, 'PROJ-3', 'Settings')
+    _assert_derived_state_consistent(storage)
+
+    ticket = storage.search_tickets('login')[0]
+    assert (ticket['question_count'], ticket['test_case_count'], ticket['risk_count']) == (3, 1, 2)
+
+
+def test_restore_replaces_child_rows_and_reindexes(storage):
+    _store(storage, 'PROJ-1', 'Login page', 'Figma link inside',
+           suggested_questions=['Q1', 'Q2'], test_cases=['T1', 'T2'], risk_areas=['R1'])
+    _store(storage, 'PROJ-1', 'Login screen', 'No designs', suggested_questions=['Q9'])
+    _assert_derived_state_consistent(storage)
+
+    assert storage.search_tickets('screen')[0]['question_count'] == 1
+    assert storage.search_tickets('title:page') == []
+    assert storage.search_tickets('Q2') == []
+
+
+def test_delete_removes_ticket_from_index(storage):
+    _store(storage, 'PROJ-1', 'Login page', suggested_questions=['Q1'], test_cases=['T1'])
+    _store(storage, 'PROJ-2', 'Login form')
+
+    assert storage.delete_ticket('PROJ-1')
+    _assert_derived_state_consistent(storage)
+    assert [result['id'] for result in storage.search_tickets('login')] == ['PROJ-2']
+    assert not storage.delete_ticket('PROJ-1')
+
+
+def test_page_cursor_round_trips():
+    token = encode_page_cursor('2024-05-01T10:00:00.123456', 'PROJ-1/é')
+    assert '=' not in token and '/' not in token and '+' not in token
+    assert decode_page_cursor(token) == ('2024-05-01T10:00:00.123456', 'PROJ-1/é')
+
+
+@pytest.mark.parametrize('token', ['not a cursor', '!!!', encode_page_cursor('a', 'b')[:-3],
+                                   'WzEsIDJd',  # [1, 2]
+                                   'eyJhIjogMX0'])  # {"a": 1}
+def test_invalid_page_cursor_is_rejected(token):
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        decode_page_cursor(token)
+
+
+@pytest.fixture
+def dated_tickets(storage):
+    """Five tickets, two of them sharing a created_at so pages must break ties on id."""
+    dates = {'A-1': '2024-01-01T00:00:00', 'A-2': '2024-02-01T00:00:00', 'A-3': '2024-02-01T00:00:00',
+             'A-4': '2024-03-01T00:00:00', 'A-5': '2024-04-01T00:00:00'}
+    for ticket_id in dates:
+        _store(storage, ticket_id, f'Ticket {ticket_id}', 'figma design' if ticket_id in ('A-2', 'A-5') else '')
+    with storage.db.transaction() as cursor:
+        cursor.executemany('UPDATE tickets SET created_at = ? WHERE id = ?',
+                           [(created_at, ticket_id) for ticket_id, created_at in dates.items()])
+    return storage
+
+
+def _browse_all(storage, page_size, **filters):
+    pages, cursor = [], None
+    while True:
+        page = storage.browse_tickets(page_size=page_size, cursor=cursor, **filters)
+        pages.append([ticket['id'] for ticket in page['tickets']])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+
+def test_browse_pages_newest_first_without_gaps_or_repeats(dated_tickets):
+    assert _browse_all(dated_tickets, 2) == [['A-5', 'A-4'], ['A-3', 'A-2'], ['A-1']]
+    assert _browse_all(dated_tickets, 5) == [['A-5', 'A-4', 'A-3', 'A-2', 'A-1']]
+
+
+def test_browse_page_is_stable_when_newer_tickets_arrive(dated_tickets):
+    first = dated_tickets.browse_tickets(page_size=2)
+    _store(dated_tickets, 'A-6', 'Newest ticket')
+    second = dated_tickets.browse_tickets(page_size=2, cursor=first['next_cursor'])
+    assert [ticket['id'] for ticket in second['tickets']] == ['A-3', 'A-2']
+
+
+def test_browse_filters(dated_tickets):
+    assert _browse_all(dated_tickets, 1, has_figma=True) == [['A-5'], ['A-2']]
+    assert _browse_all(dated_tickets, 10, has_figma=False) == [['A-4', 'A-3', 'A-1']]
+    assert _browse_all(dated_tickets, 10, created_after='2024-02-01', created_before='2024-04-01') == \
+        [['A-4', 'A-3', 'A-2']]
+    assert _browse_all(dated_tickets, 10, query='design') == [['A-5', 'A-2']]
+
+
+def test_browse_rejects_a_bad_cursor(dated_tickets):
+    with pytest.raises(ValueError):
+        dated_tickets.browse_tickets(cursor='garbage')
+
+
+def _indexed_children(storage, ticket_id):
+    with storage.db.read() as cursor:
+        cursor.execute('SELECT questions, test_cases FROM tickets_fts '
+                       'WHERE rowid = (SELECT rowid FROM tickets WHERE id = ?)', (ticket_id,))
+        return cursor.fetchone()
+
+
+def test_restore_with_fewer_questions_reindexes_them(storage):
+    _store(storage, 'PROJ-1', 'Login page', suggested_questions=['Passkeys?', 'Remember me?', 'SSO?'],
+           test_cases=['Valid login', 'Locked account'])
+    _store(storage, 'PROJ-1', 'Login page', suggested_questions=['Biometrics?'], test_cases=['Valid login'])
+
+    assert _indexed_children(storage, 'PROJ-1') == ('Biometrics?', 'Valid login')
+    assert [result['id'] for result in storage.search_tickets('biometrics')] == ['PROJ-1']
+    assert storage.search_tickets('passkeys') == []
+
+
+def test_child_rows_have_no_index_triggers(storage):
+    with storage.db.read() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name IN ('questions', 'test_cases')")
+        assert not [name for (name,) in cursor.fetchall() if '_fts_' in name]
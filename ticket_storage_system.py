@@ -3,12 +3,182 @@
 Simple ticket storage system for the Jira-Figma Analyzer.
 """
 
+import base64
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import re
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Union
 import sqlite3
-import pickle
+
+from db_connection import get_connection_manager
+from knowledge_snapshot import get_snapshot
+
+# Words too common to say anything about how similar two tickets are
+SIMILARITY_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'will', 'should', 'have', 'has',
+    'are', 'was', 'were', 'can', 'not', 'but', 'all', 'any', 'when', 'what', 'which',
+    'into', 'their', 'there', 'them', 'they', 'been', 'also', 'more', 'user', 'users',
+    'need', 'needs', 'able', 'ticket', 'please', 'etc'
+}
+
+# Full-text index columns, and the names queries can scope a term to (e.g. "questions:login")
+SEARCH_COLUMNS = ['ticket_key', 'title', 'description', 'questions', 'test_cases', 'risks']
+SEARCH_FIELDS = {
+    'key': 'ticket_key', 'title': 'title', 'description': 'description', 'desc': 'description',
+    'questions': 'questions', 'question': 'questions', 'tests': 'test_cases', 'test_cases': 'test_cases',
+    'risks': 'risks', 'risk': 'risks'
+}
+# BM25 weight per column, in SEARCH_COLUMNS order; key and title hits rank highest
+SEARCH_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 1.0, 1.0)
+HIGHLIGHT_MARKERS = ('**', '**')
+_SEARCH_BM25 = f"bm25(tickets_fts, {', '.join(str(weight) for weight in SEARCH_WEIGHTS)})"
+# Prefix lengths indexed on their own, so short word* queries don't expand every matching term
+SEARCH_PREFIX_LENGTHS = '2 3'
+
+_QUERY_TOKEN = re.compile(r'(?:(\w+):)?(?:"([^"]*)"(\*?)|(\S+))')
+
+# Index row for a ticket: its own columns plus its questions, test cases and risk areas
+_SEARCH_ROW_VALUES = """
+    {t}.rowid, {t}.ticket_key, {t}.title, {t}.description,
+    (SELECT group_concat(question_text, char(10)) FROM questions WHERE ticket_id = {t}.id),
+    (SELECT group_concat(test_case_text, char(10)) FROM test_cases WHERE ticket_id = {t}.id),
+    CASE WHEN json_valid({t}.analysis_data)
+         THEN (SELECT group_concat(value, char(10)) FROM json_each({t}.analysis_data, '$.risk_areas')) END
+"""
+
+_SEARCH_TRIGGERS = [
+    f'''CREATE TRIGGER IF NOT EXISTS tickets_fts_insert AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES ({_SEARCH_ROW_VALUES.format(t='NEW')});
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS tickets_fts_update AFTER UPDATE OF ticket_key, title, description, analysis_data ON tickets BEGIN
+        DELETE FROM tickets_fts WHERE rowid = OLD.rowid;
+        INSERT INTO tickets_fts (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES ({_SEARCH_ROW_VALUES.format(t='NEW')});
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS tickets_fts_delete AFTER DELETE ON tickets BEGIN
+        DELETE FROM tickets_fts WHERE rowid = OLD.rowid;
+    END''',
+]
+# Per-row question and test case triggers of older databases. Each rewrote the whole
+# index row; store_ticket now writes a ticket's children before the ticket row instead.
+_OBSOLETE_SEARCH_TRIGGERS = [
+    f'{table}_fts_{event}' for table in ('questions', 'test_cases') for event in ('insert', 'delete')
+]
+
+# Ticket rows carry their question, test case and risk counts so listings need no per-row COUNT(*)
+COUNTER_COLUMNS = ['question_count', 'test_case_count', 'risk_count']
+# Columns computed from the rest of the ticket row by triggers
+DERIVED_COLUMNS = COUNTER_COLUMNS + ['has_figma']
+
+_RISK_COUNT = """
+    CASE WHEN json_valid({t}.analysis_data)
+         THEN COALESCE(json_array_length({t}.analysis_data, '$.risk_areas'), 0) ELSE 0 END
+"""
+
+_COUNTER_VALUES = f"""
+    question_count = (SELECT COUNT(*) FROM questions WHERE ticket_id = {{t}}.id),
+    test_case_count = (SELECT COUNT(*) FROM test_cases WHERE ticket_id = {{t}}.id),
+    risk_count = {_RISK_COUNT}
+"""
+
+# Same rule as the knowledge snapshot: Figma designs were analyzed, or the ticket mentions Figma
+_HAS_FIGMA = """
+    (instr(lower(coalesce({t}.ticket_key, '') || ' ' || coalesce({t}.title, '') || ' ' || coalesce({t}.description, '')),
+           'figma') > 0
+     OR CASE WHEN json_valid({t}.analysis_data)
+             THEN COALESCE(json_array_length({t}.analysis_data, '$.figma_designs'), 0) > 0 ELSE 0 END)
+"""
+
+_DERIVED_TRIGGERS = [
+    f'''CREATE TRIGGER IF NOT EXISTS tickets_counts_insert AFTER INSERT ON tickets BEGIN
+        UPDATE tickets SET {_COUNTER_VALUES.format(t='NEW')} WHERE rowid = NEW.rowid;
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS tickets_counts_update AFTER UPDATE OF analysis_data ON tickets BEGIN
+        UPDATE tickets SET risk_count = {_RISK_COUNT.format(t='NEW')} WHERE rowid = NEW.rowid;
+    END''',
+] + [
+    f'''CREATE TRIGGER IF NOT EXISTS {table}_counts_{event.lower()} AFTER {event} ON {table} BEGIN
+        UPDATE tickets SET {counter} = {counter} {step} WHERE id = {row}.ticket_id;
+    END'''
+    for table, counter in (('questions', 'question_count'), ('test_cases', 'test_case_count'))
+    for event, row, step in (('INSERT', 'NEW', '+ 1'), ('DELETE', 'OLD', '- 1'))
+] + [
+    f'''CREATE TRIGGER IF NOT EXISTS tickets_figma_{event.split()[0].lower()} AFTER {event} ON tickets BEGIN
+        UPDATE tickets SET has_figma = {_HAS_FIGMA.format(t='NEW')} WHERE rowid = NEW.rowid;
+    END'''
+    for event in ('INSERT', 'UPDATE OF ticket_key, title, description, analysis_data')
+]
+
+
+def build_search_query(query: str, fields: Optional[List[str]] = None) -> Optional[str]:
+    """Turn a user search into an FTS5 MATCH expression.
+    
+    Words must all match (any order); ``"quoted text"`` matches a phrase,
+    a trailing ``*`` matches a prefix, ``field:term`` scopes a term to one
+    of SEARCH_FIELDS and ``OR`` between terms matches either. Everything
+    else is quoted, so user input can't produce an FTS syntax error.
+    
+    Args:
+        query: Search text
+        fields: Restrict every term to these SEARCH_FIELDS names
+    """
+    clauses = []
+    for match in _QUERY_TOKEN.finditer(query or ''):
+        field, phrase, phrase_prefix, word = match.groups()
+        column = SEARCH_FIELDS.get(field.lower()) if field else None
+        if field and not column:
+            # Not a field name (e.g. a URL); search the text as typed
+            word = match.group(0)
+            phrase = None
+        if word == 'OR' and not field:
+            if clauses and clauses[-1] != 'OR':
+                clauses.append('OR')
+            continue
+        
+        text = phrase if phrase is not None else word
+        prefix = bool(phrase_prefix) or (phrase is None and text.endswith('*'))
+        text = text.rstrip('*')
+        if not re.search(r'\w', text):
+            continue
+        term = '"' + text.replace('"', '""') + '"' + ('*' if prefix else '')
+        clauses.append(f"{column} : {term}" if column else term)
+    
+    while clauses and clauses[-1] == 'OR':
+        clauses.pop()
+    if not clauses:
+        return None
+    expression = ' '.join(clauses)
+    
+    columns = sorted({SEARCH_FIELDS[f] for f in fields or [] if f in SEARCH_FIELDS})
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+
+def encode_page_cursor(created_at: str, ticket_id: str) -> str:
+    """Continuation token for the page after the ticket with this (created_at, id)."""
+    raw = json.dumps([created_at, ticket_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(token: str) -> tuple:
+    """Get the (created_at, id) a continuation token points after; ValueError if it isn't one."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, ticket_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page cursor: {token!r}") from e
+    if not isinstance(created_at, str) or not isinstance(ticket_id, str):
+        raise ValueError(f"Invalid page cursor: {token!r}")
+    return created_at, ticket_id
+
+
+def _date_bound(value: Union[str, date, datetime, None]) -> Optional[str]:
+    """ISO form of a date filter, comparable with the stored created_at strings."""
+    if value is None or value == '':
+        return None
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
 
 class TicketStorageSystem:
     """Simple storage system for tickets and analysis results."""
@@ -16,252 +186,278 @@ class TicketStorageSystem:
     def __init__(self, storage_dir: str = "ticket_storage"):
         self.storage_dir = storage_dir
         self.db_path = os.path.join(storage_dir, "database", "tickets.db")
-        self.index_path = os.path.join(storage_dir, "database", "search_index.pkl")
+        self.snapshot_path = os.path.join(storage_dir, "database", "figma_knowledge_snapshot.json")
         
         # Create directories if they don't exist
         os.makedirs(os.path.join(storage_dir, "database"), exist_ok=True)
         os.makedirs(os.path.join(storage_dir, "files"), exist_ok=True)
         
-        # Initialize database
+        # Initialize database; connections are per thread and shared by every instance in this process
+        self.db = get_connection_manager(self.db_path)
         self._init_database()
         
-        # Initialize search index
-        self.search_index = self._load_search_index()
+        # The full-text index lives in the database now; the old pickled copy is unused
+        self._remove_legacy_search_index()
+        
+        # Aggregated knowledge base, shared by every instance in this process
+        self.knowledge_snapshot = get_snapshot(self.snapshot_path)
     
     def _init_database(self):
         """Initialize SQLite database for ticket storage."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tickets table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tickets (
-                id TEXT PRIMARY KEY,
-                ticket_key TEXT,
-                title TEXT,
-                description TEXT,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP,
-                analysis_data TEXT
-            )
-        ''')
-        
-        # Create questions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ticket_id TEXT,
-                question_text TEXT,
-                question_type TEXT,
-                FOREIGN KEY (ticket_id) REFERENCES tickets (id)
-            )
-        ''')
-        
-        # Create test_cases table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS test_cases (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ticket_id TEXT,
-                test_case_text TEXT,
-                category TEXT,
-                FOREIGN KEY (ticket_id) REFERENCES tickets (id)
-            )
-        ''')
+        # One write transaction, so processes starting together don't both create and backfill the index
+        with self.db.transaction() as cursor:
+            # Create tickets table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tickets (
+                    id TEXT PRIMARY KEY,
+                    ticket_key TEXT,
+                    title TEXT,
+                    description TEXT,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    analysis_data TEXT,
+                    question_count INTEGER NOT NULL DEFAULT 0,
+                    test_case_count INTEGER NOT NULL DEFAULT 0,
+                    risk_count INTEGER NOT NULL DEFAULT 0,
+                    has_figma INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+        
+            # Create questions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS questions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticket_id TEXT,
+                    question_text TEXT,
+                    question_type TEXT,
+                    FOREIGN KEY (ticket_id) REFERENCES tickets (id)
+                )
+            ''')
+        
+            # Create test_cases table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS test_cases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticket_id TEXT,
+                    test_case_text TEXT,
+                    category TEXT,
+                    FOREIGN KEY (ticket_id) REFERENCES tickets (id)
+                )
+            ''')
         
 
-        # Migrate existing databases to new schema
-        try:
-            # Check if old columns exist and add new ones if needed
-            cursor.execute("PRAGMA table_info(questions)")
-            columns = [column[1] for column in cursor.fetchall()]
+            # Migrate existing databases to new schema
+            try:
+                # Check if old columns exist and add new ones if needed
+                cursor.execute("PRAGMA table_info(questions)")
+                columns = [column[1] for column in cursor.fetchall()]
             
-            if 'question_text' not in columns:
-                cursor.execute('ALTER TABLE questions ADD COLUMN question_text TEXT')
-                print("✅ Added question_text column to questions table")
+                if 'question_text' not in columns:
+                    cursor.execute('ALTER TABLE questions ADD COLUMN question_text TEXT')
+                    print("✅ Added question_text column to questions table")
             
-            if 'question_type' not in columns:
-                cursor.execute('ALTER TABLE questions ADD COLUMN question_type TEXT')
-                print("✅ Added question_type column to questions table")
+                if 'question_type' not in columns:
+                    cursor.execute('ALTER TABLE questions ADD COLUMN question_type TEXT')
+                    print("✅ Added question_type column to questions table")
             
-            if 'question' in columns and 'question_text' in columns:
-                # Migrate data from question to question_text
-                cursor.execute('UPDATE questions SET question_text = question WHERE question_text IS NULL')
-                print("✅ Migrated question data to question_text")
+                if 'question' in columns and 'question_text' in columns:
+                    # Migrate data from question to question_text
+                    cursor.execute('UPDATE questions SET question_text = question WHERE question_text IS NULL')
+                    print("✅ Migrated question data to question_text")
             
-            # Check test_cases table
-            cursor.execute("PRAGMA table_info(test_cases)")
-            test_columns = [column[1] for column in cursor.fetchall()]
+                # Check test_cases table
+                cursor.execute("PRAGMA table_info(test_cases)")
+                test_columns = [column[1] for column in cursor.fetchall()]
             
-            if 'test_case_text' not in test_columns:
-                cursor.execute('ALTER TABLE test_cases ADD COLUMN test_case_text TEXT')
-                print("✅ Added test_case_text column to test_cases table")
+                if 'test_case_text' not in test_columns:
+                    cursor.execute('ALTER TABLE test_cases ADD COLUMN test_case_text TEXT')
+                    print("✅ Added test_case_text column to test_cases table")
             
-            if 'test_case' in test_columns and 'test_case_text' in test_columns:
-                # Migrate data from test_case to test_case_text
-                cursor.execute('UPDATE test_cases SET test_case_text = test_case WHERE test_case_text IS NULL')
-                print("✅ Migrated test_case data to test_case_text")
+                if 'test_case' in test_columns and 'test_case_text' in test_columns:
+                    # Migrate data from test_case to test_case_text
+                    cursor.execute('UPDATE test_cases SET test_case_text = test_case WHERE test_case_text IS NULL')
+                    print("✅ Migrated test_case data to test_case_text")
                 
-        except Exception as e:
-            print(f"⚠️ Migration warning: {e}")
-            # Continue anyway, tables will be created with correct schema
-        
-        conn.commit()
-        conn.close()
+            except Exception as e:
+                print(f"⚠️ Migration warning: {e}")
+                # Continue anyway, tables will be created with correct schema
+        
+            # The full-text and counter triggers look up a ticket's questions and test cases whenever it is stored
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_ticket_id ON questions (ticket_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_test_cases_ticket_id ON test_cases (ticket_id)')
+            self._init_derived_columns(cursor)
+            # Listings and browse pages run newest first, optionally only tickets with Figma designs
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets (created_at, id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tickets_figma_created_at ON tickets (has_figma, created_at, id)')
+            self._init_search_index(cursor)
     
-    def _load_search_index(self) -> Dict:
-        """Load search index from pickle file."""
-        if os.path.exists(self.index_path):
-            try:
-                with open(self.index_path, 'rb') as f:
-                    return pickle.load(f)
-            except:
-                pass
-        return {}
+    def _init_derived_columns(self, cursor):
+        """Add the count and Figma columns to older databases and create the triggers maintaining them."""
+        cursor.execute("PRAGMA table_info(tickets)")
+        columns = [column[1] for column in cursor.fetchall()]
+        missing = [column for column in DERIVED_COLUMNS if column not in columns]
+        for column in missing:
+            cursor.execute(f'ALTER TABLE tickets ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0')
+        if missing:
+            cursor.execute(f'''
+                UPDATE tickets SET {_COUNTER_VALUES.format(t='tickets')}, has_figma = {_HAS_FIGMA.format(t='tickets')}
+            ''')
+            print(f"✅ Added {', '.join(missing)} to tickets table")
+        for trigger in _DERIVED_TRIGGERS:
+            cursor.execute(trigger)
     
-    def _save_search_index(self):
-        """Save search index to pickle file."""
-        with open(self.index_path, 'wb') as f:
-            pickle.dump(self.search_index, f)
+    def _init_search_index(self, cursor):
+        """Create the FTS5 index over tickets and the triggers that keep it in sync.
+        
+        Index rows share the ticket row's rowid. VACUUM may renumber those, so
+        run rebuild_search_index() after vacuuming the database.
+        """
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'tickets_fts'")
+        existing = cursor.fetchone()
+        if existing and 'prefix' not in existing[0]:
+            # Indexes created before prefix indexing are rebuilt with it
+            cursor.execute('DROP TABLE tickets_fts')
+            existing = None
+        try:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+                    {', '.join(SEARCH_COLUMNS)}, tokenize = 'porter unicode61', prefix = '{SEARCH_PREFIX_LENGTHS}'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Full-text search not available, falling back to substring search: {e}")
+            self.fts_available = False
+            return
+        
+        self.fts_available = True
+        for trigger in _OBSOLETE_SEARCH_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        for trigger in _SEARCH_TRIGGERS:
+            cursor.execute(trigger)
+        if not existing:
+            self._fill_search_index(cursor)
+    
+    @staticmethod
+    def _fill_search_index(cursor):
+        cursor.execute(f'''
+            INSERT INTO tickets_fts (rowid, {', '.join(SEARCH_COLUMNS)})
+            SELECT {_SEARCH_ROW_VALUES.format(t='t')} FROM tickets t
+        ''')
+    
+    def rebuild_search_index(self):
+        """Rebuild the full-text index from the stored tickets."""
+        if not self.fts_available:
+            return
+        with self.db.transaction() as cursor:
+            cursor.execute('DELETE FROM tickets_fts')
+            self._fill_search_index(cursor)
+    
+    def _remove_legacy_search_index(self):
+        """Delete the search_index.pkl written by older versions."""
+        legacy_path = os.path.join(self.storage_dir, "database", "search_index.pkl")
+        if os.path.exists(legacy_path):
+            try:
+                os.remove(legacy_path)
+                print("🧹 Removed legacy search_index.pkl (search now uses the database index)")
+            except OSError as e:
+                print(f"⚠️ Could not remove legacy search index: {e}")
     
     def store_ticket(self, ticket_data: Dict[str, Any]) -> str:
         """Store a ticket and its analysis data."""
         ticket_id = ticket_data.get('id', f"ticket_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
         
         # Store in database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO tickets 
-            (id, ticket_key, title, description, created_at, updated_at, analysis_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            ticket_id,
-            ticket_id,
-            ticket_data.get('title', ''),
-            ticket_data.get('description', ''),
-            datetime.now().isoformat(),
-            datetime.now().isoformat(),
-            json.dumps(ticket_data.get('analysis', {}))
-        ))
-        
-        # Store questions
-        analysis = ticket_data.get("analysis", {})
-        questions = []
-        
-        # Extract questions from different categories
-        if "suggested_questions" in analysis:
-            questions.extend([(q, "suggested") for q in analysis["suggested_questions"]])
-        if "design_questions" in analysis:
-            questions.extend([(q, "design") for q in analysis["design_questions"]])
-        if "business_questions" in analysis:
-            questions.extend([(q, "business") for q in analysis["business_questions"]])
-        
-        # Also check direct questions field
-        direct_questions = ticket_data.get("questions", [])
-        questions.extend([(q, "general") for q in direct_questions])
-        for question, question_type in questions:
-            cursor.execute('''
-                INSERT INTO questions (ticket_id, question_text, question_type)
-                VALUES (?, ?, ?)
-            ''', (ticket_id, question, question_type))
-        
-        # Store test cases
-        test_cases = ticket_data.get('test_cases', [])
-        for test_case in test_cases:
+        with self.db.transaction() as cursor:
+            # Re-analysis replaces a ticket's questions and test cases rather than appending to them
+            cursor.execute('DELETE FROM questions WHERE ticket_id = ?', (ticket_id,))
+            cursor.execute('DELETE FROM test_cases WHERE ticket_id = ?', (ticket_id,))
+
+            # Store questions
+            analysis = ticket_data.get("analysis", {})
+            questions = []
+        
+            # Extract questions from different categories
+            if "suggested_questions" in analysis:
+                questions.extend([(q, "suggested") for q in analysis["suggested_questions"]])
+            if "design_questions" in analysis:
+                questions.extend([(q, "design") for q in analysis["design_questions"]])
+            if "business_questions" in analysis:
+                questions.extend([(q, "business") for q in analysis["business_questions"]])
+        
+            # Also check direct questions field
+            direct_questions = ticket_data.get("questions", [])
+            questions.extend([(q, "general") for q in direct_questions])
+            for question, question_type in questions:
+                cursor.execute('''
+                    INSERT INTO questions (ticket_id, question_text, question_type)
+                    VALUES (?, ?, ?)
+                ''', (ticket_id, question, question_type))
+        
+            # Store test cases, falling back to the ones generated by the analysis
+            test_cases = ticket_data.get('test_cases') or analysis.get('test_cases') or []
+            for test_case in test_cases:
+                cursor.execute('''
+                    INSERT INTO test_cases (ticket_id, test_case_text)
+                    VALUES (?, ?)
+                ''', (ticket_id, test_case))
+
+            # Written after its questions and test cases, so the ticket's triggers index
+            # them with it in one pass. Upsert rather than REPLACE: the row keeps its
+            # rowid (which the full-text index is keyed on) and its original created_at
             cursor.execute('''
-                INSERT INTO test_cases (ticket_id, test_case_text)
-                VALUES (?, ?)
-            ''', (ticket_id, test_case))
-        
+                INSERT INTO tickets
+                (id, ticket_key, title, description, created_at, updated_at, analysis_data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    ticket_key = excluded.ticket_key,
+                    title = excluded.title,
+                    description = excluded.description,
+                    updated_at = excluded.updated_at,
+                    analysis_data = excluded.analysis_data
+            ''', (
+                ticket_id,
+                ticket_id,
+                ticket_data.get('title', ''),
+                ticket_data.get('description', ''),
+                datetime.now().isoformat(),
+                datetime.now().isoformat(),
+                json.dumps(ticket_data.get('analysis', {}))
+            ))
 
-        # Migrate existing databases to new schema
-        try:
-            # Check if old columns exist and add new ones if needed
-            cursor.execute("PRAGMA table_info(questions)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'question_text' not in columns:
-                cursor.execute('ALTER TABLE questions ADD COLUMN question_text TEXT')
-                print("✅ Added question_text column to questions table")
-            
-            if 'question_type' not in columns:
-                cursor.execute('ALTER TABLE questions ADD COLUMN question_type TEXT')
-                print("✅ Added question_type column to questions table")
-            
-            if 'question' in columns and 'question_text' in columns:
-                # Migrate data from question to question_text
-                cursor.execute('UPDATE questions SET question_text = question WHERE question_text IS NULL')
-                print("✅ Migrated question data to question_text")
-            
-            # Check test_cases table
-            cursor.execute("PRAGMA table_info(test_cases)")
-            test_columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'test_case_text' not in test_columns:
-                cursor.execute('ALTER TABLE test_cases ADD COLUMN test_case_text TEXT')
-                print("✅ Added test_case_text column to test_cases table")
-            
-            if 'test_case' in test_columns and 'test_case_text' in test_columns:
-                # Migrate data from test_case to test_case_text
-                cursor.execute('UPDATE test_cases SET test_case_text = test_case WHERE test_case_text IS NULL')
-                print("✅ Migrated test_case data to test_case_text")
-                
-        except Exception as e:
-            print(f"⚠️ Migration warning: {e}")
-            # Continue anyway, tables will be created with correct schema
-        
-        conn.commit()
-        conn.close()
-        
-        # Update search index
-        self.search_index[ticket_id] = {
-            'title': ticket_data.get('title', ''),
-            'description': ticket_data.get('description', ''),
-            'ticket_key': ticket_id,
-            'created_at': datetime.now().isoformat()
-        }
-        self._save_search_index()
-        
         return ticket_id
     
     def get_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
         """Get a ticket by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            conn.close()
-            return None
-        
-        # Get questions
-        try:
-            cursor.execute('SELECT question_text FROM questions WHERE ticket_id = ?', (ticket_id,))
-            questions = [row[0] for row in cursor.fetchall()]
-        except sqlite3.OperationalError:
-            # Fallback if question_text column doesn't exist
+        with self.db.read() as cursor:
+            cursor.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
+            row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            # Get questions
             try:
-                cursor.execute('SELECT question FROM questions WHERE ticket_id = ?', (ticket_id,))
+                cursor.execute('SELECT question_text FROM questions WHERE ticket_id = ?', (ticket_id,))
                 questions = [row[0] for row in cursor.fetchall()]
             except sqlite3.OperationalError:
-                questions = []
-        
-        # Get test cases
-        try:
-            cursor.execute('SELECT test_case_text FROM test_cases WHERE ticket_id = ?', (ticket_id,))
-            test_cases = [row[0] for row in cursor.fetchall()]
-        except sqlite3.OperationalError:
-            # Fallback if test_case_text column doesn't exist
+                # Fallback if question_text column doesn't exist
+                try:
+                    cursor.execute('SELECT question FROM questions WHERE ticket_id = ?', (ticket_id,))
+                    questions = [row[0] for row in cursor.fetchall()]
+                except sqlite3.OperationalError:
+                    questions = []
+        
+            # Get test cases
             try:
-                cursor.execute('SELECT test_case FROM test_cases WHERE ticket_id = ?', (ticket_id,))
+                cursor.execute('SELECT test_case_text FROM test_cases WHERE ticket_id = ?', (ticket_id,))
                 test_cases = [row[0] for row in cursor.fetchall()]
             except sqlite3.OperationalError:
-                test_cases = []
-        
-        conn.close()
+                # Fallback if test_case_text column doesn't exist
+                try:
+                    cursor.execute('SELECT test_case FROM test_cases WHERE ticket_id = ?', (ticket_id,))
+                    test_cases = [row[0] for row in cursor.fetchall()]
+                except sqlite3.OperationalError:
+                    test_cases = []
         
         return {
             'id': row[0],
@@ -275,43 +471,247 @@ class TicketStorageSystem:
             'test_cases': test_cases
         }
     
-    def search_tickets(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search tickets by query."""
-        results = []
-        query_lower = query.lower()
-        
-        for ticket_id, data in self.search_index.items():
-            if (query_lower in data['title'].lower() or 
-                query_lower in data['description'].lower() or 
-                query_lower in data['ticket_key'].lower()):
-                
-                # Get question and test case counts for this ticket
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                # Count questions
-                cursor.execute('SELECT COUNT(*) FROM questions WHERE ticket_id = ?', (ticket_id,))
-                question_count = cursor.fetchone()[0]
-                
-                # Count test cases
-                cursor.execute('SELECT COUNT(*) FROM test_cases WHERE ticket_id = ?', (ticket_id,))
-                test_case_count = cursor.fetchone()[0]
-                
-                conn.close()
-                
-                results.append({
-                    'id': ticket_id,
-                    'ticket_id': ticket_id,
-                    'ticket_key': data['ticket_key'],
-                    'title': data['title'],
-                    'description': data.get('description', ''),
-                    'created_at': data['created_at'],
-                    'question_count': question_count,
-                    'test_case_count': test_case_count,
-                    'risk_count': 0  # Mock data - would need risks table
-                })
-        
-        return results[:limit]
+    def search_tickets(self, query: str, limit: int = 10, fields: Optional[List[str]] = None,
+                       newest_candidates: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search tickets, best matches first.
+        
+        Matches are ranked with BM25 over key, title, description, questions,
+        test cases and risk areas, and come with the matched text highlighted.
+        See build_search_query for the query syntax (phrases, prefixes, fields).
+        
+        Args:
+            query: Search text
+            limit: Number of tickets to return
+            fields: Only match in these SEARCH_FIELDS (e.g. ['questions'])
+            newest_candidates: Rank only this many of the newest matches. Cheaper
+                for very common terms, but older, more relevant tickets are left out.
+        """
+        if not self.fts_available:
+            return self._search_tickets_substring(query, limit)
+        
+        match_query = build_search_query(query, fields)
+        if not match_query:
+            return []
+        
+        open_mark, close_mark = HIGHLIGHT_MARKERS
+        try:
+            with self.db.read() as cursor:
+                cutoff = None
+                if newest_candidates:
+                    cursor.execute(
+                        'SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?',
+                        (match_query, newest_candidates)
+                    )
+                    cutoff = cursor.fetchone()
+                # Rank first, then highlight only the hits that made the cut
+                cursor.execute(f'''
+                    WITH hits AS (
+                        SELECT rowid, {_SEARCH_BM25} AS rank FROM tickets_fts
+                        WHERE tickets_fts MATCH ? AND rowid > ?
+                        ORDER BY rank
+                        LIMIT ?
+                    )
+                    SELECT t.id, t.ticket_key, t.title, t.description, t.created_at, hits.rank,
+                           highlight(tickets_fts, 1, ?, ?),
+                           snippet(tickets_fts, -1, ?, ?, '…', 16),
+                           t.question_count, t.test_case_count, t.risk_count
+                    FROM hits
+                    CROSS JOIN tickets_fts ON tickets_fts.rowid = hits.rowid
+                    CROSS JOIN tickets t ON t.rowid = hits.rowid
+                    WHERE tickets_fts MATCH ?
+                    ORDER BY hits.rank
+                ''', (match_query, cutoff[0] if cutoff else 0, limit,
+                      open_mark, close_mark, open_mark, close_mark, match_query))
+                rows = cursor.fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Search failed for {query!r}: {e}")
+            rows = []
+        
+        return [{
+            'id': row[0],
+            'ticket_id': row[0],
+            'ticket_key': row[1],
+            'title': row[2],
+            'description': row[3] or '',
+            'created_at': row[4],
+            'score': -row[5],  # bm25() is lower-is-better
+            'title_highlight': row[6] or row[2],
+            'snippet': row[7] or '',
+            'question_count': row[8],
+            'test_case_count': row[9],
+            'risk_count': row[10]
+        } for row in rows]
+    
+    def _search_tickets_substring(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Search without FTS5: tickets whose key, title or description contain every word."""
+        words = [word.lower() for word in (query or '').split()]
+        if not words:
+            return []
+        conditions = ' AND '.join(
+            ["(instr(lower(ticket_key), ?) > 0 OR instr(lower(title), ?) > 0 OR instr(lower(description), ?) > 0)"] * len(words)
+        )
+        with self.db.read() as cursor:
+            cursor.execute(f'''
+                SELECT id, ticket_key, title, description, created_at,
+                       question_count, test_case_count, risk_count
+                FROM tickets
+                WHERE {conditions}
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (*[word for word in words for _ in range(3)], limit))
+            rows = cursor.fetchall()
+        return [{
+            'id': row[0],
+            'ticket_id': row[0],
+            'ticket_key': row[1],
+            'title': row[2],
+            'description': row[3] or '',
+            'created_at': row[4],
+            'question_count': row[5],
+            'test_case_count': row[6],
+            'risk_count': row[7]
+        } for row in rows]
+    
+    def get_figma_design_knowledge(self, exclude_ticket_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get design knowledge from the most recent Figma tickets and the implemented-features knowledge base.
+        
+        The recent tickets are one range scan of the (has_figma, created_at, id) index.
+        """
+        snapshot = self.knowledge_snapshot
+        with self.db.read() as cursor:
+            cursor.execute('''
+                SELECT id, ticket_key, title, description, analysis_data
+                FROM tickets
+                WHERE has_figma = 1 AND id != ?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            ''', (exclude_ticket_id or '', snapshot.window))
+            rows = cursor.fetchall()
+        
+        def parse(raw):
+            try:
+                return json.loads(raw) if raw else {}
+            except ValueError:
+                return {}
+        
+        return snapshot.get_knowledge(
+            [(row[0], row[1], row[2], row[3], parse(row[4])) for row in rows], exclude_ticket_id
+        )
+    
+    def find_similar_tickets(self, text: str, limit: int = 5, exclude_ticket_id: Optional[str] = None,
+                             max_terms: int = 12, question_snippets: int = 3,
+                             risk_snippets: int = 2) -> List[Dict[str, Any]]:
+        """Get the tickets most similar to a piece of text, with question and risk snippets.
+        
+        Tickets matching any of the text's distinctive terms are ranked with
+        BM25 over their title (weighted double) and description, through the
+        full-text index. Ranking, counts and the analysis fields the snippets
+        come from are fetched in a single query.
+        
+        Args:
+            text: Text to match, typically the ticket's title and description
+            limit: Number of tickets to return
+            exclude_ticket_id: Ticket to leave out (the one being analyzed)
+            max_terms: Most distinctive terms of the text to match on
+            question_snippets: Suggested questions to return per ticket
+            risk_snippets: Risk areas to return per ticket
+        """
+        # Leading words (the title) first, then the most repeated, then the longest
+        words = [word for word in re.findall(r'[a-z0-9]{3,}', (text or '').lower())
+                 if word not in SIMILARITY_STOPWORDS]
+        first_seen, counts = {}, {}
+        for position, word in enumerate(words):
+            first_seen.setdefault(word, position)
+            counts[word] = counts.get(word, 0) + 1
+        terms = sorted(
+            first_seen,
+            key=lambda word: (first_seen[word] >= 8, -counts[word], -len(word), word)
+        )[:max_terms]
+        if not terms:
+            return []
+        
+        if self.fts_available:
+            rows = self._similar_tickets_fts(terms, limit, exclude_ticket_id)
+        else:
+            rows = self._similar_tickets_substring(terms, limit, exclude_ticket_id)
+        
+        def snippets(raw, min_length, count):
+            try:
+                items = json.loads(raw) if raw else []
+            except ValueError:
+                return []
+            if not isinstance(items, list):
+                return []
+            return [item for item in items[:count] if isinstance(item, str) and len(item) > min_length]
+        
+        return [{
+            'id': row[0],
+            'ticket_id': row[0],
+            'ticket_key': row[1],
+            'title': row[2],
+            'description': row[3] or '',
+            'created_at': row[4],
+            'score': row[5],
+            'question_count': row[6],
+            'test_case_count': row[7],
+            'risk_count': row[8],
+            'question_snippets': snippets(row[9], 20, question_snippets),
+            'risk_snippets': snippets(row[10], 15, risk_snippets)
+        } for row in rows]
+    
+    def _similar_tickets_fts(self, terms: List[str], limit: int, exclude_ticket_id: Optional[str]) -> List[tuple]:
+        """Rank tickets matching any of the terms with BM25 over title (weighted double) and description."""
+        match_query = '{title description} : (' + ' OR '.join(f'"{term}"' for term in terms) + ')'
+        with self.db.read() as cursor:
+            cursor.execute('''
+                SELECT t.id, t.ticket_key, t.title, t.description, t.created_at,
+                       -bm25(tickets_fts, 0.0, 2.0, 1.0, 0.0, 0.0, 0.0) AS score,
+                       t.question_count, t.test_case_count, t.risk_count,
+                       CASE WHEN json_valid(t.analysis_data)
+                            THEN json_extract(t.analysis_data, '$.suggested_questions') END,
+                       CASE WHEN json_valid(t.analysis_data)
+                            THEN json_extract(t.analysis_data, '$.risk_areas') END
+                FROM tickets_fts
+                CROSS JOIN tickets t ON t.rowid = tickets_fts.rowid
+                WHERE tickets_fts MATCH ? AND t.id != ?
+                ORDER BY score DESC
+                LIMIT ?
+            ''', (match_query, exclude_ticket_id or '', limit))
+            return cursor.fetchall()
+    
+    def _similar_tickets_substring(self, terms: List[str], limit: int, exclude_ticket_id: Optional[str]) -> List[tuple]:
+        """Without FTS5: score every ticket by the terms its title (double) and description contain."""
+        score_sql = ' + '.join(
+            ['(instr(lower(title), ?) > 0) * 2 + (instr(lower(description), ?) > 0)'] * len(terms)
+        )
+        score_params = [param for term in terms for param in (term, term)]
+        
+        with self.db.read() as cursor:
+            cursor.execute(f'''
+                SELECT top.id, top.ticket_key, top.title, top.description, top.created_at, top.score,
+                       top.question_count, top.test_case_count, top.risk_count,
+                       top.suggested_questions, top.risk_areas
+                FROM (
+                    SELECT id, ticket_key, title, description, created_at, updated_at,
+                           question_count, test_case_count, risk_count,
+                           ({score_sql}) AS score,
+                           CASE WHEN json_valid(analysis_data)
+                                THEN json_extract(analysis_data, '$.suggested_questions') END AS suggested_questions,
+                           CASE WHEN json_valid(analysis_data)
+                                THEN json_extract(analysis_data, '$.risk_areas') END AS risk_areas
+                    FROM tickets
+                    WHERE id != ?
+                ) AS top
+                WHERE top.score > 0
+                ORDER BY top.score DESC, top.updated_at DESC
+                LIMIT ?
+            ''', (*score_params, exclude_ticket_id or '', limit))
+            return cursor.fetchall()
+    
+    def get_ticket_count(self) -> int:
+        """Get the number of stored tickets."""
+        with self.db.read() as cursor:
+            return cursor.execute('SELECT COUNT(*) FROM tickets').fetchone()[0]
     
     def search_figma_tickets(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Search for tickets with Figma designs."""
@@ -321,28 +721,18 @@ class TicketStorageSystem:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get storage statistics."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Count tickets
-        cursor.execute('SELECT COUNT(*) FROM tickets')
-        ticket_count = cursor.fetchone()[0]
-        
-        # Count questions
-        cursor.execute('SELECT COUNT(*) FROM questions')
-        question_count = cursor.fetchone()[0]
-        
-        # Count test cases
-        cursor.execute('SELECT COUNT(*) FROM test_cases')
-        test_case_count = cursor.fetchone()[0]
-        
-        conn.close()
+        with self.db.read() as cursor:
+            cursor.execute('''
+                SELECT COUNT(*), TOTAL(question_count), TOTAL(test_case_count), TOTAL(risk_count)
+                FROM tickets
+            ''')
+            ticket_count, question_count, test_case_count, risk_count = cursor.fetchone()
         
         return {
             'total_tickets': ticket_count,
-            'total_questions': question_count,
-            'total_test_cases': test_case_count,
-            'total_risks': 0,  # Mock data - would need risks table
+            'total_questions': int(question_count),
+            'total_test_cases': int(test_case_count),
+            'total_risks': int(risk_count),
             'total_screens': 0,  # Mock data - would need screens table
             'storage_size': self._get_storage_size()
         }
@@ -358,51 +748,116 @@ class TicketStorageSystem:
         return total_size
     
     def get_all_tickets(self, limit=50):
+        """Get the newest tickets with their question, test case and risk counts."""
         try:
-            """Get all tickets with pagination."""
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.db.read() as cursor:
+                cursor.execute('''
+                    SELECT id, ticket_key, title, description, created_at, updated_at,
+                           question_count, test_case_count, risk_count
+                    FROM tickets
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (limit,))
+                rows = cursor.fetchall()
             
-            cursor.execute('''
-                SELECT id, ticket_key, title, description, created_at, updated_at
-                FROM tickets 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            ''', (limit,))
-            
-            rows = cursor.fetchall()
-            
-            # Get question counts for each ticket
-            tickets_with_counts = []
-            for row in rows:
-                ticket_id = row[0]
-                
-                # Count questions
-                cursor.execute('SELECT COUNT(*) FROM questions WHERE ticket_id = ?', (ticket_id,))
-                question_count = cursor.fetchone()[0]
-                
-                # Count test cases
-                cursor.execute('SELECT COUNT(*) FROM test_cases WHERE ticket_id = ?', (ticket_id,))
-                test_case_count = cursor.fetchone()[0]
-                
-                tickets_with_counts.append({
-                    'id': row[0],
-                    'ticket_key': row[1],
-                    'title': row[2],
-                    'description': row[3],
-                    'created_at': row[4],
-                    'updated_at': row[5],
-                    'question_count': question_count,
-                    'test_case_count': test_case_count,
-                    'risk_count': 0  # Mock data - would need risks table
-                })
-            
-            conn.close()
-            return tickets_with_counts
+            return [{
+                'id': row[0],
+                'ticket_key': row[1],
+                'title': row[2],
+                'description': row[3],
+                'created_at': row[4],
+                'updated_at': row[5],
+                'question_count': row[6],
+                'test_case_count': row[7],
+                'risk_count': row[8]
+            } for row in rows]
         except Exception as e:
             print(f"Error in get_all_tickets: {e}")
             return []
 
+    def browse_tickets(self, page_size: int = 20, cursor: Optional[str] = None,
+                       has_figma: Optional[bool] = None,
+                       created_after: Union[str, date, datetime, None] = None,
+                       created_before: Union[str, date, datetime, None] = None,
+                       query: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of tickets, newest first, and a token for the next page.
+        
+        Pages are keyed on (created_at, id) rather than an offset, so a page
+        deep in the history costs the same as the first one and tickets
+        stored while browsing don't shift later pages.
+        
+        Args:
+            page_size: Tickets per page
+            cursor: next_cursor of the previous page; None for the first page
+            has_figma: Only tickets with (True) or without (False) Figma designs
+            created_after: Only tickets created at or after this date/time
+            created_before: Only tickets created before this date/time
+            query: Only tickets matching this search text (see build_search_query)
+        
+        Returns:
+            {'tickets': [...], 'next_cursor': token, or None on the last page}
+        """
+        conditions, params = [], []
+        if cursor:
+            conditions.append('(created_at, id) < (?, ?)')
+            params.extend(decode_page_cursor(cursor))
+        if has_figma is not None:
+            conditions.append('has_figma = ?')
+            params.append(1 if has_figma else 0)
+        if _date_bound(created_after):
+            conditions.append('created_at >= ?')
+            params.append(_date_bound(created_after))
+        if _date_bound(created_before):
+            conditions.append('created_at < ?')
+            params.append(_date_bound(created_before))
+        if query and query.strip():
+            match_query = build_search_query(query) if self.fts_available else None
+            if match_query:
+                conditions.append('rowid IN (SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH ?)')
+                params.append(match_query)
+            else:
+                for word in query.lower().split():
+                    conditions.append(
+                        '(instr(lower(ticket_key), ?) > 0 OR instr(lower(title), ?) > 0 OR instr(lower(description), ?) > 0)'
+                    )
+                    params.extend([word] * 3)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        try:
+            with self.db.read() as db_cursor:
+                db_cursor.execute(f'''
+                    SELECT id, ticket_key, title, description, created_at, updated_at,
+                           question_count, test_case_count, risk_count, has_figma
+                    FROM tickets
+                    {where}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (*params, page_size + 1))
+                rows = db_cursor.fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Browsing tickets failed: {e}")
+            rows = []
+        
+        # The extra row only tells whether there is a next page
+        page = rows[:page_size]
+        next_cursor = encode_page_cursor(page[-1][4], page[-1][0]) if len(rows) > page_size else None
+        return {
+            'tickets': [{
+                'id': row[0],
+                'ticket_id': row[0],
+                'ticket_key': row[1],
+                'title': row[2],
+                'description': row[3] or '',
+                'created_at': row[4],
+                'updated_at': row[5],
+                'question_count': row[6],
+                'test_case_count': row[7],
+                'risk_count': row[8],
+                'has_figma': bool(row[9])
+            } for row in page],
+            'next_cursor': next_cursor
+        }
+
     def get_recent_tickets(self, limit=10):
         """Get recent tickets."""
         try:
@@ -413,18 +868,15 @@ class TicketStorageSystem:
 
     def get_tickets_timeline(self) -> List[Dict[str, Any]]:
         """Get tickets timeline data for charts."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT DATE(created_at) as date, COUNT(*) as count
-            FROM tickets 
-            GROUP BY DATE(created_at)
-            ORDER BY date
-        ''')
+        with self.db.read() as cursor:
+            cursor.execute('''
+                SELECT DATE(created_at) as date, COUNT(*) as count
+                FROM tickets 
+                GROUP BY DATE(created_at)
+                ORDER BY date
+            ''')
         
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
         
         return [{'date': row[0], 'count': row[1]} for row in rows]
     
@@ -432,23 +884,18 @@ class TicketStorageSystem:
     def delete_ticket(self, ticket_id: str) -> bool:
         """Delete a ticket and all its associated data."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.db.transaction() as cursor:
+                # Delete from questions table using ticket_id (foreign key)
+                cursor.execute('DELETE FROM questions WHERE ticket_id = ?', (ticket_id,))
             
-            # Delete from questions table using ticket_id (foreign key)
-            cursor.execute('DELETE FROM questions WHERE ticket_id = ?', (ticket_id,))
+                # Delete from test_cases table using ticket_id (foreign key)
+                cursor.execute('DELETE FROM test_cases WHERE ticket_id = ?', (ticket_id,))
             
-            # Delete from test_cases table using ticket_id (foreign key)
-            cursor.execute('DELETE FROM test_cases WHERE ticket_id = ?', (ticket_id,))
+                # Delete from tickets table using ticket_key (correct column name)
+                cursor.execute('DELETE FROM tickets WHERE ticket_key = ?', (ticket_id,))
             
-            # Delete from tickets table using ticket_key (correct column name)
-            cursor.execute('DELETE FROM tickets WHERE ticket_key = ?', (ticket_id,))
-            
-            # Check if any rows were affected
-            rows_affected = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+                # Check if any rows were affected
+                rows_affected = cursor.rowcount
             
             return rows_affected > 0
             
@@ -459,16 +906,11 @@ class TicketStorageSystem:
     def delete_all_tickets(self) -> bool:
         """Delete all tickets and associated data."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Delete all data
-            cursor.execute('DELETE FROM questions')
-            cursor.execute('DELETE FROM test_cases')
-            cursor.execute('DELETE FROM tickets')
-            
-            conn.commit()
-            conn.close()
+            with self.db.transaction() as cursor:
+                # Delete all data
+                cursor.execute('DELETE FROM questions')
+                cursor.execute('DELETE FROM test_cases')
+                cursor.execute('DELETE FROM tickets')
             
             return True
             
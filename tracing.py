@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Lightweight Tracing for Jira-Figma Analyzer
+
+Stage-level spans for the analysis pipeline. A trace is started per
+analysis; code anywhere below it opens nested spans with ``span(...)``,
+which costs next to nothing when no trace is active. Finished traces can be
+exported as JSON lines and summarized into per-stage latencies.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Callable
+
+# Innermost open span of the current thread / context
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed stage of a trace."""
+
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'attributes', 'start', 'end', 'error')
+
+    def __init__(self, trace: 'Trace', name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def finish(self, end: Optional[float] = None):
+        if self.end is None:
+            self.end = end or time.time()
+            self.trace._add(self)
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': round(self.seconds * 1000, 3),
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded by span() when no trace is active."""
+
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """All spans recorded for one analysis."""
+
+    def __init__(self, name: str, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+        self.root = Span(self, name, None, attributes)
+        self._previous = None
+
+    def _add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Latency per stage name: count, total, average and max in milliseconds."""
+        with self._lock:
+            spans = list(self.spans)
+        if self.root.end is None:
+            spans.append(self.root)
+
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            ms = span.seconds * 1000
+            stage = stages.setdefault(span.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+            stage['count'] += 1
+            stage['total_ms'] += ms
+            stage['max_ms'] = max(stage['max_ms'], ms)
+            stage['errors'] += int(span.error is not None)
+        for stage in stages.values():
+            stage['avg_ms'] = round(stage['total_ms'] / stage['count'], 3)
+            stage['total_ms'] = round(stage['total_ms'], 3)
+            stage['max_ms'] = round(stage['max_ms'], 3)
+        return stages
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Every finished span, oldest first."""
+        with self._lock:
+            return [span.to_record() for span in sorted(self.spans, key=lambda s: s.start)]
+
+    def export_jsonl(self, path: str):
+        """Append the trace's spans to a JSON-lines file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lines = ''.join(json.dumps(record, default=str) + '\n' for record in self.to_records())
+        with open(path, 'a') as f:
+            f.write(lines)
+
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace the current code is running under, if any."""
+    span = _current_span.get()
+    return span.trace if span is not None else None
+
+
+def start_trace(name: str, **attributes) -> Trace:
+    """Start a trace and make its root span current."""
+    trace = Trace(name, **attributes)
+    trace._previous = _current_span.get()
+    _current_span.set(trace.root)
+    return trace
+
+
+def end_trace(trace: Trace):
+    """Finish a trace's root span and restore whatever span was current before it."""
+    trace.root.finish()
+    _current_span.set(trace._previous)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a stage as a child of the current span.
+
+    Yields the span so attributes known only at the end (e.g. token counts)
+    can be added with ``.set()``.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+
+    current = Span(parent.trace, name, parent.span_id, attributes)
+    _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.finish()
+        _current_span.set(parent)
+
+
+def record_span(name: str, seconds: float, error: Optional[str] = None, **attributes):
+    """Record a stage that was timed elsewhere (e.g. in a worker process) as ending now."""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    recorded = Span(parent.trace, name, parent.span_id, attributes)
+    end = time.time()
+    recorded.start = end - seconds
+    recorded.error = error
+    recorded.finish(end)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Bind a callable to the current span so it can run under it on another thread."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
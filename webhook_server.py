@@ -7,16 +7,22 @@ triggers analysis for new pull requests, issues, and commits.
 """
 
 import os
+import copy
 import json
 import signal
 import sys
+from collections import OrderedDict
 from datetime import datetime
 from flask import Flask, request, jsonify
 from bitbucket_integration import BitbucketIntegration
-from jira_figma_analyzer import JiraFigmaAnalyzer
+from jira_figma_analyzer import JiraFigmaAnalyzer, AnalysisFinished, DesignAnalyzed, SectionCompleted
+from openai_rate_limiter import get_rate_limiter
 import threading
 import queue
 
+# Finished analyses kept for /analysis/<ticket_id>; older ones are dropped
+MAX_FINISHED_PROGRESS = 200
+
 class WebhookServer:
     """Main webhook server class."""
     
@@ -28,6 +34,10 @@ class WebhookServer:
         self.bitbucket = BitbucketIntegration()
         self.analysis_queue = queue.Queue()
         
+        # Sections completed so far for analyses in flight (and the most recent finished ones), oldest first
+        self.analysis_progress = OrderedDict()
+        self.progress_lock = threading.Lock()
+        
         # Setup routes
         self.setup_routes()
         
@@ -108,6 +118,12 @@ class WebhookServer:
             try:
                 data = request.get_json()
                 
+                # Optional "sections" list limits the analysis to those sections
+                try:
+                    self.analyzer.resolve_sections(data.get('sections'))
+                except ValueError as e:
+                    return jsonify({"error": str(e)}), 400
+                
                 # Queue manual analysis
                 self.analysis_queue.put({
                     'event_type': 'manual',
@@ -126,13 +142,30 @@ class WebhookServer:
         @self.app.route('/status', methods=['GET'])
         def get_status():
             """Get server status and queue information."""
+            with self.progress_lock:
+                in_progress = [
+                    ticket_id for ticket_id, progress in self.analysis_progress.items()
+                    if progress['status'] == 'running'
+                ]
             return jsonify({
                 "server_status": "running",
                 "queue_size": self.analysis_queue.qsize(),
                 "bitbucket_connected": self.bitbucket.authenticated,
                 "analyzer_ready": True,
+                "in_progress": in_progress,
+                "model_tiers": self.analyzer.tier_metrics.snapshot(),
+                "openai_rate_limits": get_rate_limiter().snapshot(),
                 "timestamp": datetime.now().isoformat()
             }), 200
+        
+        @self.app.route('/analysis/<ticket_id>', methods=['GET'])
+        def get_analysis_progress(ticket_id):
+            """Get the sections completed so far for a ticket's analysis."""
+            with self.progress_lock:
+                progress = copy.deepcopy(self.analysis_progress.get(ticket_id))
+            if not progress:
+                return jsonify({"error": f"No analysis found for {ticket_id}"}), 404
+            return jsonify(progress), 200
     
     def background_worker(self):
         """Background worker to process analysis queue."""
@@ -167,6 +200,66 @@ class WebhookServer:
                 print(f"❌ Background worker error: {e}")
                 continue
     
+    def run_analysis(self, ticket, incremental=True, sections=None):
+        """Analyze a ticket, publishing each section as soon as it completes.
+        
+        Args:
+            ticket: Parsed JiraTicket
+            incremental: Reuse unchanged sections of the stored analysis and
+                store the new one
+            sections: Sections to generate; defaults to all
+        """
+        progress = {
+            'ticket_id': ticket.ticket_id,
+            'status': 'running',
+            'started_at': datetime.now().isoformat(),
+            'sections': {},
+            'requested_sections': sections,
+            'design_sources': []
+        }
+        with self.progress_lock:
+            self.analysis_progress[ticket.ticket_id] = progress
+            self.analysis_progress.move_to_end(ticket.ticket_id)
+        
+        # Webhook callers need an answer within a fixed budget
+        deadline = self.analyzer.config.get('webhook_deadline_seconds')
+        if incremental:
+            events = self.analyzer.iter_reanalysis(ticket, deadline=deadline, sections=sections)
+        else:
+            events = self.analyzer.iter_analysis(ticket, deadline=deadline, sections=sections)
+        
+        result = None
+        try:
+            for event in events:
+                with self.progress_lock:
+                    if isinstance(event, SectionCompleted):
+                        progress['sections'][event.section] = event.items
+                        print(f"   📝 {ticket.ticket_id}: {event.section} ready ({len(event.items)} items)")
+                    elif isinstance(event, DesignAnalyzed):
+                        progress['design_sources'].append({
+                            'kind': event.kind, 'source': event.source, 'ok': event.ok, 'error': event.error
+                        })
+                    elif isinstance(event, AnalysisFinished):
+                        result = event.result
+                        progress['degraded_sections'] = result.degraded_sections or []
+                        progress['model_tier'] = result.model_tier
+        finally:
+            with self.progress_lock:
+                progress['status'] = 'finished' if result else 'failed'
+                progress['finished_at'] = datetime.now().isoformat()
+                self._prune_progress()
+        
+        return result
+    
+    def _prune_progress(self):
+        """Drop the oldest finished analyses beyond MAX_FINISHED_PROGRESS. Call with progress_lock held."""
+        finished = [
+            ticket_id for ticket_id, progress in self.analysis_progress.items()
+            if progress['status'] != 'running'
+        ]
+        for ticket_id in finished[:max(0, len(finished) - MAX_FINISHED_PROGRESS)]:
+            del self.analysis_progress[ticket_id]
+    
     def handle_pr_created(self, payload):
         """Handle pull request creation."""
         try:
@@ -195,7 +288,8 @@ class WebhookServer:
             
             # Analyze the PR
             ticket = self.analyzer.parse_jira_ticket(ticket_data)
-            result = self.analyzer.analyze_ticket_content(ticket)
+            # Updates to an already-analyzed PR only regenerate sections whose inputs changed
+            result = self.run_analysis(ticket)
             
             # Generate report
             report = self.analyzer.generate_report(result)
@@ -263,7 +357,8 @@ class WebhookServer:
                 
                 # Analyze the Jira issue
                 ticket = self.analyzer.parse_jira_ticket(ticket_data)
-                result = self.analyzer.analyze_ticket_content(ticket)
+                # Edits to an already-analyzed issue only regenerate sections whose inputs changed
+                result = self.run_analysis(ticket)
                 
                 # Generate report
                 report = self.analyzer.generate_report(result)
@@ -288,7 +383,7 @@ class WebhookServer:
             
             # Analyze based on provided data
             ticket = self.analyzer.parse_jira_ticket(payload)
-            result = self.analyzer.analyze_ticket_content(ticket)
+            result = self.run_analysis(ticket, incremental=False, sections=payload.get('sections'))
             
             # Generate report
             report = self.analyzer.generate_report(result)